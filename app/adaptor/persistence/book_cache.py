@@ -0,0 +1,119 @@
+import gc
+import hashlib
+import io
+import logging
+import os
+import pickle
+import struct
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from app.domain.models.construct import restore_model
+from app.domain.models.policy import RenewalPair
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 6
+_HEADER = struct.Struct("<I")
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    # building ~100k model objects triggers repeated full collections that find nothing
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _schema_digest() -> str:
+    schema = RenewalPair.model_json_schema()
+    return hashlib.blake2b(repr(schema).encode(), digest_size=8).hexdigest()
+
+
+def _layout() -> str:
+    # files written with another format or schema can't be loaded, not even as a stale book
+    return f"{CACHE_FORMAT}.{_schema_digest()}"
+
+
+def db_fingerprint(url: str, max_id: int | None, count: int) -> str:
+    raw = f"{url}:{max_id}:{count}"
+    return f"{_layout()}:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"
+
+
+class _ModelPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, BaseModel):
+            return restore_model, (
+                type(obj),
+                obj.__dict__,
+                obj.__pydantic_fields_set__,
+                obj.__pydantic_private__,
+            )
+        return NotImplemented
+
+
+class BookCache:
+    def __init__(self, cache_dir: str, source: str):
+        # one file per source, so switching data_path or db_url doesn't evict the other
+        name = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+        self._path = Path(cache_dir) / f"book-{name}.pkl" if cache_dir else None
+        self._lock = threading.Lock()
+
+    def _read(self, accept: Callable[[str], bool]) -> list | None:
+        if self._path is None or not self._path.exists():
+            return None
+        try:
+            with self._path.open("rb") as f:
+                (size,) = _HEADER.unpack(f.read(_HEADER.size))
+                if not accept(f.read(size).decode()):
+                    return None
+                with gc_paused():
+                    return pickle.load(f)
+        except Exception:
+            logger.warning("Ignoring unreadable book cache %s", self._path)
+            return None
+
+    def load(self, key: str) -> list | None:
+        return self._read(lambda stored: stored == key)
+
+    def load_stale(self) -> list | None:
+        # whatever book was cached last for this source, as long as it is still loadable
+        prefix = f"{_layout()}:"
+        return self._read(lambda stored: stored.startswith(prefix))
+
+    def save(self, key: str, pairs: list) -> None:
+        if self._path is None:
+            return
+        encoded = key.encode()
+        buf = io.BytesIO()
+        buf.write(_HEADER.pack(len(encoded)))
+        buf.write(encoded)
+        _ModelPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(pairs)
+
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(buf.getvalue())
+            os.replace(tmp, self._path)
+
+    def save_in_background(self, key: str, pairs: list) -> threading.Thread | None:
+        if self._path is None:
+            return None
+
+        def _write() -> None:
+            try:
+                self.save(key, pairs)
+            except Exception:
+                logger.warning("Failed to write book cache %s", self._path)
+
+        thread = threading.Thread(target=_write, name="book-cache-writer", daemon=True)
+        thread.start()
+        return thread
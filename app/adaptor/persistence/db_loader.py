@@ -1,46 +1,316 @@
-import random
+import logging
+import threading
+import uuid
+from collections.abc import Callable, Iterable, Iterator
 
+from app.adaptor.persistence.book_cache import BookCache, db_fingerprint, gc_paused
+from app.adaptor.persistence.lazy_pair import LazyPair
+from app.adaptor.persistence.pair_book import PairBook, RefreshGate, latest_per_policy
 from app.config import settings
-from app.domain.models.policy import RenewalPair
-from app.domain.services.parser import parse_pair
+from app.domain.models.policy import PairHeader, PairQuery, RenewalPair
+from app.domain.services.pair_query import draw_sample
+from app.domain.services.parser import parse_pair_json
+
+logger = logging.getLogger(__name__)
+
+# a rebuild swaps in the current book, so it goes ahead of queued batch runs
+REBUILD_PRIORITY = 20
+
+
+def _query_filters(query: PairQuery) -> list:
+    from sqlalchemy import or_
+
+    from app.infra.db_models import RenewalPairRow as Row
+
+    # PairQuery already normalises case and the rows are written normalised, so the columns
+    # are compared as stored and their indexes stay usable
+    filters = []
+    if query.policy_type is not None:
+        filters.append(Row.policy_type == query.policy_type.value)
+    if query.state is not None:
+        filters.append(Row.state == query.state)
+    if query.account_id is not None:
+        filters.append(Row.account_id == query.account_id)
+    if query.carrier is not None:
+        filters.append(
+            or_(Row.carrier_prior == query.carrier, Row.carrier_renewal == query.carrier)
+        )
+    if query.effective_from is not None:
+        filters.append(Row.effective_date_renewal >= query.effective_from)
+    if query.effective_to is not None:
+        filters.append(Row.effective_date_renewal <= query.effective_to)
+    return filters
+
+
+def _parse_row(prior: str, renewal: str) -> RenewalPair:
+    return parse_pair_json(f'{{"prior":{prior},"renewal":{renewal}}}')
+
+
+def _lazy_row(prior: str, renewal: str) -> LazyPair:
+    return LazyPair.from_json(f'{{"prior":{prior},"renewal":{renewal}}}')
 
 
 class DbDataSource:
     def __init__(self):
-        self._cached_pairs: list[RenewalPair] | None = None
+        self._book: PairBook | None = None
+        self._engine = None
+        # (max id, row count) the current book was built from; None for the JSON fallback and
+        # for a stale cached book that is being rebuilt
+        self._mark: tuple[int | None, int] | None = None
+        self._stale = False
+        self._rebuilding = False
+        self._gate = RefreshGate()
+
+    def _install(self, generation: int = 1) -> None:
+        self._book = book = PairBook(self._load(), settings.lazy_pair_cache_size, generation)
+        if self._stale:
+            self._schedule_rebuild(book)
+
+    def _get_book(self) -> PairBook:
+        if self._book is None:
+            self._install()
+            self._gate.touch()
+        else:
+            with self._gate.attempt(settings.reload_check_seconds) as due:
+                if due:
+                    self._refresh()
+        return self._book
 
     def load_pairs(self, sample: int | None = None) -> list[RenewalPair]:
-        if self._cached_pairs is None:
-            self._cached_pairs = self._load()
+        book = self._get_book()
+        if sample and sample < len(book):
+            return book.sample(sample)
+        return book.pairs()
+
+    def headers(self) -> list[PairHeader]:
+        return self._get_book().headers()
+
+    def load_entries(self) -> list[RenewalPair | LazyPair]:
+        # the book as stored: a lazy book's entries stay compressed until something resolves them
+        return list(self._get_book().entries)
+
+    def _get_engine(self):
+        if self._engine is None:
+            from sqlalchemy import create_engine
+
+            self._engine = create_engine(settings.db_url.replace("+asyncpg", "+psycopg"))
+        return self._engine
+
+    def _high_water_mark(self, conn) -> tuple[int | None, int]:
+        from sqlalchemy import func, select
+
+        from app.infra.db_models import RenewalPairRow
+
+        # raw_renewals is append-only, so the id high-water mark and row count
+        # identify the book without reading it
+        max_id, count = conn.execute(
+            select(func.max(RenewalPairRow.id), func.count(RenewalPairRow.id))
+        ).one()
+        return max_id, count
+
+    def _iter_rows(
+        self, conn, filters: list | None = None, parse: Callable = _parse_row
+    ) -> Iterator:
+        from sqlalchemy import Text, cast, select
+
+        from app.infra.db_models import RenewalPairRow
+
+        # fetch the JSON columns as text so pydantic-core parses them natively, through a
+        # server-side cursor so only one fetch batch of rows is held at a time
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.db_fetch_size
+        ).execute(
+            select(
+                cast(RenewalPairRow.prior_json, Text),
+                cast(RenewalPairRow.renewal_json, Text),
+            )
+            .where(*(filters or []))
+            .order_by(RenewalPairRow.id)
+        )
+        for rows in result.partitions():
+            for prior, renewal in rows:
+                yield parse(prior, renewal)
+
+    def _live_ids(self, conn, filters: list) -> list[int]:
+        from sqlalchemy import func, select
+
+        from app.infra.db_models import RenewalPairRow as Row
+
+        # the highest id per policy number is its live row; filters apply to that row only,
+        # and ids come back where the policy first appeared, the order the book keeps
+        live = (
+            select(func.max(Row.id).label("id"), func.min(Row.id).label("first_id"))
+            .group_by(Row.policy_number)
+            .subquery()
+        )
+        return list(
+            conn.execute(
+                select(live.c.id)
+                .join(Row, Row.id == live.c.id)
+                .where(*filters)
+                .order_by(live.c.first_id)
+            ).scalars()
+        )
+
+    def _fetch_ids(self, conn, ids: list[int]) -> list[RenewalPair]:
+        from sqlalchemy import Text, cast, select
 
-        if sample and sample < len(self._cached_pairs):
-            return random.sample(self._cached_pairs, sample)
-        return list(self._cached_pairs)
+        from app.infra.db_models import RenewalPairRow
+
+        by_id: dict[int, RenewalPair] = {}
+        size = settings.db_fetch_size
+        for start in range(0, len(ids), size):
+            rows = conn.execute(
+                select(
+                    RenewalPairRow.id,
+                    cast(RenewalPairRow.prior_json, Text),
+                    cast(RenewalPairRow.renewal_json, Text),
+                ).where(RenewalPairRow.id.in_(ids[start : start + size]))
+            )
+            for row_id, prior, renewal in rows:
+                by_id[row_id] = _parse_row(prior, renewal)
+        return [by_id[i] for i in ids]
+
+    def query_pairs(self, query: PairQuery) -> list[RenewalPair]:
+        from app.adaptor.persistence.json_loader import JsonDataSource
+
+        if self._book is not None:
+            return self._get_book().query(query)
+        try:
+            return self._select(_query_filters(query), query)
+        except Exception:
+            return JsonDataSource().query_pairs(query)
 
-    def _load(self) -> list[RenewalPair]:
-        from sqlalchemy import create_engine, select
-        from sqlalchemy.orm import Session
+    def _select(self, filters: list, query: PairQuery | None = None) -> list[RenewalPair]:
+        # sample over the matching live ids, then parse only the rows that were drawn
+        with self._get_engine().connect() as conn, gc_paused():
+            ids = self._live_ids(conn, filters)
+            return self._fetch_ids(conn, draw_sample(ids, query) if query else ids)
 
+    def get_pairs(self, policy_numbers: Iterable[str]) -> list[RenewalPair]:
         from app.adaptor.persistence.json_loader import JsonDataSource
         from app.infra.db_models import RenewalPairRow
 
-        sync_url = settings.db_url.replace("+asyncpg", "+psycopg")
-        engine = create_engine(sync_url)
+        if self._book is not None:
+            return self._get_book().get_pairs(policy_numbers)
+        wanted = list(dict.fromkeys(policy_numbers))
+        found: dict[str, RenewalPair] = {}
+        try:
+            size = settings.db_fetch_size
+            for start in range(0, len(wanted), size):
+                chunk = wanted[start : start + size]
+                for pair in self._select([RenewalPairRow.policy_number.in_(chunk)]):
+                    found[pair.prior.policy_number] = pair
+        except Exception:
+            return JsonDataSource().get_pairs(wanted)
+        return [found[pn] for pn in wanted if pn in found]
+
+    def get_account(self, account_id: str) -> list[RenewalPair]:
+        from app.adaptor.persistence.json_loader import JsonDataSource
+        from app.infra.db_models import RenewalPairRow
+
+        if self._book is not None:
+            return self._get_book().get_account(account_id)
+        try:
+            return self._select([RenewalPairRow.account_id == account_id])
+        except Exception:
+            return JsonDataSource().get_account(account_id)
+
+    def _cache(self) -> BookCache:
+        return BookCache(settings.book_cache_dir, f"{settings.db_url}#lazy={settings.lazy_pairs}")
 
+    def _read_book(self, conn) -> list[RenewalPair] | list[LazyPair]:
+        parse = _lazy_row if settings.lazy_pairs else _parse_row
+        # rows are read in id order, so the highest id wins per policy number
+        with gc_paused():
+            return latest_per_policy(self._iter_rows(conn, parse=parse))
+
+    def _load(self) -> list[RenewalPair] | list[LazyPair]:
+        from app.adaptor.persistence.json_loader import JsonDataSource
+
+        cache = self._cache()
+        self._mark = None
+        self._stale = False
         try:
-            with Session(engine) as session:
-                rows = session.execute(select(RenewalPairRow)).scalars().all()
+            with self._get_engine().connect() as conn:
+                mark = self._high_water_mark(conn)
+                key = db_fingerprint(settings.db_url, *mark)
+                pairs = cache.load(key)
+                if pairs is None:
+                    stale = cache.load_stale()
+                    if stale is not None:
+                        # serve the last cached book; the rows are reparsed in the background
+                        self._stale = True
+                        return stale
+                    pairs = self._read_book(conn)
+                    cache.save_in_background(key, pairs)
         except Exception:
-            engine.dispose()
             return JsonDataSource()._load()
 
-        engine.dispose()
-        return [parse_pair({"prior": row.prior_json, "renewal": row.renewal_json}) for row in rows]
+        self._mark = mark
+        return pairs
+
+    def _schedule_rebuild(self, stale: PairBook) -> None:
+        from app.infra.deps import get_job_scheduler
+
+        def rebuild(job: dict, cancel: threading.Event) -> None:
+            try:
+                with self._get_engine().connect() as conn:
+                    mark = self._high_water_mark(conn)
+                    pairs = self._read_book(conn)
+            finally:
+                self._rebuilding = False
+            if self._book is not stale:
+                return  # invalidated or reloaded meanwhile
+            self._book = PairBook(pairs, settings.lazy_pair_cache_size, stale.generation + 1)
+            self._mark = mark
+            self._stale = False
+            self._cache().save(db_fingerprint(settings.db_url, *mark), pairs)
+
+        self._rebuilding = True
+        get_job_scheduler().submit(
+            f"book-{uuid.uuid4().hex[:8]}",
+            rebuild,
+            total=0,
+            priority=REBUILD_PRIORITY,
+            key=("book-rebuild", id(self)),
+        )
+
+    def _refresh(self) -> None:
+        from app.infra.db_models import RenewalPairRow
+
+        if self._mark is None:
+            # a stale book whose rebuild failed is retried on the next check
+            if self._stale and not self._rebuilding:
+                self._schedule_rebuild(self._book)
+            return
+        known_max, known_count = self._mark
+        parse = _lazy_row if settings.lazy_pairs else _parse_row
+        try:
+            with self._get_engine().connect() as conn:
+                mark = self._high_water_mark(conn)
+                if mark == self._mark:
+                    return
+                new_rows = [RenewalPairRow.id > (known_max or 0)]
+                if mark[0] is not None:
+                    new_rows.append(RenewalPairRow.id <= mark[0])
+                with gc_paused():
+                    added = list(self._iter_rows(conn, new_rows, parse=parse))
+        except Exception:
+            logger.warning("Deferring reload of raw_renewals", exc_info=True)
+            return
+
+        if mark[1] != known_count + len(added):
+            # rows were deleted, which ids alone can't describe — rebuild the generation
+            self._install(self._book.generation + 1)
+            return
+        book = self._book.apply_delta(added)
+        self._book = book
+        self._mark = mark
+        self._cache().save_in_background(db_fingerprint(settings.db_url, *mark), book.entries)
 
     def total_count(self) -> int:
-        if self._cached_pairs is None:
-            self._cached_pairs = self._load()
-        return len(self._cached_pairs)
+        return len(self._get_book())
 
     def invalidate_cache(self) -> None:
-        self._cached_pairs = None
+        self._book = None
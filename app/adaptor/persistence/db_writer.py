@@ -1,55 +1,76 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import create_engine, select, update
+from sqlalchemy import create_engine, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.domain.models.review import ReviewResult
+from app.infra.db import Base
 from app.infra.db_models import ComparisonRunRow, LLMResultRow, RuleResultRow
 
 logger = logging.getLogger(__name__)
 
 
+def _rule_row(job_id: str, result: ReviewResult) -> dict:
+    return {
+        "policy_number": result.policy_number,
+        "job_id": job_id,
+        "risk_level": result.risk_level.value,
+        "flags_json": [f.value for f in result.flags],
+        "changes_json": [c.model_dump() for c in result.export_diff().changes],
+        "summary_text": result.summary,
+        "broker_contacted": result.broker_contacted,
+        "quote_generated": result.quote_generated,
+        "quotes_json": [q.model_dump() for q in result.quotes],
+        "reviewed_at": result.reviewed_at,
+    }
+
+
+def _llm_row(job_id: str, result: ReviewResult) -> dict:
+    return {
+        "policy_number": result.policy_number,
+        "job_id": job_id,
+        "risk_level": result.risk_level.value,
+        "insights_json": [i.model_dump() for i in result.llm_insights],
+        "summary_text": result.summary,
+    }
+
+
 class DbResultWriter:
     def __init__(self):
         sync_url = settings.db_url.replace("+asyncpg", "+psycopg")
         self._engine = create_engine(sync_url)
 
     def save_rule_result(self, job_id: str, result: ReviewResult) -> None:
-        try:
-            row = RuleResultRow(
-                policy_number=result.policy_number,
-                job_id=job_id,
-                risk_level=result.risk_level.value,
-                flags_json=[f.value for f in result.diff.flags],
-                changes_json=[c.model_dump() for c in result.diff.changes],
-                summary_text=result.summary,
-                broker_contacted=result.broker_contacted,
-                quote_generated=result.quote_generated,
-                quotes_json=[q.model_dump() for q in result.quotes],
-                reviewed_at=result.reviewed_at,
-            )
-            with Session(self._engine) as session:
-                session.add(row)
-                session.commit()
-        except Exception:
-            logger.warning("Failed to save rule result for %s", result.policy_number)
+        self.save_rule_results(job_id, [result])
 
     def save_llm_result(self, job_id: str, result: ReviewResult) -> None:
+        self.save_llm_results(job_id, [result])
+
+    def save_rule_results(self, job_id: str, results: list[ReviewResult]) -> None:
+        rows = [_rule_row(job_id, r) for r in results]
+        if not self._insert_many(RuleResultRow, rows):
+            logger.warning("Failed to save %d rule results for job %s", len(rows), job_id)
+
+    def save_llm_results(self, job_id: str, results: list[ReviewResult]) -> None:
+        rows = [_llm_row(job_id, r) for r in results]
+        if not self._insert_many(LLMResultRow, rows):
+            logger.warning("Failed to save %d LLM results for job %s", len(rows), job_id)
+
+    def _insert_many(self, model: type[Base], rows: list[dict]) -> bool:
+        if not rows:
+            return True
+        size = settings.batch.write_chunk_size
         try:
-            row = LLMResultRow(
-                policy_number=result.policy_number,
-                job_id=job_id,
-                risk_level=result.risk_level.value,
-                insights_json=[i.model_dump() for i in result.llm_insights],
-                summary_text=result.summary,
-            )
+            # executemany — psycopg batches these into multi-row INSERTs
             with Session(self._engine) as session:
-                session.add(row)
+                for i in range(0, len(rows), size):
+                    session.execute(insert(model), rows[i : i + size])
                 session.commit()
         except Exception:
-            logger.warning("Failed to save LLM result for %s", result.policy_number)
+            return False
+        return True
 
     def _update_rule_field(self, policy_number: str, **kwargs) -> None:
         try:
@@ -1,35 +1,238 @@
 import json
-import random
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TextIO
 
+from app.adaptor.persistence.book_cache import gc_paused
+from app.adaptor.persistence.lazy_pair import LazyPair
+from app.adaptor.persistence.pair_book import PairBook, RefreshGate, policy_number_of
 from app.config import settings
-from app.domain.models.policy import RenewalPair
-from app.domain.services.parser import parse_pair
+from app.domain.models.policy import PairHeader, PairQuery, RenewalPair
+from app.domain.services.pair_query import apply_query, has_filters
+from app.domain.services.parser import parse_pair, parse_pair_json, parse_pairs_json
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_CHARS = 1 << 20
+_TAIL_BYTES = 64
+
+
+def _iter_json_array(f: TextIO) -> Iterator[dict]:
+    # decode one element at a time from a bounded buffer instead of the whole file
+    decoder = json.JSONDecoder()
+    buf = f.read(READ_CHUNK_CHARS).lstrip()
+    if not buf:
+        return
+    if buf[0] != "[":
+        raise ValueError("expected a JSON array of renewal pairs")
+    pos = 1
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            if pos >= len(buf):
+                raise json.JSONDecodeError("buffer exhausted", buf, pos)
+            record, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = f.read(READ_CHUNK_CHARS)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield record
+
+
+def _iter_jsonl(f: TextIO) -> Iterator[dict]:
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _jsonl_files(path: Path) -> list[Path]:
+    if path.is_dir():
+        return sorted(path.glob("*.jsonl"))
+    return [path] if path.suffix == ".jsonl" else []
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    if path.is_dir():
+        for shard in sorted(path.glob("*.jsonl")):
+            yield from iter_records(shard)
+        return
+    with path.open() as f:
+        if path.suffix == ".jsonl":
+            yield from _iter_jsonl(f)
+        else:
+            yield from _iter_json_array(f)
+
+
+@dataclass(slots=True)
+class _FileState:
+    size: int
+    mtime_ns: int
+    # last bytes seen, so a grown JSONL file can be told apart from a rewritten one
+    tail: bytes
+    policy_numbers: set[str]
+
+
+def _source_files(path: Path) -> list[Path]:
+    if not path.exists():
+        return []
+    if path.is_dir():
+        return sorted(path.glob("*.jsonl"))
+    return [path]
+
+
+def _read_tail(path: Path, end: int) -> bytes:
+    with path.open("rb") as f:
+        f.seek(max(0, end - _TAIL_BYTES))
+        return f.read(min(end, _TAIL_BYTES))
+
+
+def _file_state(path: Path, stat: os.stat_result, policy_numbers: set[str]) -> _FileState:
+    return _FileState(
+        stat.st_size, stat.st_mtime_ns, _read_tail(path, stat.st_size), policy_numbers
+    )
 
 
 class JsonDataSource:
     def __init__(self):
-        self._cached_pairs: list[RenewalPair] | None = None
+        self._book: PairBook | None = None
+        self._files: dict[Path, _FileState] = {}
+        self._gate = RefreshGate()
+
+    def _get_book(self) -> PairBook:
+        if self._book is None:
+            self._book = PairBook(self._load(), settings.lazy_pair_cache_size)
+            self._gate.touch()
+        else:
+            with self._gate.attempt(settings.reload_check_seconds) as due:
+                if due:
+                    self._refresh()
+        return self._book
 
     def load_pairs(self, sample: int | None = None) -> list[RenewalPair]:
-        if self._cached_pairs is None:
-            self._cached_pairs = self._load()
+        book = self._get_book()
+        if sample and sample < len(book):
+            return book.sample(sample)
+        return book.pairs()
+
+    def load_entries(self) -> list[RenewalPair | LazyPair]:
+        # the book as stored: a lazy book's entries stay compressed until something resolves them
+        return list(self._get_book().entries)
+
+    def iter_pairs(self) -> Iterator[RenewalPair]:
+        if self._book is not None:
+            return iter(self._get_book())
+        return self._stream()
 
-        if sample and sample < len(self._cached_pairs):
-            return random.sample(self._cached_pairs, sample)
-        return list(self._cached_pairs)
+    def query_pairs(self, query: PairQuery) -> list[RenewalPair]:
+        if self._book is None and has_filters(query):
+            # filter while streaming so only matching pairs are kept
+            with gc_paused():
+                return apply_query(self._stream(), query)
+        # every record has to be parsed either way, so keep the book for next time
+        return self._get_book().query(query)
 
-    def _load(self) -> list[RenewalPair]:
+    def get_pairs(self, policy_numbers: Iterable[str]) -> list[RenewalPair]:
+        return self._get_book().get_pairs(policy_numbers)
+
+    def get_account(self, account_id: str) -> list[RenewalPair]:
+        return self._get_book().get_account(account_id)
+
+    def headers(self) -> list[PairHeader]:
+        return self._get_book().headers()
+
+    def _stream(self) -> Iterator[RenewalPair]:
         data_path = Path(settings.data_path)
         if not data_path.exists():
-            return []
-        raw = json.loads(data_path.read_text())
-        return [parse_pair(rp) for rp in raw]
+            return
+        shards = _jsonl_files(data_path)
+        if not shards:
+            for record in iter_records(data_path):
+                yield parse_pair(record)
+            return
+        for shard in shards:
+            with shard.open("rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield parse_pair_json(line)
+
+    def _read(self, path: Path, offset: int = 0) -> list[RenewalPair] | list[LazyPair]:
+        lazy = settings.lazy_pairs
+        if path.suffix == ".jsonl":
+            parse = LazyPair.from_json if lazy else parse_pair_json
+            with path.open("rb") as f:
+                f.seek(offset)
+                return [parse(line) for line in f if line.strip()]
+        if lazy:
+            return [
+                LazyPair.from_json(json.dumps(record, separators=(",", ":")))
+                for record in iter_records(path)
+            ]
+        # the raw bytes are small next to the models; one native pass beats streaming
+        return parse_pairs_json(path.read_bytes())
+
+    def _load(self) -> list[RenewalPair] | list[LazyPair]:
+        entries: list = []
+        self._files = {}
+        with gc_paused():
+            for path in _source_files(Path(settings.data_path)):
+                stat = path.stat()
+                loaded = self._read(path)
+                self._files[path] = _file_state(path, stat, {policy_number_of(e) for e in loaded})
+                entries.extend(loaded)
+        return entries
+
+    def _refresh(self) -> None:
+        try:
+            current = {p: p.stat() for p in _source_files(Path(settings.data_path))}
+            files = dict(self._files)
+            upserts: list = []
+            deletes: set[str] = set()
+            for path in files.keys() - current.keys():
+                deletes |= files.pop(path).policy_numbers
+            with gc_paused():
+                for path, stat in current.items():
+                    old = files.get(path)
+                    same_size = old is not None and old.size == stat.st_size
+                    if same_size and old.mtime_ns == stat.st_mtime_ns:
+                        continue
+                    # feeds append to JSONL; only the new tail needs parsing
+                    appended = (
+                        old is not None
+                        and path.suffix == ".jsonl"
+                        and stat.st_size > old.size
+                        and _read_tail(path, old.size) == old.tail
+                    )
+                    loaded = self._read(path, old.size if appended else 0)
+                    policy_numbers = {policy_number_of(e) for e in loaded}
+                    if appended:
+                        policy_numbers |= old.policy_numbers
+                    elif old is not None:
+                        deletes |= old.policy_numbers - policy_numbers
+                    files[path] = _file_state(path, stat, policy_numbers)
+                    upserts.extend(loaded)
+        except (OSError, ValueError):
+            # a file mid-write or mid-rename; keep serving this generation and retry later
+            logger.warning("Deferring reload of %s", settings.data_path, exc_info=True)
+            return
+        if files == self._files:
+            return
+        deletes -= {policy_number_of(e) for e in upserts}
+        self._book = self._book.apply_delta(upserts, deletes)
+        self._files = files
 
     def total_count(self) -> int:
-        if self._cached_pairs is None:
-            self._cached_pairs = self._load()
-        return len(self._cached_pairs)
+        return len(self._get_book())
 
     def invalidate_cache(self) -> None:
-        self._cached_pairs = None
+        self._book = None
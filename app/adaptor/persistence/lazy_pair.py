@@ -0,0 +1,61 @@
+import zlib
+
+from pydantic import BaseModel
+
+from app.domain.models.policy import (
+    Code,
+    LowerPolicyType,
+    PairHeader,
+    RenewalPair,
+    SnapshotDate,
+    Text,
+)
+from app.domain.services.parser import parse_pair_json
+
+
+class _SnapshotHead(BaseModel):
+    policy_number: Text
+    policy_type: LowerPolicyType
+    carrier: Text
+    effective_date: SnapshotDate
+    premium: float
+    state: Code = "CA"
+    insured_name: Text = ""
+    account_id: Text = ""
+
+
+class _PairHead(BaseModel):
+    prior: _SnapshotHead
+    renewal: _SnapshotHead
+
+
+class LazyPair:
+    # header fields up front, the rest kept as compressed JSON until a full pair is needed
+    __slots__ = ("header", "_raw")
+
+    def __init__(self, header: PairHeader, raw: bytes):
+        self.header = header
+        self._raw = raw
+
+    @classmethod
+    def from_json(cls, raw: bytes | str) -> "LazyPair":
+        if isinstance(raw, str):
+            raw = raw.encode()
+        head = _PairHead.model_validate_json(raw)
+        prior, renewal = head.prior, head.renewal
+        header = PairHeader(
+            policy_number=prior.policy_number,
+            policy_type=prior.policy_type,
+            state=prior.state,
+            account_id=prior.account_id,
+            insured_name=renewal.insured_name,
+            carrier_prior=prior.carrier,
+            carrier_renewal=renewal.carrier,
+            premium_prior=prior.premium,
+            premium_renewal=renewal.premium,
+            effective_date=renewal.effective_date,
+        )
+        return cls(header, zlib.compress(raw, 1))
+
+    def materialize(self) -> RenewalPair:
+        return parse_pair_json(zlib.decompress(self._raw))
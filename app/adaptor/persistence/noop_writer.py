@@ -10,6 +10,12 @@ class NoopResultWriter:
     def save_llm_result(self, job_id: str, result: ReviewResult) -> None:
         pass
 
+    def save_rule_results(self, job_id: str, results: list[ReviewResult]) -> None:
+        pass
+
+    def save_llm_results(self, job_id: str, results: list[ReviewResult]) -> None:
+        pass
+
     def update_broker_contacted(self, policy_number: str, value: bool) -> None:
         pass
 
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from app.adaptor.persistence.lazy_pair import LazyPair
+from app.domain.models.policy import PairHeader, PairQuery, RenewalPair
+from app.domain.services.pair_query import draw_sample, header_matches
+
+
+def policy_number_of(entry: RenewalPair | LazyPair) -> str:
+    if isinstance(entry, LazyPair):
+        return entry.header.policy_number
+    return entry.prior.policy_number
+
+
+def latest_per_policy(entries: Iterable[RenewalPair | LazyPair]) -> list[RenewalPair | LazyPair]:
+    # one entry per policy number: the last one read, at the position of the first — the
+    # same book apply_delta builds when the later rows arrive as a delta
+    index: dict[str, int] = {}
+    latest: list[RenewalPair | LazyPair] = []
+    for entry in entries:
+        pn = policy_number_of(entry)
+        i = index.get(pn)
+        if i is None:
+            index[pn] = len(latest)
+            latest.append(entry)
+        else:
+            latest[i] = entry
+    return latest
+
+
+class RefreshGate:
+    # lets one caller at a time check a source for changes, at most once per interval;
+    # everyone else keeps reading the current generation
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+
+    def touch(self) -> None:
+        self._last = time.monotonic()
+
+    @contextmanager
+    def attempt(self, interval: float) -> Iterator[bool]:
+        if interval < 0 or time.monotonic() - self._last < interval:
+            yield False
+            return
+        if not self._lock.acquire(blocking=False):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._last = time.monotonic()
+            self._lock.release()
+
+
+class PairBook:
+    # one loaded generation of the book; headers and indexes are built on first use and
+    # never mutated — changes produce a new generation via apply_delta
+    def __init__(
+        self,
+        entries: list[RenewalPair | LazyPair],
+        max_materialized: int = 0,
+        generation: int = 1,
+    ):
+        self.entries = entries
+        self.generation = generation
+        self._max_materialized = max_materialized
+        self._materialized: OrderedDict[int, RenewalPair] = OrderedDict()
+        self._lock = threading.Lock()
+        self._headers: list[PairHeader] | None = None
+        self._by_policy: dict[str, int] | None = None
+        self._by_account: dict[str, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[RenewalPair]:
+        return map(self._resolve, self.entries)
+
+    def _resolve(self, entry: RenewalPair | LazyPair) -> RenewalPair:
+        if not isinstance(entry, LazyPair):
+            return entry
+        key = id(entry)
+        with self._lock:
+            pair = self._materialized.get(key)
+            if pair is not None:
+                self._materialized.move_to_end(key)
+                return pair
+        pair = entry.materialize()
+        if self._max_materialized > 0:
+            with self._lock:
+                self._materialized[key] = pair
+                if len(self._materialized) > self._max_materialized:
+                    self._materialized.popitem(last=False)
+        return pair
+
+    def headers(self) -> list[PairHeader]:
+        if self._headers is None:
+            self._headers = [
+                e.header if isinstance(e, LazyPair) else PairHeader.from_pair(e)
+                for e in self.entries
+            ]
+        return self._headers
+
+    def pairs(self) -> list[RenewalPair]:
+        return list(self)
+
+    def sample(self, size: int) -> list[RenewalPair]:
+        return [self._resolve(e) for e in random.sample(self.entries, size)]
+
+    def query(self, query: PairQuery) -> list[RenewalPair]:
+        # filter on headers first so a lazy book only materializes what is returned
+        positions = [i for i, h in enumerate(self.headers()) if header_matches(h, query)]
+        return [self._resolve(self.entries[i]) for i in draw_sample(positions, query)]
+
+    def _policy_index(self) -> dict[str, int]:
+        if self._by_policy is None:
+            self._by_policy = {h.policy_number: i for i, h in enumerate(self.headers())}
+        return self._by_policy
+
+    def _account_index(self) -> dict[str, list[int]]:
+        if self._by_account is None:
+            index: dict[str, list[int]] = {}
+            for i, h in enumerate(self.headers()):
+                if h.account_id:
+                    index.setdefault(h.account_id, []).append(i)
+            self._by_account = index
+        return self._by_account
+
+    def get_pairs(self, policy_numbers: Iterable[str]) -> list[RenewalPair]:
+        index = self._policy_index()
+        return [
+            self._resolve(self.entries[index[pn]])
+            for pn in dict.fromkeys(policy_numbers)
+            if pn in index
+        ]
+
+    def get_account(self, account_id: str) -> list[RenewalPair]:
+        return [self._resolve(self.entries[i]) for i in self._account_index().get(account_id, [])]
+
+    def apply_delta(
+        self,
+        upserts: Iterable[RenewalPair | LazyPair],
+        deletes: Iterable[str] = (),
+    ) -> "PairBook":
+        # replaced pairs keep their position, new ones are appended, deleted ones dropped
+        index = dict(self._policy_index())
+        entries = list(self.entries)
+        removed = {index[pn] for pn in deletes if pn in index}
+        for entry in upserts:
+            pn = policy_number_of(entry)
+            i = index.get(pn)
+            if i is None:
+                index[pn] = len(entries)
+                entries.append(entry)
+            else:
+                entries[i] = entry
+                removed.discard(i)
+        if removed:
+            entries = [e for i, e in enumerate(entries) if i not in removed]
+        return PairBook(entries, self._max_materialized, self.generation + 1)
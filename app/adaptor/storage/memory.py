@@ -7,15 +7,23 @@ from app.domain.models.review import BatchSummary, ReviewResult
 class InMemoryReviewStore:
     def __init__(self):
         self._store: dict[str, ReviewResult] = {}
+        # bumped on every write so derived views (rule simulation baseline) know to rebuild
+        self.generation = 0
 
     def get(self, policy_number: str) -> ReviewResult | None:
         return self._store.get(policy_number)
 
     def set(self, policy_number: str, result: ReviewResult) -> None:
         self._store[policy_number] = result
+        self.generation += 1
 
     def clear(self) -> None:
         self._store.clear()
+        self.generation += 1
+
+    def replace(self, results: dict[str, ReviewResult]) -> None:
+        self._store = results
+        self.generation += 1
 
     def values(self) -> list[ReviewResult]:
         return list(self._store.values())
@@ -31,6 +39,7 @@ class InMemoryReviewStore:
 
     def __setitem__(self, key: str, value: ReviewResult) -> None:
         self._store[key] = value
+        self.generation += 1
 
 
 class InMemoryHistoryStore:
@@ -1,6 +1,7 @@
-import asyncio
+import threading
 import uuid
-from datetime import datetime
+from collections.abc import MutableMapping
+from datetime import date, datetime
 from enum import StrEnum
 from typing import Annotated
 from zoneinfo import ZoneInfo
@@ -8,19 +9,30 @@ from zoneinfo import ZoneInfo
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 
 from app.adaptor.storage.memory import InMemoryHistoryStore, InMemoryJobStore, InMemoryReviewStore
-from app.application.batch import process_batch
-from app.data_loader import load_pairs, total_count
+from app.application.batch import stream_batch
+from app.application.job_scheduler import JobScheduler
+from app.data_loader import get_pairs, load_entries, query_pairs, total_count
+from app.domain.models.policy import PairHandle, PairQuery, PolicyType, RenewalPair
+from app.domain.models.review import BatchSummary, ReviewResult
 from app.domain.ports.result_writer import ResultWriter
-from app.infra.deps import get_history_store, get_job_store, get_result_writer, get_review_store
+from app.domain.services.pair_query import has_filters
+from app.infra.deps import (
+    get_history_store,
+    get_job_scheduler,
+    get_job_store,
+    get_result_writer,
+    get_review_store,
+)
 
 router = APIRouter(prefix="/batch", tags=["batch"])
 
+# targeted reviews are small — let them jump ahead of queued full-book runs
+SELECTED_PRIORITY = 10
 
-class JobStatus(StrEnum):
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
+
+class RunMode(StrEnum):
+    FULL = "full"
+    INCREMENTAL = "incremental"
 
 
 @router.get("/total-count")
@@ -28,74 +40,136 @@ def get_total_count() -> dict:
     return {"total": total_count()}
 
 
+def _now() -> datetime:
+    return datetime.now(ZoneInfo("America/Vancouver"))
+
+
+def _stream_to_store(
+    job_id: str,
+    job: dict,
+    pairs: list[RenewalPair | PairHandle],
+    store: InMemoryReviewStore | MutableMapping[str, ReviewResult],
+    writer: ResultWriter,
+    previous: dict[str, ReviewResult] | None = None,
+    cancel: threading.Event | None = None,
+) -> BatchSummary:
+    from app.config import settings
+
+    def on_progress(processed, total):
+        job["processed"] = processed
+
+    carried = {id(r) for r in previous.values()} if previous else set()
+    summary = BatchSummary(total=0)
+    pending: list[ReviewResult] = []
+
+    def publish() -> None:
+        now = _now()
+        fresh: list[ReviewResult] = []
+        for r in pending:
+            store[r.policy_number] = r
+            if id(r) not in carried:
+                r.reviewed_at = now
+                fresh.append(r)
+        writer.save_rule_results(job_id, fresh)
+        pending.clear()
+        job["summary"] = summary.model_dump()
+
+    stream = stream_batch(
+        pairs, on_progress=on_progress, previous=previous, summary=summary, cancel=cancel
+    )
+    for result in stream:
+        pending.append(result)
+        if len(pending) >= settings.batch.publish_size:
+            publish()
+    publish()
+    return summary
+
+
+def _replace_store(
+    job_id: str,
+    job: dict,
+    pairs: list[RenewalPair | PairHandle],
+    store: InMemoryReviewStore,
+    writer: ResultWriter,
+    previous: dict[str, ReviewResult] | None = None,
+    cancel: threading.Event | None = None,
+) -> BatchSummary:
+    # a full run lands in a staging map and replaces the store only once it completes, so a
+    # cancelled or failed run leaves the last complete results (and carried ones) in place
+    staged: dict[str, ReviewResult] = {}
+    summary = _stream_to_store(job_id, job, pairs, staged, writer, previous, cancel)
+    if cancel is None or not cancel.is_set():
+        store.replace(staged)
+    return summary
+
+
 @router.post("/run")
 async def run_batch(
     sample: int | None = Query(None, ge=1),
+    mode: RunMode = RunMode.FULL,
+    seed: int | None = None,
+    policy_type: PolicyType | None = None,
+    state: str | None = None,
+    carrier: str | None = None,
+    account_id: str | None = None,
+    effective_from: date | None = None,
+    effective_to: date | None = None,
     store: InMemoryReviewStore = Depends(get_review_store),
     history: InMemoryHistoryStore = Depends(get_history_store),
     jobs: InMemoryJobStore = Depends(get_job_store),
+    scheduler: JobScheduler = Depends(get_job_scheduler),
     writer: ResultWriter = Depends(get_result_writer),
 ) -> dict:
-    pairs = load_pairs(sample)
+    query = PairQuery(
+        sample=sample,
+        seed=seed,
+        policy_type=policy_type,
+        state=state,
+        carrier=carrier,
+        account_id=account_id,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+    # subset runs are pushed down to the source; only a full run warms the book cache, and
+    # takes its entries as stored (a lazy book is materialized a chunk at a time)
+    full = query.sample is None and not has_filters(query)
+    pairs = load_entries() if full else query_pairs(query)
     if not pairs:
         raise HTTPException(status_code=404, detail="No data found. Run data/generate.py first.")
 
     job_id = str(uuid.uuid4())[:8]
-    jobs.set(
-        job_id,
-        {
-            "status": JobStatus.RUNNING,
-            "summary": None,
-            "error": None,
-            "processed": 0,
-            "total": len(pairs),
-        },
-    )
-
-    async def _process():
-        try:
-            job = jobs.get(job_id)
-
-            def on_progress(processed, total):
-                job["processed"] = processed
-
-            loop = asyncio.get_event_loop()
-            results, summary = await loop.run_in_executor(
-                None, lambda: process_batch(pairs, on_progress=on_progress)
-            )
-            jobs.last_summary = summary
-
-            now = datetime.now(ZoneInfo("America/Vancouver"))
-            store.clear()
-            for r in results:
-                r.reviewed_at = now
-                store[r.policy_number] = r
-                writer.save_rule_result(job_id, r)
 
-            job["status"] = JobStatus.COMPLETED
-            job["summary"] = summary.model_dump()
-
-            from app.domain.models.analytics import BatchRunRecord
-
-            record = BatchRunRecord(
-                job_id=job_id,
-                total=summary.total,
-                no_action_needed=summary.no_action_needed,
-                review_recommended=summary.review_recommended,
-                action_required=summary.action_required,
-                urgent_review=summary.urgent_review,
-                processing_time_ms=summary.processing_time_ms,
-                created_at=now,
-            )
-            history.append(record)
-        except Exception as e:
-            job = jobs.get(job_id)
-            job["status"] = JobStatus.FAILED
-            job["error"] = str(e)
-
-    asyncio.create_task(_process())
-
-    return {"job_id": job_id, "status": JobStatus.RUNNING, "total": len(pairs)}
+    def _process(job: dict, cancel: threading.Event) -> None:
+        previous = None
+        if mode == RunMode.INCREMENTAL:
+            previous = {r.policy_number: r for r in store.values()}
+
+        summary = _replace_store(job_id, job, pairs, store, writer, previous, cancel)
+        job["summary"] = summary.model_dump()
+        if cancel.is_set():
+            return
+        jobs.last_summary = summary
+
+        from app.domain.models.analytics import BatchRunRecord
+
+        record = BatchRunRecord(
+            job_id=job_id,
+            total=summary.total,
+            no_action_needed=summary.no_action_needed,
+            review_recommended=summary.review_recommended,
+            action_required=summary.action_required,
+            urgent_review=summary.urgent_review,
+            processing_time_ms=summary.processing_time_ms,
+            created_at=_now(),
+            stage_timings=summary.stage_timings,
+        )
+        history.append(record)
+
+    job_id = scheduler.submit(
+        job_id, _process, total=len(pairs), key=("run", query.model_dump_json(), mode)
+    )
+    job = jobs.get(job_id)
+    return {"job_id": job_id, "status": job["status"], "total": job["total"], "mode": mode}
 
 
 @router.post("/review-selected")
@@ -103,63 +177,53 @@ async def review_selected(
     policy_numbers: Annotated[list[str], Body(embed=True)],
     store: InMemoryReviewStore = Depends(get_review_store),
     jobs: InMemoryJobStore = Depends(get_job_store),
+    scheduler: JobScheduler = Depends(get_job_scheduler),
     writer: ResultWriter = Depends(get_result_writer),
 ) -> dict:
-    all_pairs = load_pairs()
-    target = set(policy_numbers)
-    pairs = [p for p in all_pairs if p.prior.policy_number in target]
+    pairs = get_pairs(policy_numbers)
     if not pairs:
         raise HTTPException(status_code=404, detail="No matching policies found.")
 
     job_id = str(uuid.uuid4())[:8]
-    jobs.set(
-        job_id,
-        {
-            "status": JobStatus.RUNNING,
-            "summary": None,
-            "error": None,
-            "processed": 0,
-            "total": len(pairs),
-        },
-    )
-
-    async def _process():
-        try:
-            job = jobs.get(job_id)
 
-            def on_progress(processed, total):
-                job["processed"] = processed
-
-            loop = asyncio.get_event_loop()
-            results, summary = await loop.run_in_executor(
-                None, lambda: process_batch(pairs, on_progress=on_progress)
-            )
+    def _process(job: dict, cancel: threading.Event) -> None:
+        summary = _stream_to_store(job_id, job, pairs, store, writer, cancel=cancel)
+        job["summary"] = summary.model_dump()
+        if not cancel.is_set():
             jobs.last_summary = summary
 
-            now = datetime.now(ZoneInfo("America/Vancouver"))
-            for r in results:
-                r.reviewed_at = now
-                store[r.policy_number] = r
-                writer.save_rule_result(job_id, r)
-
-            job["status"] = JobStatus.COMPLETED
-            job["summary"] = summary.model_dump()
-        except Exception as e:
-            job = jobs.get(job_id)
-            job["status"] = JobStatus.FAILED
-            job["error"] = str(e)
+    job_id = scheduler.submit(
+        job_id,
+        _process,
+        total=len(pairs),
+        priority=SELECTED_PRIORITY,
+        key=("review-selected", frozenset(policy_numbers)),
+    )
+    job = jobs.get(job_id)
+    return {"job_id": job_id, "status": job["status"], "total": job["total"]}
 
-    asyncio.create_task(_process())
 
-    return {"job_id": job_id, "status": JobStatus.RUNNING, "total": len(pairs)}
+@router.post("/cancel/{job_id}")
+def cancel_job(
+    job_id: str,
+    jobs: InMemoryJobStore = Depends(get_job_store),
+    scheduler: JobScheduler = Depends(get_job_scheduler),
+) -> dict:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not scheduler.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} already {job['status']}")
+    return {"job_id": job_id, "status": job["status"], "cancel_requested": True}
 
 
 @router.get("/status/{job_id}")
 def get_job_status(
     job_id: str,
     jobs: InMemoryJobStore = Depends(get_job_store),
+    scheduler: JobScheduler = Depends(get_job_scheduler),
 ) -> dict:
     job = jobs.get(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-    return {"job_id": job_id, **job}
+    return {"job_id": job_id, **job, "queue_position": scheduler.queue_position(job_id)}
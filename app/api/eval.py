@@ -8,7 +8,7 @@ from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.adaptor.storage.memory import InMemoryReviewStore
-from app.application.batch import process_pair, risk_distribution
+from app.application.batch import process_batch, process_pair, risk_distribution
 from app.domain.models.review import RiskLevel
 from app.domain.ports.result_writer import ResultWriter
 from app.domain.services.parser import parse_pair
@@ -103,7 +103,9 @@ async def migration_comparison(
     review_recommended = [
         r
         for r in store.values()
-        if r.risk_level == RiskLevel.REVIEW_RECOMMENDED and r.pair and r.reviewed_at is not None
+        if r.risk_level == RiskLevel.REVIEW_RECOMMENDED
+        and r.header is not None
+        and r.reviewed_at is not None
     ]
     if not review_recommended:
         raise HTTPException(
@@ -149,11 +151,12 @@ async def migration_comparison(
 
                 _migration_jobs[job_id]["phase"] = "llm"
                 _migration_jobs[job_id]["processed"] = 0
+
+                def on_progress(processed, total):
+                    _migration_jobs[job_id]["processed"] = processed
+
                 llm_start = time.perf_counter()
-                llm_results = []
-                for i, p in enumerate(pairs):
-                    llm_results.append(process_pair(p, llm_client=client))
-                    _migration_jobs[job_id]["processed"] = i + 1
+                llm_results, _ = process_batch(pairs, llm_client=client, on_progress=on_progress)
                 llm_time = (time.perf_counter() - llm_start) * 1000
 
                 return basic_results, basic_time, llm_results, llm_time
@@ -169,7 +172,7 @@ async def migration_comparison(
                     r.broker_contacted = existing.broker_contacted
                     r.quote_generated = existing.quote_generated
                 store[r.policy_number] = r
-                writer.save_llm_result(job_id, r)
+            writer.save_llm_results(job_id, llm_results)
 
             examples = []
             all_compared = []
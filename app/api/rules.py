@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from app.adaptor.storage.memory import InMemoryReviewStore
+from app.application.rule_simulation import risk_baseline, simulate
+from app.domain.models.diff import RuleStats
+from app.domain.models.policy import split_limit
+from app.domain.models.review import RuleSimulation
+from app.domain.services.rules import reset_rule_counters, rule_stats
+from app.infra.deps import get_review_store
+
+router = APIRouter(prefix="/rules", tags=["rules"])
+
+
+@router.get("/stats", response_model=list[RuleStats])
+def get_rule_stats() -> list[RuleStats]:
+    return rule_stats()
+
+
+@router.delete("/stats", status_code=204)
+def clear_rule_stats() -> None:
+    reset_rule_counters()
+
+
+class SimulateRequest(BaseModel):
+    # unset thresholds keep their configured value
+    premium_high_pct: float | None = None
+    premium_critical_pct: float | None = None
+    youthful_operator_age: int | None = None
+    um_uim_min_limit: str | None = None
+
+
+@router.post("/simulate", response_model=RuleSimulation)
+def simulate_thresholds(
+    request: SimulateRequest,
+    limit: int = Query(500, ge=0),
+    store: InMemoryReviewStore = Depends(get_review_store),
+) -> RuleSimulation:
+    from app.config import settings
+
+    if request.um_uim_min_limit is not None:
+        try:
+            split_limit(request.um_uim_min_limit)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid limit: {e}") from e
+
+    baseline = risk_baseline(store)
+    if not len(baseline):
+        raise HTTPException(status_code=404, detail="No reviewed policies. Run a batch first.")
+
+    current = settings.rules
+    candidate = current.model_copy(update=request.model_dump(exclude_none=True))
+    return simulate(baseline, current, candidate, limit)
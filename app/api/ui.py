@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.templating import Jinja2Templates
 
 from app.adaptor.storage.memory import InMemoryReviewStore
-from app.data_loader import invalidate_cache, load_pairs, total_count
+from app.data_loader import get_pairs, headers, invalidate_cache, total_count
 from app.domain.labels import LABELS, get_label
 from app.domain.models.diff import DiffResult
 from app.domain.models.review import ReviewResult, RiskLevel
@@ -29,15 +29,20 @@ templates.env.globals["labels_json"] = json.dumps(LABELS)
 PAGE_SIZE = 50
 
 
-def _pending_row(policy_number: str, pair):
+def _pending_row(policy_number: str):
     return ReviewResult(
         policy_number=policy_number,
         risk_level=RiskLevel.NO_ACTION_NEEDED,
         diff=DiffResult(policy_number=policy_number, changes=[], flags=[]),
-        pair=pair,
     )
 
 
+def _insured_name(r: ReviewResult, names: dict[str, str]) -> str:
+    if r.header:
+        return r.header.insured_name
+    return names.get(r.policy_number, "")
+
+
 @router.get("/")
 def dashboard(
     request: Request,
@@ -51,7 +56,8 @@ def dashboard(
     order: str = Query("asc", description="Sort order"),
     store: InMemoryReviewStore = Depends(get_review_store),
 ):
-    all_pairs = load_pairs()
+    # listing rows only need header fields, so a lazy book is never materialized here
+    all_headers = headers()
     data_total = total_count()
 
     reviewed_pns: set[str] = set()
@@ -60,10 +66,9 @@ def dashboard(
         reviewed_pns.add(result.policy_number)
         reviewed_rows.append(result)
 
+    names = {h.policy_number: h.insured_name for h in all_headers}
     unreviewed_rows = [
-        _pending_row(p.prior.policy_number, p)
-        for p in all_pairs
-        if p.prior.policy_number not in reviewed_pns
+        _pending_row(h.policy_number) for h in all_headers if h.policy_number not in reviewed_pns
     ]
 
     reviewed_rows.sort(key=lambda r: _RISK_SEVERITY[r.risk_level], reverse=True)
@@ -109,7 +114,7 @@ def dashboard(
 
     if sort == "account":
         all_results.sort(
-            key=lambda r: (r.pair.renewal.insured_name if r.pair else "").lower(),
+            key=lambda r: _insured_name(r, names).lower(),
             reverse=(order == "desc"),
         )
 
@@ -140,6 +145,7 @@ def dashboard(
             "order": order,
             "broker": broker,
             "data_total": data_total,
+            "insured_names": names,
         },
     )
 
@@ -161,6 +167,8 @@ def review_detail(
     result = store.get(policy_number)
     if result is None:
         raise HTTPException(status_code=404, detail=f"No review found for {policy_number}")
+    # resolved once for the page; a detached pair is rebuilt on every read
+    pair = result.pair
     back_url, back_label = _BACK_LINKS.get(ref, _DEFAULT_BACK)
     quotes_json = json.dumps([q.model_dump() for q in result.quotes])
     return templates.TemplateResponse(
@@ -169,6 +177,7 @@ def review_detail(
             "request": request,
             "active": ref or "dashboard",
             "result": result,
+            "pair": pair,
             "back_url": back_url,
             "back_label": back_label,
             "quotes_json": quotes_json,
@@ -189,13 +198,15 @@ def _extract_account_lookup(
     return lookup
 
 
-def _build_account_lookup() -> dict[str, tuple[str, str]]:
-    pairs = load_pairs()
+def _build_account_lookup(policy_numbers: list[str]) -> dict[str, tuple[str, str]]:
+    if not policy_numbers:
+        return {}
+    pairs = get_pairs(policy_numbers)
     lookup = _extract_account_lookup(pairs)
     if not lookup and pairs:
         # Cache may hold stale data from before account_id was added
         invalidate_cache()
-        lookup = _extract_account_lookup(load_pairs())
+        lookup = _extract_account_lookup(get_pairs(policy_numbers))
     return lookup
 
 
@@ -209,15 +220,18 @@ def portfolio_page(
 ):
     all_results = list(store.values())
 
-    # Build lookup from current data source for account enrichment
-    acct_lookup = _build_account_lookup()
+    # Build lookup from current data source for results whose stored pair lacks account_id
+    acct_lookup = _build_account_lookup(
+        [r.policy_number for r in all_results if not (r.header and r.header.account_id)]
+    )
 
     # Group by account_id (prefer stored pair, fallback to data source)
     account_map: dict[str, list] = {}
     account_names: dict[str, str] = {}
     for r in all_results:
-        acct = r.pair.renewal.account_id if r.pair else ""
-        name = r.pair.renewal.insured_name if r.pair else ""
+        header = r.header
+        acct = header.account_id if header else ""
+        name = header.insured_name if header else ""
 
         # Enrich from data source if stored pair lacks account_id
         if not acct and r.policy_number in acct_lookup:
@@ -231,8 +245,9 @@ def portfolio_page(
 
     accounts = []
     for acct_id, results in account_map.items():
-        has_auto = any(r.pair and r.pair.renewal.policy_type.value == "auto" for r in results)
-        has_home = any(r.pair and r.pair.renewal.policy_type.value == "home" for r in results)
+        types = {r.header.policy_type.value for r in results if r.header}
+        has_auto = "auto" in types
+        has_home = "home" in types
         if has_auto and has_home:
             acct_type = "Bundle"
         elif has_auto:
@@ -240,7 +255,7 @@ def portfolio_page(
         else:
             acct_type = "Home"
 
-        total_premium = sum(r.pair.renewal.premium for r in results if r.pair)
+        total_premium = sum(r.header.premium_renewal for r in results if r.header)
         highest_risk = max(results, key=lambda r: _RISK_SEVERITY[r.risk_level])
         insured_name = account_names.get(acct_id, results[0].policy_number)
         policy_numbers = [r.policy_number for r in results]
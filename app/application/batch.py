@@ -1,14 +1,27 @@
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from app.application.llm_analysis import analyze_pair, generate_summary, should_analyze
-from app.domain.models.diff import DiffFlag
-from app.domain.models.policy import RenewalPair
+from app.application.llm_stage import run_llm_stage
+from app.application.stage_timer import StageTimer
+from app.domain.models.diff import DiffFlag, DiffResult
+from app.domain.models.enums import Stage
+from app.domain.models.policy import PairHandle, RenewalPair, entry_header, resolve_pair
 from app.domain.models.review import BatchSummary, ReviewResult, RiskLevel
 from app.domain.ports.llm import LLMPort
 from app.domain.services.aggregator import aggregate
-from app.domain.services.differ import compute_diff
-from app.domain.services.rules import flag_diff
+from app.domain.services.book_rules import scalar_flags
+from app.domain.services.differ import diff_changes
+from app.domain.services.fingerprint import pair_fingerprint, rules_version
+from app.domain.services.notes_rules import flag_notes_batch, flag_notes_keywords
+from app.domain.services.rules import (
+    flag_changes,
+    merge_rule_counters,
+    reset_rule_counters,
+    snapshot_rule_counters,
+)
 
 URGENT_REVIEW_FLAGS = {
     DiffFlag.PREMIUM_INCREASE_CRITICAL,
@@ -35,31 +48,57 @@ def assign_risk_level(flags: list[DiffFlag]) -> RiskLevel:
     return RiskLevel.NO_ACTION_NEEDED
 
 
-def process_pair(pair: RenewalPair, llm_client: LLMPort | None = None) -> ReviewResult:
-    diff = compute_diff(pair)
-    diff = flag_diff(diff, pair)
-    rule_risk = assign_risk_level(diff.flags)
+def process_pair(
+    pair: RenewalPair,
+    llm_client: LLMPort | None = None,
+    pair_flags: list[DiffFlag] | None = None,
+    timer: StageTimer | None = None,
+    notes_flags: list[DiffFlag] | None = None,
+) -> ReviewResult:
+    timer = timer if timer is not None else StageTimer()
+    t = time.perf_counter()
+    changes = diff_changes(pair)
+    t = timer.record(Stage.DIFF, t)
+    if notes_flags is None:
+        notes_flags = flag_notes_keywords(pair.renewal.notes)
+        t = timer.record(Stage.NOTES, t)
+    flags = flag_changes(changes, pair, pair_flags=pair_flags, notes_flags=notes_flags)
+    t = timer.record(Stage.FLAG, t)
+    rule_risk = assign_risk_level(flags)
+    policy_number = pair.prior.policy_number
 
-    if llm_client and diff.flags and should_analyze(diff, pair):
+    diff = None
+    if llm_client and flags:
+        # the LLM prompts need the pydantic diff; rule-only results keep the records
+        diff = DiffResult.from_records(policy_number, changes, flags)
+    if diff is not None and should_analyze(diff, pair):
         insights = analyze_pair(llm_client, diff, pair)
-        result = aggregate(pair.prior.policy_number, rule_risk, diff, insights)
+        t = timer.record(Stage.LLM_ANALYSIS, t)
+        result = aggregate(policy_number, rule_risk, diff, insights)
         result.pair = pair
     else:
         summary_parts = []
-        if diff.flags:
-            summary_parts.append(f"Flags: {', '.join(f.value for f in diff.flags)}")
+        if flags:
+            summary_parts.append(f"Flags: {', '.join(f.value for f in flags)}")
         summary_parts.append(f"Risk: {rule_risk.value}")
 
-        result = ReviewResult(
-            policy_number=pair.prior.policy_number,
-            risk_level=rule_risk,
-            diff=diff,
-            summary=" | ".join(summary_parts),
-            pair=pair,
-        )
+        summary = " | ".join(summary_parts)
+        if diff is None:
+            result = ReviewResult.from_records(
+                policy_number, rule_risk, changes, flags, summary=summary, pair=pair
+            )
+        else:
+            result = ReviewResult(
+                policy_number=policy_number,
+                risk_level=rule_risk,
+                diff=diff,
+                summary=summary,
+                pair=pair,
+            )
 
-    if llm_client and diff.flags:
+    if llm_client and flags:
         llm_summary = generate_summary(llm_client, result)
+        timer.record(Stage.LLM_SUMMARY, t)
         if llm_summary:
             result.summary = llm_summary
             result.llm_summary_generated = True
@@ -68,11 +107,12 @@ def process_pair(pair: RenewalPair, llm_client: LLMPort | None = None) -> Review
 
 
 def enrich_with_llm(result: ReviewResult, client: LLMPort) -> None:
-    if not result.pair or not result.diff.flags:
+    pair = result.pair
+    if not pair or not result.flags:
         return
 
-    if not result.llm_insights and should_analyze(result.diff, result.pair):
-        insights = analyze_pair(client, result.diff, result.pair)
+    if not result.llm_insights and should_analyze(result.diff, pair):
+        insights = analyze_pair(client, result.diff, pair)
         result.llm_insights = insights
         aggregated = aggregate(result.policy_number, result.risk_level, result.diff, insights)
         result.risk_level = aggregated.risk_level
@@ -95,29 +135,247 @@ def risk_distribution(results: list[ReviewResult]) -> dict[str, int]:
     }
 
 
-def process_batch(
-    pairs: list[RenewalPair],
-    llm_client: LLMPort | None = None,
-    on_progress: Callable[[int, int], None] | None = None,
-) -> tuple[list[ReviewResult], BatchSummary]:
-    start = time.perf_counter()
-
-    total = len(pairs)
-    results = []
-    for i, p in enumerate(pairs):
-        results.append(process_pair(p, llm_client))
-        if on_progress:
-            on_progress(i + 1, total)
-    elapsed_ms = (time.perf_counter() - start) * 1000
-
+def summarize(results: list[ReviewResult], processing_time_ms: float = 0.0) -> BatchSummary:
     dist = risk_distribution(results)
-    summary = BatchSummary(
+    return BatchSummary(
         total=len(results),
         no_action_needed=dist["no_action_needed"],
         review_recommended=dist["review_recommended"],
         action_required=dist["action_required"],
         urgent_review=dist["urgent_review"],
         llm_analyzed=sum(1 for r in results if r.llm_insights),
-        processing_time_ms=round(elapsed_ms, 1),
+        processing_time_ms=round(processing_time_ms, 1),
+    )
+
+
+def merge_into(summary: BatchSummary, other: BatchSummary) -> None:
+    summary.total += other.total
+    summary.no_action_needed += other.no_action_needed
+    summary.review_recommended += other.review_recommended
+    summary.action_required += other.action_required
+    summary.urgent_review += other.urgent_review
+    summary.llm_analyzed += other.llm_analyzed
+    summary.carried_forward += other.carried_forward
+
+
+def _review(
+    pair: RenewalPair,
+    version: str,
+    pair_flags: list[DiffFlag],
+    notes_flags: list[DiffFlag],
+    timer: StageTimer,
+) -> ReviewResult:
+    result = process_pair(pair, pair_flags=pair_flags, timer=timer, notes_flags=notes_flags)
+    result.pair_fingerprint = pair_fingerprint(pair)
+    result.rules_version = version
+    return result
+
+
+def _review_chunk(
+    entries: list[RenewalPair | PairHandle],
+    version: str,
+    timer: StageTimer,
+    on_review: Callable[[], None] | None = None,
+) -> list[ReviewResult]:
+    # lazy book entries are materialized for this chunk only; each result keeps its entry
+    pairs = [resolve_pair(e) for e in entries]
+    t = time.perf_counter()
+    pair_flags = scalar_flags(pairs)
+    t = timer.record(Stage.PREPASS, t)
+    # like the pre-pass, notes are scanned once per chunk
+    notes_flags = flag_notes_batch(p.renewal.notes for p in pairs)
+    timer.record(Stage.NOTES, t)
+    results = []
+    for e, p, f, n in zip(entries, pairs, pair_flags, notes_flags, strict=True):
+        result = _review(p, version, f, n, timer)
+        result.attach_pair(e)
+        results.append(result)
+        if on_review:
+            on_review()
+    return results
+
+
+def _process_chunk(
+    entries: list[RenewalPair | PairHandle], version: str
+) -> tuple[list[ReviewResult], BatchSummary, StageTimer, dict[DiffFlag, tuple[int, int, int]]]:
+    # runs in a worker process: rule counters start from zero and travel back with the chunk
+    reset_rule_counters()
+    timer = StageTimer()
+    results = _review_chunk(entries, version, timer)
+    summary = summarize(results)
+    # the parent already holds the entries — don't ship them back across the process boundary
+    for r in results:
+        r.pair = None
+    return results, summary, timer, snapshot_rule_counters()
+
+
+def _iter_sequential(
+    chunks: list[list[RenewalPair | PairHandle]],
+    version: str,
+    timer: StageTimer,
+    on_progress: Callable[[int], None] | None,
+) -> Iterator[tuple[list[ReviewResult], BatchSummary | None]]:
+    processed = 0
+
+    def on_review() -> None:
+        nonlocal processed
+        processed += 1
+        if on_progress:
+            on_progress(processed)
+
+    for chunk in chunks:
+        yield _review_chunk(chunk, version, timer, on_review), None
+
+
+def _iter_parallel(
+    chunks: list[list[RenewalPair | PairHandle]],
+    version: str,
+    workers: int,
+    timer: StageTimer,
+    on_progress: Callable[[int], None] | None,
+) -> Iterator[tuple[list[ReviewResult], BatchSummary | None]]:
+    completed: dict[int, tuple[list[ReviewResult], BatchSummary]] = {}
+    next_idx = 0
+    processed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_process_chunk, chunk, version): i for i, chunk in enumerate(chunks)
+        }
+        try:
+            for future in as_completed(futures):
+                idx = futures[future]
+                results, summary, chunk_timer, rule_counts = future.result()
+                timer.merge(chunk_timer)
+                merge_rule_counters(rule_counts)
+                for entry, r in zip(chunks[idx], results, strict=True):
+                    r.attach_pair(entry)
+                completed[idx] = (results, summary)
+                processed += len(results)
+                if on_progress:
+                    on_progress(processed)
+                # hold out-of-order chunks back so results keep input order
+                while next_idx in completed:
+                    yield completed.pop(next_idx)
+                    next_idx += 1
+        finally:
+            # closed early (cancellation): drop chunks that haven't started
+            pool.shutdown(cancel_futures=True)
+
+
+def partition_unchanged(
+    entries: list[RenewalPair | PairHandle], previous: Mapping[str, ReviewResult], version: str
+) -> tuple[list[RenewalPair | PairHandle], dict[int, ReviewResult]]:
+    changed: list[RenewalPair | PairHandle] = []
+    carried: dict[int, ReviewResult] = {}
+    for i, entry in enumerate(entries):
+        prev = previous.get(entry_header(entry).policy_number)
+        if (
+            prev is not None
+            and prev.rules_version == version
+            and prev.pair_fingerprint == pair_fingerprint(resolve_pair(entry))
+        ):
+            prev.attach_pair(entry)
+            carried[i] = prev
+        else:
+            changed.append(entry)
+    return changed, carried
+
+
+def stream_batch(
+    pairs: list[RenewalPair | PairHandle],
+    llm_client: LLMPort | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    previous: Mapping[str, ReviewResult] | None = None,
+    summary: BatchSummary | None = None,
+    cancel: threading.Event | None = None,
+) -> Iterator[ReviewResult]:
+    from app.config import settings
+
+    workers = workers or settings.batch.workers
+    chunk_size = chunk_size or settings.batch.chunk_size
+    summary = summary if summary is not None else BatchSummary(total=0)
+    start = time.perf_counter()
+    version = rules_version()
+    timer = StageTimer()
+
+    todo, carried = pairs, {}
+    if previous is not None:
+        todo, carried = partition_unchanged(pairs, previous, version)
+
+    total = len(pairs)
+    offset = len(carried)
+
+    def progress(done: int) -> None:
+        if on_progress:
+            on_progress(offset + done, total)
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    # with an LLM client the rule pass is cheap next to network round trips,
+    # so progress tracks the LLM stage instead
+    rule_progress = progress if llm_client is None else None
+
+    chunks = [todo[i : i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        chunk_iter = _iter_parallel(chunks, version, workers, timer, rule_progress)
+    else:
+        chunk_iter = _iter_sequential(chunks, version, timer, rule_progress)
+
+    def fresh() -> Iterator[ReviewResult]:
+        enriched = 0
+        for results, chunk_summary in chunk_iter:
+            if llm_client is not None:
+                run_llm_stage(
+                    results,
+                    llm_client,
+                    on_progress=lambda d, _, base=enriched: progress(base + d),
+                    timer=timer,
+                )
+                enriched += len(results)
+                # LLM escalation can raise risk levels, so worker counts are stale
+                chunk_summary = None
+            merge_into(summary, chunk_summary or summarize(results))
+            summary.processing_time_ms = round((time.perf_counter() - start) * 1000, 1)
+            yield from results
+            # cancellation is checked between chunks so the summary matches what was yielded
+            if cancelled():
+                return
+
+    fresh_iter = fresh()
+    for i in range(total):
+        if i in carried:
+            if cancelled():
+                break
+            r = carried[i]
+            merge_into(summary, summarize([r]))
+            summary.carried_forward += 1
+            yield r
+        else:
+            r = next(fresh_iter, None)
+            if r is None:
+                break
+            yield r
+    fresh_iter.close()
+    chunk_iter.close()
+
+    summary.processing_time_ms = round((time.perf_counter() - start) * 1000, 1)
+    summary.stage_timings = timer.summary()
+
+
+def process_batch(
+    pairs: list[RenewalPair | PairHandle],
+    llm_client: LLMPort | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    previous: Mapping[str, ReviewResult] | None = None,
+) -> tuple[list[ReviewResult], BatchSummary]:
+    summary = BatchSummary(total=0)
+    results = list(
+        stream_batch(pairs, llm_client, on_progress, workers, chunk_size, previous, summary)
     )
     return results, summary
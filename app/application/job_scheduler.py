@@ -0,0 +1,105 @@
+import heapq
+import itertools
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.domain.models.enums import JobStatus
+from app.domain.ports.storage import JobStore
+
+JobFn = Callable[[dict, threading.Event], None]
+
+
+class JobScheduler:
+    # thread-based so it works regardless of which event loop (if any) submits jobs
+    def __init__(self, jobs: JobStore, max_concurrent: int = 1):
+        self._jobs = jobs
+        self._max_concurrent = max_concurrent
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="batch-job"
+        )
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queue: list[tuple[int, int, str]] = []  # (-priority, seq, job_id)
+        self._pending: dict[str, tuple[JobFn, Hashable | None]] = {}
+        self._keys: dict[Hashable, str] = {}
+        self._cancel: dict[str, threading.Event] = {}
+        self._running = 0
+
+    def submit(
+        self,
+        job_id: str,
+        fn: JobFn,
+        total: int,
+        priority: int = 0,
+        key: Hashable | None = None,
+    ) -> str:
+        with self._lock:
+            if key is not None and key in self._keys:
+                return self._keys[key]
+            self._jobs.set(
+                job_id,
+                {
+                    "status": JobStatus.PENDING,
+                    "summary": None,
+                    "error": None,
+                    "processed": 0,
+                    "total": total,
+                },
+            )
+            heapq.heappush(self._queue, (-priority, next(self._seq), job_id))
+            self._pending[job_id] = (fn, key)
+            if key is not None:
+                self._keys[key] = job_id
+            self._dispatch()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._pending:
+                _, key = self._pending.pop(job_id)
+                self._keys.pop(key, None)
+                self._jobs.get(job_id)["status"] = JobStatus.CANCELLED
+                return True
+            event = self._cancel.get(job_id)
+            if event is None:
+                return False
+            event.set()
+            return True
+
+    def queue_position(self, job_id: str) -> int | None:
+        with self._lock:
+            if job_id not in self._pending:
+                return None
+            live = sorted(e for e in self._queue if e[2] in self._pending)
+            return next(i for i, e in enumerate(live, 1) if e[2] == job_id)
+
+    def _dispatch(self) -> None:
+        while self._running < self._max_concurrent and self._queue:
+            _, _, job_id = heapq.heappop(self._queue)
+            entry = self._pending.pop(job_id, None)
+            if entry is None:  # cancelled while queued
+                continue
+            fn, key = entry
+            self._keys.pop(key, None)
+            self._cancel[job_id] = threading.Event()
+            self._jobs.get(job_id)["status"] = JobStatus.RUNNING
+            self._running += 1
+            self._executor.submit(self._run, job_id, fn, self._cancel[job_id])
+
+    def _run(self, job_id: str, fn: JobFn, cancel: threading.Event) -> None:
+        job = self._jobs.get(job_id)
+        status = JobStatus.FAILED
+        try:
+            fn(job, cancel)
+            status = JobStatus.CANCELLED if cancel.is_set() else JobStatus.COMPLETED
+        except Exception as e:
+            job["error"] = str(e)
+        finally:
+            with self._lock:
+                # retire the job before publishing its final status, so a caller that sees
+                # it finished can no longer cancel it
+                self._running -= 1
+                del self._cancel[job_id]
+                job["status"] = status
+                self._dispatch()
@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 from pydantic import ValidationError
 
 from app.application.prompts import (
@@ -95,13 +97,13 @@ def _analyze_endorsement(client: LLMPort, prior_desc: str, renewal_desc: str) ->
 
 
 def generate_summary(client: LLMPort, result: ReviewResult) -> str | None:
-    if result.pair is None:
+    header = result.header
+    if header is None:
         return None
 
-    pair = result.pair
     diff = result.diff
-    prior_premium = pair.prior.premium
-    renewal_premium = pair.renewal.premium
+    prior_premium = header.premium_prior
+    renewal_premium = header.premium_renewal
     if prior_premium > 0:
         pct = ((renewal_premium - prior_premium) / prior_premium) * 100
         premium_change = f"{pct:+.1f}%"
@@ -123,8 +125,8 @@ def generate_summary(client: LLMPort, result: ReviewResult) -> str | None:
         llm_insights_section = f"LLM insights:\n{findings}"
 
     prompt = REVIEW_SUMMARY.format(
-        policy_number=pair.prior.policy_number,
-        policy_type=pair.prior.policy_type.value,
+        policy_number=header.policy_number,
+        policy_type=header.policy_type.value,
         prior_premium=f"{prior_premium:.2f}",
         renewal_premium=f"{renewal_premium:.2f}",
         premium_change=premium_change,
@@ -145,16 +147,27 @@ def generate_summary(client: LLMPort, result: ReviewResult) -> str | None:
         return None
 
 
-def analyze_pair(client: LLMPort, diff: DiffResult, pair: RenewalPair) -> list[LLMInsight]:
-    insights: list[LLMInsight] = []
+def plan_analysis(
+    client: LLMPort, diff: DiffResult, pair: RenewalPair
+) -> list[Callable[[], list[LLMInsight]]]:
+    calls: list[Callable[[], list[LLMInsight]]] = []
 
     # notes analysis
     if pair.renewal.notes and pair.prior.notes != pair.renewal.notes:
-        insights.extend(_analyze_notes(client, pair.renewal.notes))
+        notes = pair.renewal.notes
+        calls.append(lambda: _analyze_notes(client, notes))
 
     # endorsement description changes
     for change in diff.changes:
         if change.field.startswith("endorsement_description_"):
-            insights.append(_analyze_endorsement(client, change.prior_value, change.renewal_value))
+            prior, renewal = change.prior_value, change.renewal_value
+            calls.append(lambda p=prior, r=renewal: [_analyze_endorsement(client, p, r)])
+
+    return calls
 
+
+def analyze_pair(client: LLMPort, diff: DiffResult, pair: RenewalPair) -> list[LLMInsight]:
+    insights: list[LLMInsight] = []
+    for call in plan_analysis(client, diff, pair):
+        insights.extend(call())
     return insights
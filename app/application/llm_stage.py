@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.application.llm_analysis import generate_summary, plan_analysis, should_analyze
+from app.application.stage_timer import StageTimer
+from app.domain.models.enums import Stage
+from app.domain.models.review import ReviewResult
+from app.domain.ports.llm import LLMPort
+from app.domain.services.aggregator import aggregate
+
+T = TypeVar("T")
+
+
+class _Limiter:
+    def __init__(self, max_in_flight: int):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        # LLMPort is synchronous — each in-flight call occupies one thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="llm-stage"
+        )
+
+    async def call(self, fn: Callable[[], T]) -> T:
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+async def _enrich_result(
+    result: ReviewResult, client: LLMPort, limiter: _Limiter, timer: StageTimer
+) -> None:
+    pair = result.pair
+    if pair is None or not result.flags:
+        return
+
+    # wall time per pair, including waits for a free in-flight slot
+    t = time.perf_counter()
+    if should_analyze(result.diff, pair):
+        batches = await asyncio.gather(
+            *(limiter.call(c) for c in plan_analysis(client, result.diff, pair))
+        )
+        insights = [i for batch in batches for i in batch]
+        aggregated = aggregate(result.policy_number, result.risk_level, result.diff, insights)
+        result.risk_level = aggregated.risk_level
+        result.llm_insights = insights
+        result.summary = aggregated.summary
+        t = timer.record(Stage.LLM_ANALYSIS, t)
+
+    # the summary prompt includes the insights, so it waits for the analysis calls
+    llm_summary = await limiter.call(lambda: generate_summary(client, result))
+    timer.record(Stage.LLM_SUMMARY, t)
+    if llm_summary:
+        result.summary = llm_summary
+        result.llm_summary_generated = True
+
+
+async def enrich_results(
+    results: list[ReviewResult],
+    client: LLMPort,
+    max_in_flight: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    timer: StageTimer | None = None,
+) -> None:
+    timer = timer if timer is not None else StageTimer()
+    if max_in_flight is None:
+        from app.config import settings
+
+        max_in_flight = settings.llm.max_in_flight
+
+    limiter = _Limiter(max(1, max_in_flight))
+    total = len(results)
+    done = 0
+
+    async def _one(result: ReviewResult) -> None:
+        nonlocal done
+        await _enrich_result(result, client, limiter, timer)
+        done += 1
+        if on_progress:
+            on_progress(done, total)
+
+    try:
+        await asyncio.gather(*(_one(r) for r in results))
+    finally:
+        limiter.shutdown()
+
+
+def run_llm_stage(
+    results: list[ReviewResult],
+    client: LLMPort,
+    max_in_flight: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    timer: StageTimer | None = None,
+) -> None:
+    asyncio.run(enrich_results(results, client, max_in_flight, on_progress, timer))
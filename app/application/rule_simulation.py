@@ -0,0 +1,110 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.application.batch import assign_risk_level
+from app.config import RuleThresholds
+from app.domain.models.diff import DiffFlag
+from app.domain.models.review import ReviewResult, RiskChange, RuleSimulation
+from app.domain.ports.storage import ReviewStore
+from app.domain.services.aggregator import RISK_ORDER
+from app.domain.services.book_rules import (
+    SCALAR_FLAGS,
+    BookFeatures,
+    extract_features,
+    vector_flags,
+)
+
+_RANK = {level: i for i, level in enumerate(RISK_ORDER)}
+_SCALAR_SET = frozenset(SCALAR_FLAGS)
+
+
+def _rank(flags: list[DiffFlag]) -> int:
+    return _RANK[assign_risk_level(flags)]
+
+
+# the risk level each pre-pass flag forces on its own, in SCALAR_FLAGS column order
+_SCALAR_RANKS = np.array([_rank([f]) for f in SCALAR_FLAGS], dtype=np.int8)
+
+
+@dataclass(frozen=True, slots=True)
+class RiskBaseline:
+    # the reviewed book reduced to what thresholds can move: pre-pass features, plus the
+    # rank set by every other flag (changes, notes, carrier), which no threshold touches
+    policy_numbers: list[str]
+    features: BookFeatures
+    base_rank: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.policy_numbers)
+
+
+def build_baseline(results: list[ReviewResult]) -> RiskBaseline:
+    reviewed = [r for r in results if r.header is not None]
+    base_rank = np.fromiter(
+        (_rank([f for f in r.flags if f not in _SCALAR_SET]) for r in reviewed),
+        dtype=np.int8,
+        count=len(reviewed),
+    )
+    return RiskBaseline(
+        policy_numbers=[r.policy_number for r in reviewed],
+        features=extract_features([r.pair for r in reviewed]),
+        base_rank=base_rank,
+    )
+
+
+_cached: tuple[int, int, RiskBaseline] | None = None
+
+
+def risk_baseline(store: ReviewStore) -> RiskBaseline:
+    global _cached
+    cached = _cached
+    if cached is None or cached[:2] != (id(store), store.generation):
+        cached = _cached = (id(store), store.generation, build_baseline(store.values()))
+    return cached[2]
+
+
+def simulate_ranks(baseline: RiskBaseline, thresholds: RuleThresholds) -> np.ndarray:
+    disabled = {DiffFlag(name) for name in thresholds.disabled_rules}
+    ranks = np.array(
+        [0 if f in disabled else r for f, r in zip(SCALAR_FLAGS, _SCALAR_RANKS, strict=True)],
+        dtype=np.int8,
+    )
+    scalar_rank = (vector_flags(baseline.features, thresholds) * ranks).max(axis=1, initial=0)
+    return np.maximum(baseline.base_rank, scalar_rank)
+
+
+def _distribution(ranks: np.ndarray) -> dict[str, int]:
+    counts = np.bincount(ranks, minlength=len(RISK_ORDER))
+    return {level.value: int(n) for level, n in zip(RISK_ORDER, counts, strict=True)}
+
+
+def simulate(
+    baseline: RiskBaseline,
+    current: RuleThresholds,
+    candidate: RuleThresholds,
+    limit: int | None = None,
+) -> RuleSimulation:
+    # both sides are re-derived from the same features, so only the thresholds differ —
+    # LLM escalations and results from older rule versions don't show up as changes
+    start = time.perf_counter()
+    before = simulate_ranks(baseline, current)
+    after = simulate_ranks(baseline, candidate)
+    moved = np.flatnonzero(before != after)
+    shown = moved if limit is None else moved[:limit]
+    return RuleSimulation(
+        total=len(baseline),
+        current=_distribution(before),
+        simulated=_distribution(after),
+        changed_total=len(moved),
+        changed=[
+            RiskChange(
+                policy_number=baseline.policy_numbers[i],
+                current=RISK_ORDER[before[i]],
+                simulated=RISK_ORDER[after[i]],
+            )
+            for i in shown.tolist()
+        ],
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 3),
+    )
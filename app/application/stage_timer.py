@@ -0,0 +1,45 @@
+import time
+from array import array
+
+import numpy as np
+
+from app.domain.models.enums import Stage
+from app.domain.models.review import StageTiming
+
+
+class StageTimer:
+    def __init__(self):
+        # compact float64 buffers — a 1M-pair run keeps ~8 MB per stage
+        self._samples: dict[Stage, array] = {}
+
+    def record(self, stage: Stage, start: float) -> float:
+        now = time.perf_counter()
+        self.add(stage, (now - start) * 1000)
+        return now
+
+    def add(self, stage: Stage, elapsed_ms: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = array("d")
+        samples.append(elapsed_ms)
+
+    def merge(self, other: "StageTimer") -> None:
+        for stage, samples in other._samples.items():
+            self._samples.setdefault(stage, array("d")).extend(samples)
+
+    def summary(self) -> dict[str, StageTiming]:
+        timings: dict[str, StageTiming] = {}
+        for stage in Stage:
+            samples = self._samples.get(stage)
+            if not samples:
+                continue
+            values = np.frombuffer(samples, dtype=np.float64)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            timings[stage.value] = StageTiming(
+                count=len(values),
+                total_ms=round(float(values.sum()), 3),
+                p50_ms=round(float(p50), 3),
+                p95_ms=round(float(p95), 3),
+                p99_ms=round(float(p99), 3),
+            )
+        return timings
@@ -42,6 +42,8 @@ class NotesKeywords(BaseModel):
         "reckless driving",
         "at-fault",
     ]
+    # match keywords only as whole words ("claim" no longer matches "disclaimer")
+    whole_words: bool = False
 
 
 class RuleThresholds(BaseModel):
@@ -49,6 +51,8 @@ class RuleThresholds(BaseModel):
     premium_critical_pct: float = 20.0
     youthful_operator_age: int = 25
     um_uim_min_limit: str = "50/100"
+    # DiffFlag values whose rules are switched off, e.g. ["notes_changed"]
+    disabled_rules: list[str] = []
 
 
 class QuoteConfig(BaseModel):
@@ -72,11 +76,20 @@ class PortfolioThresholds(BaseModel):
     portfolio_change_pct: float = 15.0
 
 
+class BatchConfig(BaseModel):
+    workers: int = 1
+    chunk_size: int = 500
+    publish_size: int = 200
+    write_chunk_size: int = 1000
+    max_concurrent_jobs: int = 1
+
+
 class LLMConfig(BaseModel):
     sonnet_model: str = "claude-sonnet-4-5-20250929"
     haiku_model: str = "claude-haiku-4-5-20251001"
     max_tokens: int = 1024
     comparison_sample_size: int = 100
+    max_in_flight: int = 8
     task_models: dict[str, str] = {
         "risk_signal_extractor": ModelKey.SONNET,
         "endorsement_comparison": ModelKey.HAIKU,
@@ -91,12 +104,18 @@ class Settings(BaseSettings):
     llm_enabled: bool = False
     data_path: str = "data/renewals.json"
     db_url: str = ""
+    db_fetch_size: int = 2000
+    book_cache_dir: str = ".cache/books"
+    lazy_pairs: bool = False
+    lazy_pair_cache_size: int = 1000
+    reload_check_seconds: float = 5.0
 
     rules: RuleThresholds = RuleThresholds()
     notes_keywords: NotesKeywords = NotesKeywords()
     quotes: QuoteConfig = QuoteConfig()
     portfolio: PortfolioThresholds = PortfolioThresholds()
     llm: LLMConfig = LLMConfig()
+    batch: BatchConfig = BatchConfig()
 
 
 settings = Settings()
@@ -1,5 +1,7 @@
+from collections.abc import Iterable
+
 from app.config import settings
-from app.domain.models.policy import RenewalPair
+from app.domain.models.policy import PairHandle, PairHeader, PairQuery, RenewalPair
 from app.domain.ports.data_source import DataSourcePort
 
 _data_source: DataSourcePort | None = None
@@ -23,6 +25,26 @@ def load_pairs(sample: int | None = None) -> list[RenewalPair]:
     return _get_data_source().load_pairs(sample)
 
 
+def load_entries() -> list[RenewalPair | PairHandle]:
+    return _get_data_source().load_entries()
+
+
+def query_pairs(query: PairQuery) -> list[RenewalPair]:
+    return _get_data_source().query_pairs(query)
+
+
+def get_pairs(policy_numbers: Iterable[str]) -> list[RenewalPair]:
+    return _get_data_source().get_pairs(policy_numbers)
+
+
+def get_account(account_id: str) -> list[RenewalPair]:
+    return _get_data_source().get_account(account_id)
+
+
+def headers() -> list[PairHeader]:
+    return _get_data_source().headers()
+
+
 def total_count() -> int:
     return _get_data_source().total_count()
 
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.domain.models.review import StageTiming
+
 
 class BatchRunRecord(BaseModel):
     job_id: str
@@ -12,6 +14,7 @@ class BatchRunRecord(BaseModel):
     urgent_review: int
     processing_time_ms: float
     created_at: datetime
+    stage_timings: dict[str, StageTiming] = {}
 
 
 class TrendPoint(BaseModel):
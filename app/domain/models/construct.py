@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+def restore_model[M: BaseModel](
+    cls: type[M], state: dict, fields_set: set[str], private: dict | None = None
+) -> M:
+    # skips validation and BaseModel.__setstate__ — for data that was already valid (pickled
+    # models, records built from validated snapshots); fields_set must be the model's own set
+    model = cls.__new__(cls)
+    object.__setattr__(model, "__dict__", state)
+    object.__setattr__(model, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", private)
+    return model
@@ -1,7 +1,12 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
 from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict
 
+from app.domain.models.construct import restore_model
+from app.domain.models.enums import RuleScope
+
 
 class DiffFlag(StrEnum):
     PREMIUM_INCREASE_HIGH = "premium_increase_high"
@@ -43,3 +48,64 @@ class DiffResult(BaseModel):
     policy_number: str
     changes: list[FieldChange] = []
     flags: list[DiffFlag] = []
+
+    @classmethod
+    def from_records(
+        cls, policy_number: str, records: Iterable["ChangeRecord"], flags: Iterable[DiffFlag] = ()
+    ) -> "DiffResult":
+        return _construct(
+            cls,
+            {
+                "policy_number": policy_number,
+                "changes": [r.to_field_change() for r in records],
+                "flags": list(flags),
+            },
+        )
+
+
+class RuleStats(BaseModel):
+    rule: DiffFlag
+    scope: RuleScope
+    enabled: bool
+    calls: int
+    hits: int
+    total_ms: float
+    mean_us: float
+
+
+@dataclass(slots=True)
+class ChangeRecord:
+    # the diff/flag pipeline's working form of a FieldChange; flags are set in place
+    field: str
+    prior_value: str
+    renewal_value: str
+    change_pct: float | None = None
+    flag: DiffFlag | None = None
+
+    @classmethod
+    def from_field_change(cls, c: FieldChange) -> "ChangeRecord":
+        return cls(c.field, c.prior_value, c.renewal_value, c.change_pct, c.flag)
+
+    def to_field_change(self) -> FieldChange:
+        return _construct(
+            FieldChange,
+            {
+                "field": self.field,
+                "prior_value": self.prior_value,
+                "renewal_value": self.renewal_value,
+                "change_pct": self.change_pct,
+                "flag": self.flag,
+            },
+        )
+
+
+_FIELD_NAMES = {
+    FieldChange: frozenset(FieldChange.model_fields),
+    DiffResult: frozenset(DiffResult.model_fields),
+}
+
+
+def _construct[M: BaseModel](cls: type[M], values: dict) -> M:
+    # records come from validated snapshots, so skip validation (model_construct is slower
+    # than validating); every field is given, and each model gets its own fields-set
+    return restore_model(cls, values, set(_FIELD_NAMES[cls]))
@@ -40,3 +40,26 @@ class FlagType(StrEnum):
     LOW_LIABILITY_EXPOSURE = "low_liability_exposure"
     PREMIUM_CONCENTRATION = "premium_concentration"
     HIGH_PORTFOLIO_INCREASE = "high_portfolio_increase"
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Stage(StrEnum):
+    PREPASS = "prepass"
+    DIFF = "diff"
+    NOTES = "notes"
+    FLAG = "flag"
+    LLM_ANALYSIS = "llm_analysis"
+    LLM_SUMMARY = "llm_summary"
+
+
+class RuleScope(StrEnum):
+    CHANGE = "change"
+    PAIR = "pair"
+    NOTES = "notes"
@@ -1,7 +1,17 @@
+from dataclasses import dataclass
 from datetime import date
 from enum import StrEnum
+from functools import lru_cache
+from typing import Annotated, Protocol
 
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    model_validator,
+)
 
 
 class PolicyType(StrEnum):
@@ -9,29 +19,50 @@ class PolicyType(StrEnum):
     HOME = "home"
 
 
+# normalization applied during validation — shared by parse_pair and the JSON fast path
+Text = Annotated[str, StringConstraints(strip_whitespace=True)]
+Code = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True)]
+SnapshotDate = Annotated[
+    date, BeforeValidator(lambda v: v.strip().replace("/", "-") if isinstance(v, str) else v)
+]
+LowerPolicyType = Annotated[
+    PolicyType, BeforeValidator(lambda v: v.lower() if isinstance(v, str) else v)
+]
+OptionalAmount = Annotated[float | None, BeforeValidator(lambda v: v or None)]
+
+
 class Endorsement(BaseModel):
-    code: str
-    description: str
+    code: Code
+    description: Text = ""
     premium: float = 0.0
 
 
 class Vehicle(BaseModel):
-    vin: str
+    vin: Code
     year: int
-    make: str
-    model: str
+    make: Text
+    model: Text
     usage: str = "personal"
 
 
 class Driver(BaseModel):
-    license_number: str
-    name: str
+    license_number: Code
+    name: Text
     age: int
     violations: int = 0
     sr22: bool = False
 
 
+@lru_cache(maxsize=1024)
+def split_limit(val: str) -> tuple[float, ...]:
+    # "100/300" -> (100.0, 300.0): per-person / per-occurrence, in the string's own units.
+    # books carry a handful of distinct limit strings, so each is parsed once per process
+    return tuple(float(p) for p in val.replace(",", "").split("/"))
+
+
 class AutoCoverages(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
     bodily_injury_limit: str = "100/300"
     property_damage_limit: str = "100"
     collision_deductible: float = 500.0
@@ -41,6 +72,19 @@ class AutoCoverages(BaseModel):
     rental_reimbursement: bool = False
     roadside_assistance: bool = False
 
+    # numeric views of the display strings; derived on read so copies and edits stay in sync
+    @property
+    def bodily_injury_limits(self) -> tuple[float, ...]:
+        return split_limit(self.bodily_injury_limit)
+
+    @property
+    def property_damage_limits(self) -> tuple[float, ...]:
+        return split_limit(self.property_damage_limit)
+
+    @property
+    def uninsured_motorist_limits(self) -> tuple[float, ...]:
+        return split_limit(self.uninsured_motorist)
+
 
 class HomeCoverages(BaseModel):
     coverage_a_dwelling: float = 300000.0
@@ -50,22 +94,22 @@ class HomeCoverages(BaseModel):
     coverage_e_liability: float = 100000.0
     coverage_f_medical: float = 5000.0
     deductible: float = 1000.0
-    wind_hail_deductible: float | None = None
+    wind_hail_deductible: OptionalAmount = None
     water_backup: bool = False
     replacement_cost: bool = True
 
 
 class PolicySnapshot(BaseModel):
-    policy_number: str
-    policy_type: PolicyType
-    carrier: str
-    effective_date: date
-    expiration_date: date
+    policy_number: Text
+    policy_type: LowerPolicyType
+    carrier: Text
+    effective_date: SnapshotDate
+    expiration_date: SnapshotDate
     premium: float
-    state: str = "CA"
-    notes: str = ""
-    insured_name: str = ""
-    account_id: str = ""
+    state: Code = "CA"
+    notes: Text = ""
+    insured_name: Text = ""
+    account_id: Text = ""
 
     auto_coverages: AutoCoverages | None = None
     home_coverages: HomeCoverages | None = None
@@ -73,7 +117,73 @@ class PolicySnapshot(BaseModel):
     drivers: list[Driver] = []
     endorsements: list[Endorsement] = []
 
+    @model_validator(mode="after")
+    def _drop_foreign_coverages(self) -> "PolicySnapshot":
+        # coverages only apply to their own line of business
+        if self.policy_type != PolicyType.AUTO:
+            self.auto_coverages = None
+        if self.policy_type != PolicyType.HOME:
+            self.home_coverages = None
+        return self
+
 
 class RenewalPair(BaseModel):
     prior: PolicySnapshot
     renewal: PolicySnapshot
+
+
+@dataclass(frozen=True, slots=True)
+class PairHeader:
+    # the few fields listings and filters need, without the coverage/vehicle/driver tree
+    policy_number: str
+    policy_type: PolicyType
+    state: str
+    account_id: str
+    insured_name: str
+    carrier_prior: str
+    carrier_renewal: str
+    premium_prior: float
+    premium_renewal: float
+    effective_date: date
+
+    @classmethod
+    def from_pair(cls, pair: RenewalPair) -> "PairHeader":
+        prior, renewal = pair.prior, pair.renewal
+        return cls(
+            policy_number=prior.policy_number,
+            policy_type=prior.policy_type,
+            state=prior.state,
+            account_id=prior.account_id,
+            insured_name=renewal.insured_name,
+            carrier_prior=prior.carrier,
+            carrier_renewal=renewal.carrier,
+            premium_prior=prior.premium,
+            premium_renewal=renewal.premium,
+            effective_date=renewal.effective_date,
+        )
+
+
+class PairHandle(Protocol):
+    # a book entry that rebuilds its pair on demand, like the lazy book's entries
+    header: PairHeader
+
+    def materialize(self) -> RenewalPair: ...
+
+
+def resolve_pair(entry: RenewalPair | PairHandle) -> RenewalPair:
+    return entry if isinstance(entry, RenewalPair) else entry.materialize()
+
+
+def entry_header(entry: RenewalPair | PairHandle) -> PairHeader:
+    return PairHeader.from_pair(entry) if isinstance(entry, RenewalPair) else entry.header
+
+
+class PairQuery(BaseModel):
+    sample: int | None = Field(None, ge=1)
+    seed: int | None = None
+    policy_type: LowerPolicyType | None = None
+    state: Code | None = None
+    carrier: Text | None = None
+    account_id: Text | None = None
+    effective_from: date | None = None
+    effective_to: date | None = None
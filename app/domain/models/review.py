@@ -1,11 +1,13 @@
 from datetime import datetime
 from enum import StrEnum
+from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, SerializerFunctionWrapHandler, model_serializer
 
-from app.domain.models.diff import DiffResult
+from app.domain.models.construct import restore_model
+from app.domain.models.diff import ChangeRecord, DiffFlag, DiffResult
 from app.domain.models.enums import AnalysisType
-from app.domain.models.policy import RenewalPair
+from app.domain.models.policy import PairHandle, PairHeader, RenewalPair
 from app.domain.models.quote import QuoteRecommendation
 
 
@@ -35,6 +37,138 @@ class ReviewResult(BaseModel):
     quote_generated: bool = False
     quotes: list[QuoteRecommendation] = []
     reviewed_at: datetime | None = None
+    pair_fingerprint: str = ""
+    rules_version: str = ""
+
+    # (records, flags) behind a result built by from_records; the pydantic diff is only built
+    # when something reads .diff — an API response, the LLM stage, a template
+    _pending: tuple[list[ChangeRecord], list[DiffFlag]] | None = PrivateAttr(None)
+    # the book entry behind a result from a lazy book; .pair is rebuilt from it on every read,
+    # so stored results don't pin materialized pairs
+    _pair_handle: PairHandle | None = PrivateAttr(None)
+
+    @classmethod
+    def from_records(
+        cls,
+        policy_number: str,
+        risk_level: RiskLevel,
+        records: list[ChangeRecord],
+        flags: list[DiffFlag],
+        **fields: Any,
+    ) -> "ReviewResult":
+        # same unvalidated construction as DiffResult.from_records; list defaults are fresh, and
+        # __dict__ keeps field order (the dump order) with "diff" left out until it is read
+        state = {"policy_number": policy_number, "risk_level": risk_level}
+        state.update(
+            (k, list(v) if isinstance(v, list) else v) for k, v in _REVIEW_DEFAULTS.items()
+        )
+        state.update(fields)
+        return restore_model(
+            cls,
+            state,
+            {"policy_number", "risk_level", "diff", *fields},
+            {"_pending": (records, flags), "_pair_handle": None},
+        )
+
+    def _place(self, name: str, value: Any) -> None:
+        # puts a field left out of __dict__ back, in field order (the dump order)
+        state = self.__dict__
+        object.__setattr__(
+            self,
+            "__dict__",
+            {k: value if k == name else state[k] for k in _FIELD_ORDER if k == name or k in state},
+        )
+
+    def _materialize(self) -> DiffResult:
+        private = self.__pydantic_private__
+        if private["_pending"] is not None:
+            diff = self.export_diff()
+            private["_pending"] = None
+            self._place("diff", diff)
+        return self.__dict__["diff"]
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached while "diff" or "pair" is missing from __dict__
+        if name == "diff":
+            return self._materialize()
+        if name == "pair":
+            return self.__pydantic_private__["_pair_handle"].materialize()
+        return super().__getattr__(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # an assigned diff or pair replaces the pending records or the handle, so neither is
+        # rebuilt over it later
+        private = self.__pydantic_private__
+        if name == "diff" and private["_pending"] is not None:
+            private["_pending"] = None
+            self._place("diff", None)
+        elif name == "pair" and private["_pair_handle"] is not None:
+            private["_pair_handle"] = None
+            self._place("pair", None)
+        super().__setattr__(name, value)
+
+    def attach_pair(self, entry: RenewalPair | PairHandle) -> None:
+        if isinstance(entry, RenewalPair):
+            self.pair = entry
+            return
+        self.__dict__.pop("pair", None)
+        self.__pydantic_private__["_pair_handle"] = entry
+        self.__pydantic_fields_set__.add("pair")
+
+    @property
+    def header(self) -> PairHeader | None:
+        # listing fields without materializing a detached pair
+        handle = self.__pydantic_private__["_pair_handle"]
+        if handle is not None:
+            return handle.header
+        pair = self.__dict__["pair"]
+        return None if pair is None else PairHeader.from_pair(pair)
+
+    @property
+    def flags(self) -> list[DiffFlag]:
+        # flags without building the diff
+        pending = self.__pydantic_private__["_pending"]
+        return pending[1] if pending is not None else self.__dict__["diff"].flags
+
+    def export_diff(self) -> DiffResult:
+        # the pydantic diff, without keeping it on the result (persistence writes every result)
+        pending = self.__pydantic_private__["_pending"]
+        if pending is None:
+            return self.__dict__["diff"]
+        return DiffResult.from_records(self.policy_number, *pending)
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler):
+        # pydantic-core reads fields from __dict__: build a pending diff first, and dump a
+        # detached pair through a copy so the result itself never keeps it
+        self._materialize()
+        if self.__pydantic_private__["_pair_handle"] is None:
+            return handler(self)
+        view = self.model_copy()
+        view.pair = self.pair
+        return handler(view)
+
+    def __eq__(self, other: object) -> bool:
+        # field by field, so pending diffs and detached pairs compare by value
+        if not isinstance(other, ReviewResult):
+            return NotImplemented
+        return type(self) is type(other) and all(
+            getattr(self, k) == getattr(other, k) for k in _FIELD_ORDER
+        )
+
+
+_FIELD_ORDER = tuple(ReviewResult.model_fields)
+_REVIEW_DEFAULTS = {
+    name: f.default for name, f in ReviewResult.model_fields.items() if not f.is_required()
+}
+
+
+class StageTiming(BaseModel):
+    count: int = 0
+    total_ms: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
 
 
 class BatchSummary(BaseModel):
@@ -44,4 +178,21 @@ class BatchSummary(BaseModel):
     action_required: int = 0
     urgent_review: int = 0
     llm_analyzed: int = 0
+    carried_forward: int = 0
     processing_time_ms: float = 0.0
+    stage_timings: dict[str, StageTiming] = {}
+
+
+class RiskChange(BaseModel):
+    policy_number: str
+    current: RiskLevel
+    simulated: RiskLevel
+
+
+class RuleSimulation(BaseModel):
+    total: int
+    current: dict[str, int]
+    simulated: dict[str, int]
+    changed_total: int
+    changed: list[RiskChange]
+    elapsed_ms: float
@@ -1,9 +1,15 @@
+from collections.abc import Iterable
 from typing import Protocol
 
-from app.domain.models.policy import RenewalPair
+from app.domain.models.policy import PairHandle, PairHeader, PairQuery, RenewalPair
 
 
 class DataSourcePort(Protocol):
     def load_pairs(self, sample: int | None = None) -> list[RenewalPair]: ...
+    def load_entries(self) -> list[RenewalPair | PairHandle]: ...
+    def query_pairs(self, query: PairQuery) -> list[RenewalPair]: ...
+    def get_pairs(self, policy_numbers: Iterable[str]) -> list[RenewalPair]: ...
+    def get_account(self, account_id: str) -> list[RenewalPair]: ...
+    def headers(self) -> list[PairHeader]: ...
     def total_count(self) -> int: ...
     def invalidate_cache(self) -> None: ...
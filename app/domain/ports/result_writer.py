@@ -7,6 +7,8 @@ from app.domain.models.review import ReviewResult
 class ResultWriter(Protocol):
     def save_rule_result(self, job_id: str, result: ReviewResult) -> None: ...
     def save_llm_result(self, job_id: str, result: ReviewResult) -> None: ...
+    def save_rule_results(self, job_id: str, results: list[ReviewResult]) -> None: ...
+    def save_llm_results(self, job_id: str, results: list[ReviewResult]) -> None: ...
     def update_broker_contacted(self, policy_number: str, value: bool) -> None: ...
     def update_quote_generated(self, policy_number: str, value: bool) -> None: ...
     def update_quotes(self, policy_number: str, quotes: list[dict]) -> None: ...
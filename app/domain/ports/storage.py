@@ -5,9 +5,12 @@ from app.domain.models.review import BatchSummary, ReviewResult
 
 
 class ReviewStore(Protocol):
+    generation: int
+
     def get(self, policy_number: str) -> ReviewResult | None: ...
     def set(self, policy_number: str, result: ReviewResult) -> None: ...
     def clear(self) -> None: ...
+    def replace(self, results: dict[str, ReviewResult]) -> None: ...
     def values(self) -> list[ReviewResult]: ...
 
 
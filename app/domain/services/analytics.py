@@ -62,7 +62,7 @@ def compute_broker_metrics(results: list[ReviewResult], total_policies: int = 0)
     reviewed_count = sum(1 for r in results if r.reviewed_at is not None)
     total = max(total_policies, reviewed_count)
     pending = total - reviewed_count
-    contact_needed = sum(1 for r in results if r.diff.flags and not r.broker_contacted)
+    contact_needed = sum(1 for r in results if r.flags and not r.broker_contacted)
     contacted = sum(1 for r in results if r.broker_contacted)
     quotes_generated = sum(1 for r in results if r.quote_generated)
     reviewed = sum(1 for r in results if r.reviewed_at is not None)
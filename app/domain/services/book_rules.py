@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.config import RuleThresholds
+from app.domain.models.diff import DiffFlag
+from app.domain.models.policy import PolicyType, RenewalPair, split_limit
+
+# flags that depend only on per-pair scalars — evaluated for a whole book at once
+SCALAR_FLAGS = (
+    DiffFlag.PREMIUM_INCREASE_CRITICAL,
+    DiffFlag.PREMIUM_INCREASE_HIGH,
+    DiffFlag.PREMIUM_DECREASE,
+    DiffFlag.DRIVER_VIOLATIONS,
+    DiffFlag.SR22_FILING,
+    DiffFlag.YOUTHFUL_OPERATOR,
+    DiffFlag.COVERAGE_GAP,
+)
+_BIT_WEIGHTS = 1 << np.arange(len(SCALAR_FLAGS), dtype=np.int64)
+_FLAGS_BY_CODE = [
+    [f for bit, f in enumerate(SCALAR_FLAGS) if code >> bit & 1]
+    for code in range(1 << len(SCALAR_FLAGS))
+]
+
+
+@dataclass(frozen=True, slots=True)
+class BookFeatures:
+    prior_premium: np.ndarray
+    renewal_premium: np.ndarray
+    max_violations: np.ndarray
+    any_sr22: np.ndarray
+    min_driver_age: np.ndarray
+    um_limit: np.ndarray  # NaN where no UM/UIM gap check applies
+
+    def __len__(self) -> int:
+        return len(self.prior_premium)
+
+
+def extract_features(pairs: list[RenewalPair]) -> BookFeatures:
+    # one gather pass over the models — re-walking them once per column costs more in cache
+    # misses than it saves — then the columns and per-policy driver aggregates are built in numpy
+    n = len(pairs)
+    premiums: list[tuple[float, float, float]] = []
+    driver_counts: list[int] = []
+    driver_rows: list[tuple[int, bool, int]] = []
+    for pair in pairs:
+        renewal = pair.renewal
+        coverages = renewal.auto_coverages
+        um = np.nan
+        if renewal.policy_type == PolicyType.AUTO and coverages is not None:
+            um = sum(coverages.uninsured_motorist_limits)
+        premiums.append((pair.prior.premium, renewal.premium, um))
+        driver_counts.append(len(renewal.drivers))
+        driver_rows.extend((d.violations, d.sr22, d.age) for d in renewal.drivers)
+
+    columns = np.array(premiums, dtype=np.float64).reshape(n, 3)
+    drivers = np.array(driver_rows, dtype=np.int64).reshape(len(driver_rows), 3)
+    counts = np.array(driver_counts, dtype=np.int64)
+    has_drivers = counts > 0
+    # each policy's drivers are a contiguous segment of the flat driver table
+    starts = (np.cumsum(counts) - counts)[has_drivers]
+
+    max_violations = np.zeros(n, dtype=np.int64)
+    any_sr22 = np.zeros(n, dtype=bool)
+    min_driver_age = np.full(n, np.inf, dtype=np.float64)
+    if len(drivers):
+        max_violations[has_drivers] = np.maximum.reduceat(drivers[:, 0], starts)
+        any_sr22[has_drivers] = np.maximum.reduceat(drivers[:, 1], starts) > 0
+        min_driver_age[has_drivers] = np.minimum.reduceat(drivers[:, 2], starts)
+
+    return BookFeatures(
+        prior_premium=columns[:, 0].copy(),
+        renewal_premium=columns[:, 1].copy(),
+        max_violations=max_violations,
+        any_sr22=any_sr22,
+        min_driver_age=min_driver_age,
+        um_limit=columns[:, 2].copy(),
+    )
+
+
+def premium_change_pct(features: BookFeatures) -> np.ndarray:
+    prior, renewal = features.prior_premium, features.renewal_premium
+    # same operation order as rules._flag_premium so boundary cases agree bit-for-bit
+    pct = np.full(len(features), np.nan, dtype=np.float64)
+    np.divide(renewal - prior, prior, out=pct, where=prior != 0)
+    return pct * 100
+
+
+def vector_flags(features: BookFeatures, thresholds: RuleThresholds) -> np.ndarray:
+    pct = premium_change_pct(features)
+    critical = pct >= thresholds.premium_critical_pct
+    high = (pct >= thresholds.premium_high_pct) & ~critical
+    min_limit = sum(split_limit(thresholds.um_uim_min_limit))
+
+    return np.column_stack(
+        [
+            critical,
+            high,
+            pct < 0,
+            features.max_violations > 0,
+            features.any_sr22,
+            features.min_driver_age < thresholds.youthful_operator_age,
+            features.um_limit < min_limit,
+        ]
+    )
+
+
+def scalar_flags(
+    pairs: list[RenewalPair], thresholds: RuleThresholds | None = None
+) -> list[list[DiffFlag]]:
+    if thresholds is None:
+        from app.config import settings
+
+        thresholds = settings.rules
+
+    if not pairs:
+        return []
+    codes = vector_flags(extract_features(pairs), thresholds) @ _BIT_WEIGHTS
+    return [list(_FLAGS_BY_CODE[c]) for c in codes.tolist()]
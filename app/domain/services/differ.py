@@ -1,7 +1,9 @@
+import sys
 from collections.abc import Callable, Sequence
-from typing import TypeVar
 
-from app.domain.models.diff import DiffResult, FieldChange
+from pydantic import BaseModel
+
+from app.domain.models.diff import ChangeRecord, DiffResult
 from app.domain.models.policy import (
     AutoCoverages,
     HomeCoverages,
@@ -9,8 +11,6 @@ from app.domain.models.policy import (
     RenewalPair,
 )
 
-T = TypeVar("T")
-
 
 def _pct_change(prior: float, renewal: float) -> float | None:
     if prior == 0:
@@ -18,53 +18,68 @@ def _pct_change(prior: float, renewal: float) -> float | None:
     return round((renewal - prior) / prior * 100, 2)
 
 
-def _str_change(field: str, prior: str, renewal: str) -> FieldChange | None:
+def _str_change(field: str, prior: str, renewal: str) -> ChangeRecord | None:
     if prior == renewal:
         return None
-    return FieldChange(field=field, prior_value=prior, renewal_value=renewal)
+    return ChangeRecord(field, prior, renewal)
 
 
-def _num_change(field: str, prior: float, renewal: float) -> FieldChange | None:
+def _num_change(field: str, prior: float, renewal: float) -> ChangeRecord | None:
     if prior == renewal:
         return None
-    return FieldChange(
-        field=field,
-        prior_value=str(prior),
-        renewal_value=str(renewal),
-        change_pct=_pct_change(prior, renewal),
-    )
+    return ChangeRecord(field, str(prior), str(renewal), _pct_change(prior, renewal))
 
 
-def _bool_change(field: str, prior: bool, renewal: bool) -> FieldChange | None:
+def _bool_change(field: str, prior: bool, renewal: bool) -> ChangeRecord | None:
     if prior == renewal:
         return None
-    return FieldChange(field=field, prior_value=str(prior), renewal_value=str(renewal))
+    return ChangeRecord(field, str(prior), str(renewal))
+
 
+def _attr_change(field: str, prior: object, renewal: object) -> ChangeRecord | None:
+    if isinstance(prior, bool) or isinstance(renewal, bool):
+        return _bool_change(field, prior, renewal)
+    if isinstance(prior, int | float) and isinstance(renewal, int | float):
+        return _num_change(field, prior, renewal)
+    return _str_change(field, str(prior), str(renewal))
 
-def _diff_entities(
+
+def _diff_entities[T: BaseModel](
     prior_items: Sequence[T],
     renewal_items: Sequence[T],
     key_fn: Callable[[T], str],
     label_fn: Callable[[T], str],
-    added_field: str,
-    removed_field: str,
-) -> list[FieldChange]:
-    prior_keys = {key_fn(x) for x in prior_items}
-    renewal_keys = {key_fn(x) for x in renewal_items}
-    changes: list[FieldChange] = []
-    for k in renewal_keys - prior_keys:
-        item = next(x for x in renewal_items if key_fn(x) == k)
-        label = label_fn(item)
-        changes.append(FieldChange(field=added_field, prior_value="", renewal_value=label))
-    for k in prior_keys - renewal_keys:
-        item = next(x for x in prior_items if key_fn(x) == k)
-        label = label_fn(item)
-        changes.append(FieldChange(field=removed_field, prior_value=label, renewal_value=""))
-    return changes
+    entity: str,
+) -> list[ChangeRecord]:
+    # both sides indexed once; shared keys are compared attribute by attribute
+    prior_by_key = {key_fn(x): x for x in prior_items}
+    renewal_by_key = {key_fn(x): x for x in renewal_items}
+    added_field = sys.intern(f"{entity}_added")
+    removed_field = sys.intern(f"{entity}_removed")
+
+    added: list[ChangeRecord] = []
+    modified: list[ChangeRecord] = []
+    for k, item in renewal_by_key.items():
+        before = prior_by_key.get(k)
+        if before is None:
+            added.append(ChangeRecord(added_field, "", label_fn(item)))
+        elif before != item:
+            for attr in type(item).model_fields:
+                if c := _attr_change(
+                    f"{entity}_{attr}_{k}", getattr(before, attr), getattr(item, attr)
+                ):
+                    modified.append(c)
+
+    removed = [
+        ChangeRecord(removed_field, label_fn(item), "")
+        for k, item in prior_by_key.items()
+        if k not in renewal_by_key
+    ]
+    return added + removed + modified
 
 
-def diff_universal_fields(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[FieldChange]:
-    changes: list[FieldChange] = []
+def diff_universal_fields(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[ChangeRecord]:
+    changes: list[ChangeRecord] = []
 
     if c := _num_change("premium", prior.premium, renewal.premium):
         changes.append(c)
@@ -78,11 +93,11 @@ def diff_universal_fields(prior: PolicySnapshot, renewal: PolicySnapshot) -> lis
 
 def diff_auto_coverages(
     prior: AutoCoverages | None, renewal: AutoCoverages | None
-) -> list[FieldChange]:
+) -> list[ChangeRecord]:
     if prior is None or renewal is None:
         return []
 
-    changes: list[FieldChange] = []
+    changes: list[ChangeRecord] = []
     field_pairs = [
         ("bodily_injury_limit", prior.bodily_injury_limit, renewal.bodily_injury_limit),
         ("property_damage_limit", prior.property_damage_limit, renewal.property_damage_limit),
@@ -117,11 +132,11 @@ def diff_auto_coverages(
 
 def diff_home_coverages(
     prior: HomeCoverages | None, renewal: HomeCoverages | None
-) -> list[FieldChange]:
+) -> list[ChangeRecord]:
     if prior is None or renewal is None:
         return []
 
-    changes: list[FieldChange] = []
+    changes: list[ChangeRecord] = []
     num_fields = [
         ("coverage_a_dwelling", prior.coverage_a_dwelling, renewal.coverage_a_dwelling),
         (
@@ -158,83 +173,56 @@ def diff_home_coverages(
     return changes
 
 
-def diff_vehicles(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[FieldChange]:
+def diff_vehicles(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[ChangeRecord]:
     return _diff_entities(
         prior.vehicles,
         renewal.vehicles,
         key_fn=lambda v: v.vin,
         label_fn=lambda v: f"{v.year} {v.make} {v.model} ({v.vin})",
-        added_field="vehicle_added",
-        removed_field="vehicle_removed",
+        entity="vehicle",
     )
 
 
-def diff_drivers(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[FieldChange]:
+def diff_drivers(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[ChangeRecord]:
     return _diff_entities(
         prior.drivers,
         renewal.drivers,
         key_fn=lambda d: d.license_number,
         label_fn=lambda d: f"{d.name} ({d.license_number})",
-        added_field="driver_added",
-        removed_field="driver_removed",
+        entity="driver",
     )
 
 
-def diff_endorsements(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[FieldChange]:
-    prior_codes = {e.code for e in prior.endorsements}
-    renewal_codes = {e.code for e in renewal.endorsements}
-
-    changes: list[FieldChange] = []
-    for code in renewal_codes - prior_codes:
-        e = next(x for x in renewal.endorsements if x.code == code)
-        changes.append(
-            FieldChange(
-                field="endorsement_added", prior_value="", renewal_value=f"{code}: {e.description}"
-            )
-        )
-    for code in prior_codes - renewal_codes:
-        e = next(x for x in prior.endorsements if x.code == code)
-        changes.append(
-            FieldChange(
-                field="endorsement_removed",
-                prior_value=f"{code}: {e.description}",
-                renewal_value="",
-            )
-        )
-
-    for code in prior_codes & renewal_codes:
-        pe = next(x for x in prior.endorsements if x.code == code)
-        re = next(x for x in renewal.endorsements if x.code == code)
-        if pe.description != re.description:
-            changes.append(
-                FieldChange(
-                    field=f"endorsement_description_{code}",
-                    prior_value=pe.description,
-                    renewal_value=re.description,
-                )
-            )
-        if pe.premium != re.premium:
-            changes.append(
-                FieldChange(
-                    field=f"endorsement_premium_{code}",
-                    prior_value=str(pe.premium),
-                    renewal_value=str(re.premium),
-                    change_pct=_pct_change(pe.premium, re.premium),
-                )
-            )
-
-    return changes
+def diff_endorsements(prior: PolicySnapshot, renewal: PolicySnapshot) -> list[ChangeRecord]:
+    return _diff_entities(
+        prior.endorsements,
+        renewal.endorsements,
+        key_fn=lambda e: e.code,
+        label_fn=lambda e: f"{e.code}: {e.description}",
+        entity="endorsement",
+    )
 
 
-def compute_diff(pair: RenewalPair) -> DiffResult:
+def diff_changes(pair: RenewalPair) -> list[ChangeRecord]:
     prior, renewal = pair.prior, pair.renewal
-    all_changes: list[FieldChange] = []
+    all_changes: list[ChangeRecord] = []
 
+    # an equal section can't produce changes; == compares the live values, so edits after
+    # parsing are never missed
     all_changes.extend(diff_universal_fields(prior, renewal))
-    all_changes.extend(diff_auto_coverages(prior.auto_coverages, renewal.auto_coverages))
-    all_changes.extend(diff_home_coverages(prior.home_coverages, renewal.home_coverages))
-    all_changes.extend(diff_vehicles(prior, renewal))
-    all_changes.extend(diff_drivers(prior, renewal))
-    all_changes.extend(diff_endorsements(prior, renewal))
+    if prior.auto_coverages != renewal.auto_coverages:
+        all_changes.extend(diff_auto_coverages(prior.auto_coverages, renewal.auto_coverages))
+    if prior.home_coverages != renewal.home_coverages:
+        all_changes.extend(diff_home_coverages(prior.home_coverages, renewal.home_coverages))
+    if prior.vehicles != renewal.vehicles:
+        all_changes.extend(diff_vehicles(prior, renewal))
+    if prior.drivers != renewal.drivers:
+        all_changes.extend(diff_drivers(prior, renewal))
+    if prior.endorsements != renewal.endorsements:
+        all_changes.extend(diff_endorsements(prior, renewal))
 
-    return DiffResult(policy_number=prior.policy_number, changes=all_changes)
+    return all_changes
+
+
+def compute_diff(pair: RenewalPair) -> DiffResult:
+    return DiffResult.from_records(pair.prior.policy_number, diff_changes(pair))
@@ -0,0 +1,31 @@
+import hashlib
+
+from app.config import NotesKeywords, RuleThresholds
+from app.domain.models.policy import RenewalPair
+
+# bump whenever diff/flag/risk logic changes in a way that alters results
+RULES_LOGIC_VERSION = 2
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def pair_fingerprint(pair: RenewalPair) -> str:
+    return _digest(pair.model_dump_json().encode())
+
+
+def rules_version(
+    thresholds: RuleThresholds | None = None,
+    keywords: NotesKeywords | None = None,
+) -> str:
+    if thresholds is None or keywords is None:
+        from app.config import settings
+
+        thresholds = thresholds or settings.rules
+        keywords = keywords or settings.notes_keywords
+
+    payload = "|".join(
+        [str(RULES_LOGIC_VERSION), thresholds.model_dump_json(), keywords.model_dump_json()]
+    )
+    return _digest(payload.encode())
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import operator
+from collections import deque
+from collections.abc import Iterable
+from functools import reduce
 from typing import TYPE_CHECKING
 
 from app.domain.models.diff import DiffFlag
@@ -13,28 +17,135 @@ _CATEGORY_MAP = {
     "regulatory": DiffFlag.REGULATORY,
     "driver_risk": DiffFlag.DRIVER_RISK_NOTE,
 }
+_CATEGORY_FLAGS = list(_CATEGORY_MAP.values())
+# flags for every combination of category bits, in _CATEGORY_MAP order
+_FLAGS_BY_MASK = [
+    [f for bit, f in enumerate(_CATEGORY_FLAGS) if mask >> bit & 1]
+    for mask in range(1 << len(_CATEGORY_FLAGS))
+]
 
 
-def flag_notes_keywords(
-    notes: str,
-    keywords_config: NotesKeywords | None = None,
-) -> list[DiffFlag]:
-    if not notes:
-        return []
+def _union(masks: Iterable[int]) -> int:
+    return reduce(operator.or_, masks, 0)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    # Aho-Corasick over the lowercased keywords, with failure links folded into a full
+    # transition table so a scan is one dict lookup per character however many keywords there are
+    __slots__ = ("_delta", "_masks", "_matches", "_whole_words", "_full")
+
+    def __init__(self, keywords: Iterable[tuple[str, int]], whole_words: bool = False):
+        goto: list[dict[str, int]] = [{}]
+        matches: list[list[tuple[int, int]]] = [[]]  # (keyword length, category mask) per state
+        for keyword, mask in keywords:
+            # a blank keyword would match every note, so it is dropped rather than compiled
+            if not keyword.strip():
+                continue
+            keyword = keyword.lower()
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    matches.append([])
+                state = nxt
+            matches[state].append((len(keyword), mask))
+
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [{}] * len(goto)
+        delta[0] = goto[0]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # the fail state is shallower, so its table is already complete
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            matches[state].extend(matches[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._matches = matches
+        self._masks = [_union(m for _, m in found) for found in matches]
+        self._whole_words = whole_words
+        self._full = _union(self._masks)
+
+    def scan(self, text: str) -> int:
+        # bitmask of the categories with at least one keyword in text
+        delta, masks, full = self._delta, self._masks, self._full
+        text = text.lower()
+        found = state = 0
+        if not self._whole_words:
+            for ch in text:
+                state = delta[state].get(ch, 0)
+                if masks[state]:
+                    found |= masks[state]
+                    if found == full:
+                        break
+            return found
 
+        end = len(text)
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not masks[state] or (i + 1 < end and _is_word_char(text[i + 1])):
+                continue
+            for length, mask in self._matches[state]:
+                start = i - length + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    found |= mask
+        return found
+
+
+_cached: tuple[NotesKeywords, KeywordAutomaton] | None = None
+
+
+def keyword_automaton(keywords_config: NotesKeywords | None = None) -> KeywordAutomaton:
+    global _cached
     if keywords_config is None:
         from app.config import settings
 
         keywords_config = settings.notes_keywords
 
-    notes_lower = notes.lower()
-    flags: list[DiffFlag] = []
+    # compiled once per config object; a replaced config (settings reload, tests) recompiles
+    cached = _cached
+    if cached is None or cached[0] is not keywords_config:
+        automaton = KeywordAutomaton(
+            (
+                (keyword, 1 << bit)
+                for bit, category in enumerate(_CATEGORY_MAP)
+                for keyword in getattr(keywords_config, category, [])
+            ),
+            whole_words=keywords_config.whole_words,
+        )
+        cached = _cached = (keywords_config, automaton)
+    return cached[1]
 
-    for category, diff_flag in _CATEGORY_MAP.items():
-        keyword_list = getattr(keywords_config, category, [])
-        for keyword in keyword_list:
-            if keyword.lower() in notes_lower:
-                flags.append(diff_flag)
-                break
 
-    return flags
+def flag_notes_keywords(
+    notes: str,
+    keywords_config: NotesKeywords | None = None,
+) -> list[DiffFlag]:
+    if not notes:
+        return []
+    return list(_FLAGS_BY_MASK[keyword_automaton(keywords_config).scan(notes)])
+
+
+def flag_notes_batch(
+    notes: Iterable[str],
+    keywords_config: NotesKeywords | None = None,
+) -> list[list[DiffFlag]]:
+    automaton = keyword_automaton(keywords_config)
+    # notes are mostly carrier boilerplate, so each distinct text is scanned once
+    masks: dict[str, int] = {"": 0}
+    result: list[list[DiffFlag]] = []
+    for text in notes:
+        mask = masks.get(text)
+        if mask is None:
+            mask = masks[text] = automaton.scan(text)
+        result.append(list(_FLAGS_BY_MASK[mask]))
+    return result
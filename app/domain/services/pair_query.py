@@ -0,0 +1,39 @@
+import random
+from collections.abc import Iterable
+
+from app.domain.models.policy import PairHeader, PairQuery, RenewalPair
+
+
+def has_filters(query: PairQuery) -> bool:
+    return bool(query.model_dump(exclude={"sample", "seed"}, exclude_none=True))
+
+
+def header_matches(header: PairHeader, query: PairQuery) -> bool:
+    if query.policy_type is not None and header.policy_type != query.policy_type:
+        return False
+    if query.state is not None and header.state != query.state:
+        return False
+    if query.account_id is not None and header.account_id != query.account_id:
+        return False
+    carriers = (header.carrier_prior, header.carrier_renewal)
+    if query.carrier is not None and query.carrier not in carriers:
+        return False
+    if query.effective_from is not None and header.effective_date < query.effective_from:
+        return False
+    return query.effective_to is None or header.effective_date <= query.effective_to
+
+
+def matches(pair: RenewalPair, query: PairQuery) -> bool:
+    return header_matches(PairHeader.from_pair(pair), query)
+
+
+def draw_sample[T](items: list[T], query: PairQuery) -> list[T]:
+    # sources sample from the same id-ordered candidates, so a seed picks the same
+    # policies whether the book is cached, streamed or filtered in SQL
+    if query.sample is None or query.sample >= len(items):
+        return items
+    return random.Random(query.seed).sample(items, query.sample)
+
+
+def apply_query(pairs: Iterable[RenewalPair], query: PairQuery) -> list[RenewalPair]:
+    return draw_sample([p for p in pairs if matches(p, query)], query)
@@ -1,5 +1,7 @@
 from typing import Any
 
+from pydantic import TypeAdapter
+
 from app.domain.models.policy import (
     AutoCoverages,
     Driver,
@@ -113,3 +115,15 @@ def parse_pair(raw: dict[str, Any]) -> RenewalPair:
         prior=parse_snapshot(raw["prior"]),
         renewal=parse_snapshot(raw["renewal"]),
     )
+
+
+# fast path: pydantic-core validates raw JSON straight into models, no intermediate dicts
+_PAIRS_ADAPTER = TypeAdapter(list[RenewalPair])
+
+
+def parse_pair_json(data: str | bytes) -> RenewalPair:
+    return RenewalPair.model_validate_json(data)
+
+
+def parse_pairs_json(data: str | bytes) -> list[RenewalPair]:
+    return _PAIRS_ADAPTER.validate_json(data)
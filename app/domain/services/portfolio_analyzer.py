@@ -8,17 +8,15 @@ from app.domain.models.review import ReviewResult, RiskLevel
 def _build_bundle_analysis(
     results: list[ReviewResult],
 ) -> BundleAnalysis:
-    auto_results = [r for r in results if r.pair and r.pair.renewal.policy_type == PolicyType.AUTO]
-    home_results = [r for r in results if r.pair and r.pair.renewal.policy_type == PolicyType.HOME]
+    headers = [h for r in results if (h := r.header) is not None]
+    auto_results = [h for h in headers if h.policy_type == PolicyType.AUTO]
+    home_results = [h for h in headers if h.policy_type == PolicyType.HOME]
 
     has_auto = len(auto_results) > 0
     has_home = len(home_results) > 0
     is_bundle = has_auto and has_home
 
-    carriers: set[str] = set()
-    for r in results:
-        if r.pair:
-            carriers.add(r.pair.renewal.carrier)
+    carriers = {h.carrier_renewal for h in headers}
     carrier_mismatch = len(carriers) > 1
     bundle_discount_eligible = is_bundle and not carrier_mismatch
 
@@ -49,9 +47,10 @@ def _detect_duplicate_coverage(results: list[ReviewResult]) -> list[CrossPolicyF
     home_with_roadside: list[str] = []
 
     for r in results:
-        if not r.pair:
+        pair = r.pair
+        if pair is None:
             continue
-        snap = r.pair.renewal
+        snap = pair.renewal
         if snap.policy_type == PolicyType.AUTO and snap.auto_coverages:
             if snap.auto_coverages.medical_payments > 0:
                 auto_with_medical.append(r.policy_number)
@@ -103,15 +102,15 @@ def _calculate_exposure_flags(
     affected: list[str] = []
 
     for r in results:
-        if not r.pair:
+        pair = r.pair
+        if pair is None:
             continue
-        snap = r.pair.renewal
+        snap = pair.renewal
         if snap.policy_type == PolicyType.HOME and snap.home_coverages:
             total_liability += snap.home_coverages.coverage_e_liability
             affected.append(r.policy_number)
         elif snap.policy_type == PolicyType.AUTO and snap.auto_coverages:
-            bi_str = snap.auto_coverages.bodily_injury_limit.split("/")[0]
-            total_liability += float(bi_str) * 1000
+            total_liability += snap.auto_coverages.bodily_injury_limits[0] * 1000
             affected.append(r.policy_number)
 
     if not affected:
@@ -155,9 +154,10 @@ def _detect_premium_concentration(
 
     if total_premium > 0:
         for r in results:
-            if not r.pair:
+            header = r.header
+            if header is None:
                 continue
-            pct = r.pair.renewal.premium / total_premium
+            pct = header.premium_renewal / total_premium
             if pct >= cfg.concentration_pct:
                 flags.append(
                     CrossPolicyFlag(
@@ -206,8 +206,9 @@ def analyze_portfolio(
             raise ValueError(f"No review found for policy: {pn}")
         results.append(result)
 
-    total_premium = sum(r.pair.renewal.premium for r in results if r.pair)
-    total_prior_premium = sum(r.pair.prior.premium for r in results if r.pair)
+    headers = [h for r in results if (h := r.header) is not None]
+    total_premium = sum(h.premium_renewal for h in headers)
+    total_prior_premium = sum(h.premium_prior for h in headers)
     premium_change_pct = (
         ((total_premium - total_prior_premium) / total_prior_premium * 100)
         if total_prior_premium > 0
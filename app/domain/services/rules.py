@@ -1,6 +1,12 @@
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
 from app.config import RuleThresholds
-from app.domain.models.diff import DiffFlag, DiffResult, FieldChange
-from app.domain.models.policy import PolicyType, RenewalPair
+from app.domain.models.diff import ChangeRecord, DiffFlag, DiffResult, RuleStats
+from app.domain.models.enums import RuleScope
+from app.domain.models.policy import PolicyType, RenewalPair, split_limit
 
 LIABILITY_FIELDS = {
     "bodily_injury_limit",
@@ -25,163 +31,296 @@ COVERAGE_DROP_FIELDS = {
     "medical_payments",
 }
 
+TOGGLE_DROP_FIELDS = {"water_backup", "replacement_cost", "rental_reimbursement"}
+TOGGLE_ADD_FIELDS = TOGGLE_DROP_FIELDS | {"roadside_assistance"}
+
+ENTITY_FLAGS = {
+    "vehicle_added": DiffFlag.VEHICLE_ADDED,
+    "vehicle_removed": DiffFlag.VEHICLE_REMOVED,
+    "driver_added": DiffFlag.DRIVER_ADDED,
+    "driver_removed": DiffFlag.DRIVER_REMOVED,
+    "endorsement_added": DiffFlag.ENDORSEMENT_ADDED,
+    "endorsement_removed": DiffFlag.ENDORSEMENT_REMOVED,
+}
 
-def _parse_limit(val: str) -> float:
-    parts = val.replace(",", "").split("/")
-    return sum(float(p) for p in parts)
+NOTES_FLAGS = (
+    DiffFlag.CLAIMS_HISTORY,
+    DiffFlag.PROPERTY_RISK,
+    DiffFlag.REGULATORY,
+    DiffFlag.DRIVER_RISK_NOTE,
+)
+
+PREMIUM_FLAGS = {
+    DiffFlag.PREMIUM_INCREASE_HIGH,
+    DiffFlag.PREMIUM_INCREASE_CRITICAL,
+    DiffFlag.PREMIUM_DECREASE,
+}
 
 
-def _flag_premium(pair: RenewalPair, thresholds: RuleThresholds) -> list[DiffFlag]:
+def _premium_pct(pair: RenewalPair) -> float | None:
     prior_p, renewal_p = pair.prior.premium, pair.renewal.premium
     if prior_p == 0:
-        return []
-    pct = (renewal_p - prior_p) / prior_p * 100
-    flags: list[DiffFlag] = []
-    if pct >= thresholds.premium_critical_pct:
-        flags.append(DiffFlag.PREMIUM_INCREASE_CRITICAL)
-    elif pct >= thresholds.premium_high_pct:
-        flags.append(DiffFlag.PREMIUM_INCREASE_HIGH)
-    if pct < 0:
-        flags.append(DiffFlag.PREMIUM_DECREASE)
-    return flags
-
-
-def _flag_carrier(pair: RenewalPair) -> list[DiffFlag]:
-    if pair.prior.carrier != pair.renewal.carrier:
-        return [DiffFlag.CARRIER_CHANGE]
-    return []
-
-
-def _detect_flag(c: FieldChange) -> DiffFlag | None:
-    if c.field in LIABILITY_FIELDS:
-        if _parse_limit(c.renewal_value) < _parse_limit(c.prior_value):
-            return DiffFlag.LIABILITY_LIMIT_DECREASE
-
-    elif c.field in DEDUCTIBLE_FIELDS:
-        try:
-            if float(c.renewal_value) > float(c.prior_value):
-                return DiffFlag.DEDUCTIBLE_INCREASE
-        except ValueError:
-            pass
-
-    elif c.field in COVERAGE_DROP_FIELDS:
-        try:
-            if float(c.renewal_value) < float(c.prior_value):
-                return DiffFlag.COVERAGE_DROPPED
-        except ValueError:
-            pass
-
-    elif c.field == "vehicle_added":
-        return DiffFlag.VEHICLE_ADDED
-    elif c.field == "vehicle_removed":
-        return DiffFlag.VEHICLE_REMOVED
-    elif c.field == "driver_added":
-        return DiffFlag.DRIVER_ADDED
-    elif c.field == "driver_removed":
-        return DiffFlag.DRIVER_REMOVED
-    elif c.field == "endorsement_added":
-        return DiffFlag.ENDORSEMENT_ADDED
-    elif c.field == "endorsement_removed":
-        return DiffFlag.ENDORSEMENT_REMOVED
-    elif c.field == "notes":
-        return DiffFlag.NOTES_CHANGED
-
-    # boolean coverage drops (True→False)
-    elif (
-        c.prior_value == "True"
-        and c.renewal_value == "False"
-        and c.field in {"water_backup", "replacement_cost", "rental_reimbursement"}
-    ):
-        return DiffFlag.COVERAGE_DROPPED
-
-    # boolean coverage adds (False→True)
-    elif (
-        c.prior_value == "False"
-        and c.renewal_value == "True"
-        and c.field
-        in {"water_backup", "replacement_cost", "rental_reimbursement", "roadside_assistance"}
-    ):
-        return DiffFlag.COVERAGE_ADDED
-
-    return None
-
-
-def _flag_changes(changes: list[FieldChange]) -> tuple[list[DiffFlag], list[FieldChange]]:
-    flags: list[DiffFlag] = []
-    updated: list[FieldChange] = []
+        return None
+    return (renewal_p - prior_p) / prior_p * 100
+
+
+def _num_rises(c: ChangeRecord) -> bool:
+    try:
+        return float(c.renewal_value) > float(c.prior_value)
+    except ValueError:
+        return False
+
+
+def _num_falls(c: ChangeRecord) -> bool:
+    try:
+        return float(c.renewal_value) < float(c.prior_value)
+    except ValueError:
+        return False
+
+
+def _limit_falls(c: ChangeRecord) -> bool:
+    return sum(split_limit(c.renewal_value)) < sum(split_limit(c.prior_value))
+
+
+def _always(c: ChangeRecord) -> bool:
+    return True
+
+
+# a change record only exists when the values differ, so one side decides the direction
+def _turned_off(c: ChangeRecord) -> bool:
+    return c.renewal_value == "False"
+
+
+def _turned_on(c: ChangeRecord) -> bool:
+    return c.renewal_value == "True"
+
+
+@dataclass(slots=True)
+class RuleCounter:
+    calls: int = 0
+    hits: int = 0
+    total_ns: int = 0
+
+
+# process-wide, keyed by flag so recompiling the rules keeps their history
+RULE_COUNTERS: dict[DiffFlag, RuleCounter] = {f: RuleCounter() for f in DiffFlag}
+
+
+@dataclass(slots=True)
+class Rule:
+    flag: DiffFlag
+    check: Callable[[Any], bool]
+    counter: RuleCounter
+
+    def __call__(self, subject: Any) -> bool:
+        start = time.perf_counter_ns()
+        hit = self.check(subject)
+        counter = self.counter
+        counter.total_ns += time.perf_counter_ns() - start
+        counter.calls += 1
+        if hit:
+            counter.hits += 1
+        return hit
+
+
+def _change_rules() -> list[tuple[Iterable[str], DiffFlag, Callable[[ChangeRecord], bool]]]:
+    # per field, the first rule that matches sets the change's flag
+    return [
+        (LIABILITY_FIELDS, DiffFlag.LIABILITY_LIMIT_DECREASE, _limit_falls),
+        (DEDUCTIBLE_FIELDS, DiffFlag.DEDUCTIBLE_INCREASE, _num_rises),
+        (COVERAGE_DROP_FIELDS, DiffFlag.COVERAGE_DROPPED, _num_falls),
+        *(([field], flag, _always) for field, flag in ENTITY_FLAGS.items()),
+        (["notes"], DiffFlag.NOTES_CHANGED, _always),
+        (TOGGLE_DROP_FIELDS, DiffFlag.COVERAGE_DROPPED, _turned_off),
+        (TOGGLE_ADD_FIELDS, DiffFlag.COVERAGE_ADDED, _turned_on),
+    ]
+
+
+def _pair_rules(t: RuleThresholds) -> list[tuple[DiffFlag, Callable[[RenewalPair], bool]]]:
+    critical, high = t.premium_critical_pct, t.premium_high_pct
+    youthful_age = t.youthful_operator_age
+    um_minimum = sum(split_limit(t.um_uim_min_limit))
+
+    def premium_critical(pair: RenewalPair) -> bool:
+        pct = _premium_pct(pair)
+        return pct is not None and pct >= critical
+
+    def premium_high(pair: RenewalPair) -> bool:
+        pct = _premium_pct(pair)
+        return pct is not None and high <= pct < critical
+
+    def premium_decrease(pair: RenewalPair) -> bool:
+        pct = _premium_pct(pair)
+        return pct is not None and pct < 0
+
+    def youthful_operator(pair: RenewalPair) -> bool:
+        return any(d.age < youthful_age for d in pair.renewal.drivers)
+
+    def coverage_gap(pair: RenewalPair) -> bool:
+        renewal = pair.renewal
+        if renewal.policy_type != PolicyType.AUTO or renewal.auto_coverages is None:
+            return False
+        return sum(renewal.auto_coverages.uninsured_motorist_limits) < um_minimum
+
+    return [
+        (DiffFlag.PREMIUM_INCREASE_CRITICAL, premium_critical),
+        (DiffFlag.PREMIUM_INCREASE_HIGH, premium_high),
+        (DiffFlag.PREMIUM_DECREASE, premium_decrease),
+        (DiffFlag.CARRIER_CHANGE, lambda p: p.prior.carrier != p.renewal.carrier),
+        (DiffFlag.DRIVER_VIOLATIONS, lambda p: any(d.violations > 0 for d in p.renewal.drivers)),
+        (DiffFlag.SR22_FILING, lambda p: any(d.sr22 for d in p.renewal.drivers)),
+        (DiffFlag.YOUTHFUL_OPERATOR, youthful_operator),
+        (DiffFlag.COVERAGE_GAP, coverage_gap),
+    ]
+
+
+class RuleEngine:
+    # rules compiled for one set of thresholds: change rules dispatch on the field name, so a
+    # change only runs the rules registered for its field
+    def __init__(self, thresholds: RuleThresholds):
+        self.source = dict(thresholds.__dict__)
+        self.disabled = frozenset(DiffFlag(name) for name in thresholds.disabled_rules)
+
+        by_field: dict[str, list[Rule]] = {}
+        for fields, flag, check in _change_rules():
+            if flag in self.disabled:
+                continue
+            rule = Rule(flag, check, RULE_COUNTERS[flag])
+            for field in fields:
+                by_field.setdefault(field, []).append(rule)
+        self.by_field = {field: tuple(rules) for field, rules in by_field.items()}
+        self.pair_rules = tuple(
+            Rule(flag, check, RULE_COUNTERS[flag])
+            for flag, check in _pair_rules(thresholds)
+            if flag not in self.disabled
+        )
+        # the only pair rule book_rules.scalar_flags doesn't vectorize
+        self.carrier_rules = tuple(r for r in self.pair_rules if r.flag == DiffFlag.CARRIER_CHANGE)
+
+    def detect(self, c: ChangeRecord) -> DiffFlag | None:
+        for rule in self.by_field.get(c.field, ()):
+            if rule(c):
+                return rule.flag
+        return None
+
+    def pair_flags(
+        self, pair: RenewalPair, precomputed: list[DiffFlag] | None = None
+    ) -> list[DiffFlag]:
+        if precomputed is None:
+            return [rule.flag for rule in self.pair_rules if rule(pair)]
+        flags = self.accept(precomputed)
+        flags.extend(rule.flag for rule in self.carrier_rules if rule(pair))
+        return flags
+
+    def accept(self, flags: Iterable[DiffFlag]) -> list[DiffFlag]:
+        # flags evaluated elsewhere (vectorized pre-pass, notes keywords) count as hits only
+        accepted = [f for f in flags if f not in self.disabled]
+        for f in accepted:
+            RULE_COUNTERS[f].hits += 1
+        return accepted
+
+
+_engine: RuleEngine | None = None
+
+
+def rule_engine(thresholds: RuleThresholds | None = None) -> RuleEngine:
+    global _engine
+    if thresholds is None:
+        from app.config import settings
+
+        thresholds = settings.rules
+
+    engine = _engine
+    if engine is None or engine.source != thresholds.__dict__:
+        engine = _engine = RuleEngine(thresholds)
+    return engine
+
+
+def flag_changes(
+    changes: list[ChangeRecord],
+    pair: RenewalPair,
+    thresholds: RuleThresholds | None = None,
+    pair_flags: list[DiffFlag] | None = None,
+    notes_flags: list[DiffFlag] | None = None,
+) -> list[DiffFlag]:
+    engine = rule_engine(thresholds)
+
+    # pair_flags: premium/driver/coverage-gap flags precomputed by book_rules.scalar_flags
+    flags = engine.pair_flags(pair, pair_flags)
+
     for c in changes:
-        detected = _detect_flag(c)
+        detected = engine.detect(c)
         if detected is not None:
             flags.append(detected)
-            updated.append(c.model_copy(update={"flag": detected}))
-        else:
-            updated.append(c)
-    return flags, updated
-
-
-def _flag_drivers(pair: RenewalPair, thresholds: RuleThresholds) -> list[DiffFlag]:
-    flags: list[DiffFlag] = []
-    for d in pair.renewal.drivers:
-        if d.violations > 0 and DiffFlag.DRIVER_VIOLATIONS not in flags:
-            flags.append(DiffFlag.DRIVER_VIOLATIONS)
-        if d.sr22 and DiffFlag.SR22_FILING not in flags:
-            flags.append(DiffFlag.SR22_FILING)
-        if d.age < thresholds.youthful_operator_age and DiffFlag.YOUTHFUL_OPERATOR not in flags:
-            flags.append(DiffFlag.YOUTHFUL_OPERATOR)
-    return flags
-
-
-def _flag_coverage_gap(pair: RenewalPair, thresholds: RuleThresholds) -> list[DiffFlag]:
-    if pair.renewal.policy_type != PolicyType.AUTO:
-        return []
-    cov = pair.renewal.auto_coverages
-    if cov is None:
-        return []
-    current = _parse_limit(cov.uninsured_motorist)
-    minimum = _parse_limit(thresholds.um_uim_min_limit)
-    if current < minimum:
-        return [DiffFlag.COVERAGE_GAP]
-    return []
+            c.flag = detected
+
+    if notes_flags is None:
+        from app.domain.services.notes_rules import flag_notes_keywords
+
+        notes_flags = flag_notes_keywords(pair.renewal.notes)
+    flags.extend(engine.accept(notes_flags))
+
+    # premium flags also annotate the premium change
+    for c in changes:
+        if c.field == "premium" and c.flag is None:
+            c.flag = next((f for f in flags if f in PREMIUM_FLAGS), None)
+
+    return list(set(flags))
 
 
 def flag_diff(
-    diff: DiffResult, pair: RenewalPair, thresholds: RuleThresholds | None = None
+    diff: DiffResult,
+    pair: RenewalPair,
+    thresholds: RuleThresholds | None = None,
+    pair_flags: list[DiffFlag] | None = None,
+    notes_flags: list[DiffFlag] | None = None,
 ) -> DiffResult:
-    if thresholds is None:
-        from app.config import settings
+    changes = [ChangeRecord.from_field_change(c) for c in diff.changes]
+    flags = flag_changes(changes, pair, thresholds, pair_flags, notes_flags)
+    return DiffResult.from_records(diff.policy_number, changes, flags)
 
-        thresholds = settings.rules
 
-    flags: list[DiffFlag] = []
-    flags.extend(_flag_premium(pair, thresholds))
-    flags.extend(_flag_carrier(pair))
-    change_flags, updated_changes = _flag_changes(diff.changes)
-    flags.extend(change_flags)
-    flags.extend(_flag_drivers(pair, thresholds))
-    flags.extend(_flag_coverage_gap(pair, thresholds))
+def _scopes() -> dict[DiffFlag, RuleScope]:
+    scopes = {flag: RuleScope.CHANGE for _, flag, _ in _change_rules()}
+    scopes.update((flag, RuleScope.PAIR) for flag, _ in _pair_rules(RuleThresholds()))
+    scopes.update((flag, RuleScope.NOTES) for flag in NOTES_FLAGS)
+    return scopes
 
-    from app.domain.services.notes_rules import flag_notes_keywords
 
-    notes_flags = flag_notes_keywords(pair.renewal.notes)
-    flags.extend(notes_flags)
+def rule_stats(thresholds: RuleThresholds | None = None) -> list[RuleStats]:
+    engine = rule_engine(thresholds)
+    stats: list[RuleStats] = []
+    for flag, scope in _scopes().items():
+        counter = RULE_COUNTERS[flag]
+        stats.append(
+            RuleStats(
+                rule=flag,
+                scope=scope,
+                enabled=flag not in engine.disabled,
+                calls=counter.calls,
+                hits=counter.hits,
+                total_ms=round(counter.total_ns / 1e6, 3),
+                mean_us=round(counter.total_ns / counter.calls / 1e3, 3) if counter.calls else 0.0,
+            )
+        )
+    # costliest first
+    return sorted(stats, key=lambda s: s.total_ms, reverse=True)
 
-    # premium flags also annotate the premium change
-    premium_flags = {
-        DiffFlag.PREMIUM_INCREASE_HIGH,
-        DiffFlag.PREMIUM_INCREASE_CRITICAL,
-        DiffFlag.PREMIUM_DECREASE,
+
+def snapshot_rule_counters() -> dict[DiffFlag, tuple[int, int, int]]:
+    return {
+        f: (c.calls, c.hits, c.total_ns) for f, c in RULE_COUNTERS.items() if c.calls or c.hits
     }
-    final_changes: list[FieldChange] = []
-    for c in updated_changes:
-        if c.field == "premium" and c.flag is None:
-            premium_flag = next((f for f in flags if f in premium_flags), None)
-            if premium_flag is not None:
-                final_changes.append(c.model_copy(update={"flag": premium_flag}))
-                continue
-        final_changes.append(c)
 
-    return DiffResult(
-        policy_number=diff.policy_number,
-        changes=final_changes,
-        flags=list(set(flags)),
-    )
+
+def merge_rule_counters(snapshot: dict[DiffFlag, tuple[int, int, int]]) -> None:
+    for flag, (calls, hits, total_ns) in snapshot.items():
+        counter = RULE_COUNTERS[flag]
+        counter.calls += calls
+        counter.hits += hits
+        counter.total_ns += total_ns
+
+
+def reset_rule_counters() -> None:
+    for counter in RULE_COUNTERS.values():
+        counter.calls = counter.hits = counter.total_ns = 0
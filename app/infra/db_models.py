@@ -11,14 +11,14 @@ class RenewalPairRow(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     policy_number: Mapped[str] = mapped_column(String(50), index=True)
-    policy_type: Mapped[str] = mapped_column(String(10))
+    policy_type: Mapped[str] = mapped_column(String(10), index=True)
     carrier_prior: Mapped[str] = mapped_column(String(100))
     carrier_renewal: Mapped[str] = mapped_column(String(100))
     premium_prior: Mapped[float] = mapped_column(Float)
     premium_renewal: Mapped[float] = mapped_column(Float)
     effective_date_prior: Mapped[date] = mapped_column()
-    effective_date_renewal: Mapped[date] = mapped_column()
-    state: Mapped[str] = mapped_column(String(2), default="CA")
+    effective_date_renewal: Mapped[date] = mapped_column(index=True)
+    state: Mapped[str] = mapped_column(String(2), default="CA", index=True)
     insured_name: Mapped[str] = mapped_column(String(200), default="")
     account_id: Mapped[str] = mapped_column(String(50), default="", index=True)
     prior_json: Mapped[dict] = mapped_column(JSON)
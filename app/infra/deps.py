@@ -3,6 +3,7 @@ from app.adaptor.storage.memory import (
     InMemoryJobStore,
     InMemoryReviewStore,
 )
+from app.application.job_scheduler import JobScheduler
 from app.domain.models.review import BatchSummary
 from app.domain.ports.llm import LLMPort
 from app.domain.ports.result_writer import ResultWriter
@@ -11,6 +12,7 @@ _review_store = InMemoryReviewStore()
 _history_store = InMemoryHistoryStore()
 _job_store = InMemoryJobStore()
 
+_job_scheduler: JobScheduler | None = None
 _llm_client: LLMPort | None = None
 _result_writer: ResultWriter | None = None
 
@@ -27,6 +29,15 @@ def get_job_store() -> InMemoryJobStore:
     return _job_store
 
 
+def get_job_scheduler() -> JobScheduler:
+    global _job_scheduler
+    if _job_scheduler is None:
+        from app.config import settings
+
+        _job_scheduler = JobScheduler(_job_store, settings.batch.max_concurrent_jobs)
+    return _job_scheduler
+
+
 def get_last_summary() -> BatchSummary | None:
     return _job_store.last_summary
 
@@ -9,6 +9,7 @@ from app.api.eval import router as eval_router
 from app.api.portfolio import router as portfolio_router
 from app.api.quotes import router as quotes_router
 from app.api.reviews import router as reviews_router
+from app.api.rules import router as rules_router
 from app.api.ui import router as ui_router
 from app.infra.db import init_db
 
@@ -16,8 +17,9 @@ logger = logging.getLogger(__name__)
 
 
 def _restore_cache_from_db() -> None:
-    from app.data_loader import load_pairs
+    from app.data_loader import load_entries
     from app.domain.models.diff import DiffFlag, DiffResult, FieldChange
+    from app.domain.models.policy import entry_header
     from app.domain.models.quote import QuoteRecommendation
     from app.domain.models.review import LLMInsight, ReviewResult, RiskLevel
     from app.infra.deps import get_result_writer, get_review_store
@@ -27,7 +29,8 @@ def _restore_cache_from_db() -> None:
     if not rows:
         return
 
-    pairs_by_pn = {p.prior.policy_number: p for p in load_pairs()}
+    # restored results keep book entries, so a lazy book isn't materialized on startup
+    entries_by_pn = {entry_header(e).policy_number: e for e in load_entries()}
 
     llm_by_pn: dict[str, dict] = {}
     for lr in writer.load_latest_llm_results():
@@ -62,12 +65,14 @@ def _restore_cache_from_db() -> None:
             summary=summary,
             llm_insights=llm_insights,
             llm_summary_generated=llm_summary_generated,
-            pair=pairs_by_pn.get(pn),
             broker_contacted=row.get("broker_contacted", False),
             quote_generated=row.get("quote_generated", False),
             quotes=quotes,
             reviewed_at=row.get("reviewed_at"),
         )
+        entry = entries_by_pn.get(pn)
+        if entry is not None:
+            result.attach_pair(entry)
         store[result.policy_number] = result
 
     logger.info("Restored %d results from DB cache", len(rows))
@@ -112,6 +117,7 @@ app.include_router(eval_router)
 app.include_router(analytics_router)
 app.include_router(quotes_router)
 app.include_router(portfolio_router)
+app.include_router(rules_router)
 
 
 @app.get("/health")
@@ -1,7 +1,18 @@
-"""Generate 8,000 mock renewal pairs for demo."""
+"""Generate mock renewal pairs.
 
+With no arguments this writes the 8,000-pair demo book to data/renewals.json (seed 42).
+Larger books can be streamed as JSONL shards from parallel worker processes:
+
+    uv run python data/generate.py --accounts 800000 --format jsonl --workers 8
+    uv run python data/generate.py --accounts 1000 --profile stress --format jsonl
+"""
+
+import argparse
 import json
 import random
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import date, timedelta
 from pathlib import Path
 
@@ -174,6 +185,32 @@ LAST_NAMES = [
 ]
 
 
+@dataclass(frozen=True)
+class Profile:
+    vehicles: tuple[int, int] = (1, 3)
+    drivers: tuple[int, int] = (1, 3)
+    endorsements: tuple[int, int] = (0, 3)
+    auto_codes: tuple[tuple[str, str], ...] = tuple(ENDORSEMENT_CODES_AUTO)
+    home_codes: tuple[tuple[str, str], ...] = tuple(ENDORSEMENT_CODES_HOME)
+
+
+DEFAULT_PROFILE = Profile()
+
+# worst-case shapes: large entity lists stress the differ's matching and the LLM prompts
+PROFILES = {
+    "default": DEFAULT_PROFILE,
+    "stress": Profile(
+        vehicles=(8, 20),
+        drivers=(6, 15),
+        endorsements=(15, 40),
+        auto_codes=tuple(ENDORSEMENT_CODES_AUTO)
+        + tuple((f"AX{n:03d}", f"Auto rider {n}") for n in range(60)),
+        home_codes=tuple(ENDORSEMENT_CODES_HOME)
+        + tuple((f"HX{n:03d}", f"Home rider {n}") for n in range(60)),
+    ),
+}
+
+
 def _random_vin() -> str:
     chars = "0123456789ABCDEFGHJKLMNPRSTUVWXYZ"
     return "".join(random.choices(chars, k=17))
@@ -195,6 +232,7 @@ def _make_auto_pair(
     insured_name: str = "",
     carrier: str = "",
     state: str = "",
+    profile: Profile = DEFAULT_PROFILE,
 ) -> dict:
     policy_num = f"AUTO-2024-{idx:04d}"
     state = state or random.choice(STATES)
@@ -212,7 +250,7 @@ def _make_auto_pair(
     coll_ded = random.choice([250, 500, 1000])
     comp_ded = random.choice([100, 250, 500])
 
-    n_vehicles = random.randint(1, 3)
+    n_vehicles = random.randint(*profile.vehicles)
     vehicles = []
     for _ in range(n_vehicles):
         make, model = random.choice(MAKES_MODELS)
@@ -226,7 +264,7 @@ def _make_auto_pair(
             }
         )
 
-    n_drivers = random.randint(1, 3)
+    n_drivers = random.randint(*profile.drivers)
     drivers = []
     for j in range(n_drivers):
         drivers.append(
@@ -239,8 +277,8 @@ def _make_auto_pair(
             }
         )
 
-    n_endorsements = random.randint(0, 3)
-    codes = random.sample(ENDORSEMENT_CODES_AUTO, min(n_endorsements, len(ENDORSEMENT_CODES_AUTO)))
+    n_endorsements = random.randint(*profile.endorsements)
+    codes = random.sample(profile.auto_codes, min(n_endorsements, len(profile.auto_codes)))
     endorsements = [
         {"code": c, "description": d, "premium": round(random.uniform(10, 80), 2)}
         for c, d in codes
@@ -313,7 +351,7 @@ def _make_auto_pair(
     if random.random() < 0.20:
         available = [
             c
-            for c in ENDORSEMENT_CODES_AUTO
+            for c in profile.auto_codes
             if c[0] not in {e["code"] for e in renewal["endorsements"]}
         ]
         if available:
@@ -338,6 +376,7 @@ def _make_home_pair(
     insured_name: str = "",
     carrier: str = "",
     state: str = "",
+    profile: Profile = DEFAULT_PROFILE,
 ) -> dict:
     policy_num = f"HOME-2024-{idx:04d}"
     state = state or random.choice(STATES)
@@ -376,8 +415,8 @@ def _make_home_pair(
         "endorsements": [],
     }
 
-    n_endorsements = random.randint(0, 3)
-    codes = random.sample(ENDORSEMENT_CODES_HOME, min(n_endorsements, len(ENDORSEMENT_CODES_HOME)))
+    n_endorsements = random.randint(*profile.endorsements)
+    codes = random.sample(profile.home_codes, min(n_endorsements, len(profile.home_codes)))
     prior["endorsements"] = [
         {"code": c, "description": d, "premium": round(random.uniform(30, 150), 2)}
         for c, d in codes
@@ -422,7 +461,7 @@ def _make_home_pair(
     if random.random() < 0.20:
         available = [
             c
-            for c in ENDORSEMENT_CODES_HOME
+            for c in profile.home_codes
             if c[0] not in {e["code"] for e in renewal["endorsements"]}
         ]
         if available:
@@ -440,56 +479,170 @@ def _make_home_pair(
     return {"prior": prior, "renewal": renewal}
 
 
-def main():
-    random.seed(42)
-    pairs = []
-    auto_idx = 0
-    home_idx = 0
+@dataclass(frozen=True)
+class BookPlan:
+    # accounts are laid out bundle → auto-only → home-only, numbered ACCT-00000 upward
+    bundle: int
+    auto_only: int
+    home_only: int
 
-    # 1600 bundle accounts (auto + home, same carrier/state)
-    for acct_i in range(1600):
-        account_id = f"ACCT-{acct_i:05d}"
-        name = _random_name()
+    @property
+    def accounts(self) -> int:
+        return self.bundle + self.auto_only + self.home_only
+
+    @property
+    def pairs(self) -> int:
+        return 2 * self.bundle + self.auto_only + self.home_only
+
+
+def plan_book(
+    accounts: int = 6400, mix: tuple[float, float, float] = (0.25, 0.5, 0.25)
+) -> BookPlan:
+    bundle_share, auto_share, _ = (m / sum(mix) for m in mix)
+    bundle = round(accounts * bundle_share)
+    auto_only = round(accounts * auto_share)
+    return BookPlan(bundle, auto_only, accounts - bundle - auto_only)
+
+
+def _make_account(plan: BookPlan, acct_i: int, profile: Profile) -> list[dict]:
+    account_id = f"ACCT-{acct_i:05d}"
+    name = _random_name()
+    if acct_i < plan.bundle:
         carrier = random.choice(CARRIERS)
         state = random.choice(STATES)
-        pairs.append(
-            _make_auto_pair(
-                auto_idx,
-                account_id=account_id,
-                insured_name=name,
-                carrier=carrier,
-                state=state,
-            )
+        shared = {
+            "account_id": account_id,
+            "insured_name": name,
+            "carrier": carrier,
+            "state": state,
+            "profile": profile,
+        }
+        return [_make_auto_pair(acct_i, **shared), _make_home_pair(acct_i, **shared)]
+    if acct_i < plan.bundle + plan.auto_only:
+        # auto numbering continues after the bundle autos
+        return [_make_auto_pair(acct_i, account_id=account_id, insured_name=name, profile=profile)]
+    home_idx = acct_i - plan.auto_only
+    return [_make_home_pair(home_idx, account_id=account_id, insured_name=name, profile=profile)]
+
+
+def generate_book(
+    plan: BookPlan, seed: int = 42, profile: Profile = DEFAULT_PROFILE
+) -> list[dict]:
+    random.seed(seed)
+    pairs = [p for a in range(plan.accounts) for p in _make_account(plan, a, profile)]
+    random.shuffle(pairs)
+    return pairs
+
+
+def shard_ranges(plan: BookPlan, shard_size: int) -> list[tuple[int, int]]:
+    # shard_size is in pairs; shards split on account boundaries so bundles stay together
+    per_shard = max(1, shard_size * plan.accounts // max(plan.pairs, 1))
+    return [(a, min(a + per_shard, plan.accounts)) for a in range(0, plan.accounts, per_shard)]
+
+
+def generate_shard(
+    plan: BookPlan, start: int, stop: int, seed: int = 42, profile: Profile = DEFAULT_PROFILE
+) -> list[dict]:
+    # independent stream per shard, so output doesn't depend on worker count or scheduling
+    random.seed(f"{seed}:{start}")
+    pairs = [p for a in range(start, stop) for p in _make_account(plan, a, profile)]
+    random.shuffle(pairs)
+    return pairs
+
+
+def iter_book(
+    plan: BookPlan, seed: int = 42, profile: Profile = DEFAULT_PROFILE, shard_size: int = 10_000
+) -> Iterator[list[dict]]:
+    for start, stop in shard_ranges(plan, shard_size):
+        yield generate_shard(plan, start, stop, seed, profile)
+
+
+def _write_shard(
+    plan: BookPlan, start: int, stop: int, seed: int, profile: Profile, path: Path
+) -> tuple[int, int, int]:
+    pairs = generate_shard(plan, start, stop, seed, profile)
+    with path.open("w") as f:
+        for p in pairs:
+            f.write(json.dumps(p, separators=(",", ":")))
+            f.write("\n")
+    auto = sum(1 for p in pairs if p["prior"]["policy_type"] == "auto")
+    notes = sum(1 for p in pairs if p["renewal"].get("notes"))
+    return auto, len(pairs) - auto, notes
+
+
+def write_shards(
+    plan: BookPlan,
+    out_dir: Path,
+    seed: int = 42,
+    profile: Profile = DEFAULT_PROFILE,
+    shard_size: int = 10_000,
+    workers: int = 1,
+) -> tuple[int, int, int]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob("renewals-*.jsonl"):
+        stale.unlink()
+    ranges = shard_ranges(plan, shard_size)
+    args = [
+        (plan, start, stop, seed, profile, out_dir / f"renewals-{i:05d}.jsonl")
+        for i, (start, stop) in enumerate(ranges)
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_write_shard, *zip(*args, strict=True)))
+    else:
+        counts = [_write_shard(*a) for a in args]
+    auto, home, notes = (sum(c) for c in zip(*counts, strict=True))
+    return auto, home, notes
+
+
+def _parse_mix(value: str) -> tuple[float, float, float]:
+    parts = tuple(float(v) for v in value.split(","))
+    if len(parts) != 3 or any(v < 0 for v in parts) or not sum(parts):
+        raise argparse.ArgumentTypeError(
+            "mix must be three non-negative numbers: bundle,auto,home"
         )
-        auto_idx += 1
-        pairs.append(
-            _make_home_pair(
-                home_idx,
-                account_id=account_id,
-                insured_name=name,
-                carrier=carrier,
-                state=state,
-            )
+    return parts
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Generate mock renewal pairs")
+    parser.add_argument("--accounts", type=int, default=6400)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=(0.25, 0.5, 0.25),
+        help="account mix as bundle,auto,home weights (default 0.25,0.5,0.25)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="json: one array built in memory; jsonl: streamed shards (for large books)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="processes for jsonl shards")
+    parser.add_argument("--shard-size", type=int, default=50_000, help="pairs per jsonl shard")
+    parser.add_argument("--out", type=Path, help="output file (json) or directory (jsonl)")
+    args = parser.parse_args(argv)
+
+    plan = plan_book(args.accounts, args.mix)
+    profile = PROFILES[args.profile]
+
+    if args.format == "jsonl":
+        out_dir = args.out or Path(__file__).parent / "renewals"
+        auto_count, home_count, notes_count = write_shards(
+            plan, out_dir, args.seed, profile, args.shard_size, args.workers
         )
-        home_idx += 1
-
-    # 3200 auto-only accounts
-    for acct_i in range(1600, 4800):
-        account_id = f"ACCT-{acct_i:05d}"
-        name = _random_name()
-        pairs.append(_make_auto_pair(auto_idx, account_id=account_id, insured_name=name))
-        auto_idx += 1
-
-    # 1600 home-only accounts
-    for acct_i in range(4800, 6400):
-        account_id = f"ACCT-{acct_i:05d}"
-        name = _random_name()
-        pairs.append(_make_home_pair(home_idx, account_id=account_id, insured_name=name))
-        home_idx += 1
+        shards = len(list(out_dir.glob("renewals-*.jsonl")))
+        print(f"Generated {plan.pairs} renewal pairs → {out_dir}/ ({shards} shards)")
+        print(f"  Auto: {auto_count}, Home: {home_count}, With notes: {notes_count}")
+        print(f"  Accounts: {plan.accounts}, Bundle accounts: {plan.bundle}")
+        return
 
-    random.shuffle(pairs)
+    pairs = generate_book(plan, args.seed, profile)
 
-    out_path = Path(__file__).parent / "renewals.json"
+    out_path = args.out or Path(__file__).parent / "renewals.json"
     out_path.write_text(json.dumps(pairs, indent=None, separators=(",", ":")))
 
     total_mb = out_path.stat().st_size / (1024 * 1024)
@@ -0,0 +1,211 @@
+"""Throughput benchmark for the review pipeline.
+
+Generates synthetic books with data/generate.py (iter_book) and measures each pipeline stage
+(compute_diff, flag_diff, generate_quotes, analyze_portfolio, process_batch) in its
+own spawned process, so peak RSS is attributable to that stage. Books are generated
+and processed in chunks, which keeps memory bounded even at 1M pairs.
+
+Usage:
+    uv run python scripts/benchmark.py
+    uv run python scripts/benchmark.py --sizes 10000,100000 --stages diff,batch
+    make bench BENCH_SIZES=10000
+
+Results are printed as a table and written to bench_results/<timestamp>-<commit>.json.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from array import array
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+STAGES = ["diff", "flag", "quotes", "portfolio", "batch"]
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _book_chunks(size: int, chunk_size: int, seed: int) -> Iterator[list[dict]]:
+    from data.generate import iter_book, plan_book
+
+    # default mix averages 1.25 pairs per account; trim the last shard to the exact size
+    plan = plan_book(accounts=-(-size * 4 // 5))
+    remaining = size
+    for shard in iter_book(plan, seed=seed, shard_size=chunk_size):
+        if remaining <= 0:
+            return
+        yield shard[:remaining]
+        remaining -= len(shard)
+
+
+def _run_stage(stage: str, size: int, chunk_size: int, seed: int) -> dict:
+    from app.application.batch import process_batch
+    from app.domain.services.differ import compute_diff
+    from app.domain.services.parser import parse_pair
+    from app.domain.services.portfolio_analyzer import analyze_portfolio
+    from app.domain.services.quote_generator import generate_quotes
+    from app.domain.services.rules import flag_diff
+
+    baseline_rss = _peak_rss_mb()
+    samples = array("d")
+    items = 0
+    clock = time.perf_counter
+
+    for raw_chunk in _book_chunks(size, chunk_size, seed):
+        pairs = [parse_pair(r) for r in raw_chunk]
+
+        if stage == "diff":
+            for pair in pairs:
+                t = clock()
+                compute_diff(pair)
+                samples.append(clock() - t)
+
+        elif stage == "flag":
+            diffs = [compute_diff(p) for p in pairs]
+            for pair, diff in zip(pairs, diffs, strict=True):
+                t = clock()
+                flag_diff(diff, pair)
+                samples.append(clock() - t)
+
+        elif stage == "quotes":
+            diffs = [flag_diff(compute_diff(p), p) for p in pairs]
+            for pair, diff in zip(pairs, diffs, strict=True):
+                t = clock()
+                generate_quotes(pair, diff)
+                samples.append(clock() - t)
+
+        elif stage == "portfolio":
+            results, _ = process_batch(pairs)
+            store = {r.policy_number: r for r in results}
+            accounts: dict[str, list[str]] = defaultdict(list)
+            for pair in pairs:
+                accounts[pair.prior.account_id].append(pair.prior.policy_number)
+            for policy_numbers in accounts.values():
+                if len(policy_numbers) < 2:
+                    continue
+                t = clock()
+                analyze_portfolio(policy_numbers, store)
+                samples.append(clock() - t)
+
+        elif stage == "batch":
+            # the rule pre-pass is vectorized per chunk, so there is no per-pair boundary
+            # inside process_batch — only chunk wall time (throughput) is measured
+            t = clock()
+            process_batch(pairs)
+            samples.append(clock() - t)
+
+        items += len(pairs)
+
+    latencies = np.frombuffer(samples, dtype=np.float64) if samples else np.zeros(1)
+    elapsed = float(latencies.sum())
+    p50 = p99 = None
+    if stage != "batch":
+        p50, p99 = (round(float(v) * 1e6, 2) for v in np.percentile(latencies, [50, 99]))
+    basis = {"portfolio": "per_account", "batch": "per_chunk"}
+    return {
+        "stage": stage,
+        "size": size,
+        "items": len(samples),
+        "latency_basis": basis.get(stage, "per_pair"),
+        "seconds": round(elapsed, 3),
+        "pairs_per_sec": round(items / elapsed, 1) if elapsed else 0.0,
+        "p50_us": p50,
+        "p99_us": p99,
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _us(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:,.1f}"
+
+
+def _print_row(r: dict) -> None:
+    print(
+        f"{r['stage']:<10} {r['size']:>9,} {r['pairs_per_sec']:>12,.0f} "
+        f"{_us(r['p50_us']):>10} {_us(r['p99_us']):>10} {r['peak_rss_mb']:>10,.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the review pipeline")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma- or space-separated book sizes (pairs)",
+    )
+    parser.add_argument("--stages", default=",".join(STAGES), help="subset of " + ",".join(STAGES))
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=ROOT / "bench_results")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.replace(",", " ").split()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    print(
+        f"{'stage':<10} {'pairs':>9} {'pairs/s':>12} {'p50 µs':>10} {'p99 µs':>10} {'RSS MB':>10}"
+    )
+    # one fresh interpreter per stage so ru_maxrss reflects only that stage
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for size in sizes:
+        for stage in stages:
+            with ctx.Pool(1) as pool:
+                r = pool.apply(_run_stage, (stage, size, args.chunk_size, args.seed))
+            _print_row(r)
+            results.append(r)
+
+    commit = _git_commit()
+    started = datetime.now(UTC)
+    report = {
+        "commit": commit,
+        "created_at": started.isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "chunk_size": args.chunk_size,
+        "results": results,
+    }
+    args.out.mkdir(parents=True, exist_ok=True)
+    out_path = args.out / f"{started:%Y%m%dT%H%M%S}-{commit}.json"
+    out_path.write_text(json.dumps(report, indent=2))
+    print(f"→ {out_path}")
+
+
+if __name__ == "__main__":
+    main()
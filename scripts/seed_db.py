@@ -43,14 +43,14 @@ async def seed():
                 renewal = pair["renewal"]
                 row = RenewalPairRow(
                     policy_number=prior["policy_number"],
-                    policy_type=prior["policy_type"],
+                    policy_type=prior["policy_type"].strip().lower(),
                     carrier_prior=prior["carrier"],
                     carrier_renewal=renewal["carrier"],
                     premium_prior=float(prior["premium"]),
                     premium_renewal=float(renewal["premium"]),
                     effective_date_prior=date.fromisoformat(prior["effective_date"]),
                     effective_date_renewal=date.fromisoformat(renewal["effective_date"]),
-                    state=prior.get("state", "CA"),
+                    state=prior.get("state", "CA").strip().upper(),
                     insured_name=prior.get("insured_name", ""),
                     account_id=prior.get("account_id", ""),
                     prior_json=prior,
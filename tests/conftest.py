@@ -1,14 +1,25 @@
 import json
+from datetime import date
 from pathlib import Path
 
 import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.domain.models.policy import RenewalPair
 from app.domain.services.parser import parse_pair
+from app.infra.db import Base
+from app.infra.db_models import RenewalPairRow
 
 SAMPLES_DIR = Path(__file__).parent.parent / "data" / "samples"
 
 
+@pytest.fixture(autouse=True)
+def _no_book_cache(monkeypatch):
+    monkeypatch.setattr(settings, "book_cache_dir", "")
+
+
 @pytest.fixture
 def auto_pair_raw() -> dict:
     return json.loads((SAMPLES_DIR / "auto_pair.json").read_text())
@@ -27,3 +38,52 @@ def auto_pair(auto_pair_raw: dict) -> RenewalPair:
 @pytest.fixture
 def home_pair(home_pair_raw: dict) -> RenewalPair:
     return parse_pair(home_pair_raw)
+
+
+def _row(raw: dict) -> RenewalPairRow:
+    prior, renewal = raw["prior"], raw["renewal"]
+    return RenewalPairRow(
+        policy_number=prior["policy_number"],
+        policy_type=prior["policy_type"],
+        carrier_prior=prior["carrier"],
+        carrier_renewal=renewal["carrier"],
+        premium_prior=prior["premium"],
+        premium_renewal=renewal["premium"],
+        effective_date_prior=date.fromisoformat(prior["effective_date"]),
+        effective_date_renewal=date.fromisoformat(renewal["effective_date"]),
+        state=prior.get("state", "CA"),
+        account_id=prior.get("account_id", ""),
+        prior_json=prior,
+        renewal_json=renewal,
+    )
+
+
+class RenewalsDb:
+    # a sqlite raw_renewals table that settings.db_url points at
+    def __init__(self, url: str):
+        self.url = url
+        self._engine = create_engine(url)
+        Base.metadata.create_all(self._engine)
+
+    def add(self, *raws: dict) -> None:
+        with Session(self._engine) as session:
+            session.add_all([_row(raw) for raw in raws])
+            session.commit()
+
+    def delete(self, policy_number: str) -> None:
+        with Session(self._engine) as session:
+            session.execute(
+                delete(RenewalPairRow).where(RenewalPairRow.policy_number == policy_number)
+            )
+            session.commit()
+
+    def dispose(self) -> None:
+        self._engine.dispose()
+
+
+@pytest.fixture
+def db_source(tmp_path, monkeypatch):
+    db = RenewalsDb(f"sqlite:///{tmp_path / 'renewals.db'}")
+    monkeypatch.setattr(settings, "db_url", db.url)
+    yield db
+    db.dispose()
@@ -1,7 +1,11 @@
-from app.application.batch import assign_risk_level, process_batch, process_pair
+import threading
+
+from app.application.batch import assign_risk_level, process_batch, process_pair, stream_batch
 from app.domain.models.diff import DiffFlag
 from app.domain.models.policy import RenewalPair
-from app.domain.models.review import RiskLevel
+from app.domain.models.review import BatchSummary, RiskLevel
+
+TIMING_FIELDS = {"processing_time_ms", "stage_timings"}
 
 
 def test_process_pair_auto(auto_pair: RenewalPair):
@@ -11,6 +15,13 @@ def test_process_pair_auto(auto_pair: RenewalPair):
     assert len(result.diff.changes) > 0
 
 
+def test_process_pair_defers_pydantic_diff(auto_pair: RenewalPair):
+    result = process_pair(auto_pair)
+    assert "diff" not in result.__dict__
+    assert result.flags == result.diff.flags
+    assert result.model_dump()["diff"]["changes"]
+
+
 def test_process_pair_home(home_pair: RenewalPair):
     result = process_pair(home_pair)
     assert result.policy_number == "HOME-2024-001"
@@ -48,3 +59,94 @@ def test_process_batch(auto_pair: RenewalPair, home_pair: RenewalPair):
     )
     assert risk_total == 2
     assert summary.processing_time_ms > 0
+
+
+def test_process_batch_parallel_matches_sequential(auto_pair: RenewalPair, home_pair: RenewalPair):
+    pairs = [auto_pair, home_pair, auto_pair, home_pair]
+    seq_results, seq_summary = process_batch(pairs, workers=1)
+
+    progress: list[int] = []
+    par_results, par_summary = process_batch(
+        pairs, workers=2, chunk_size=1, on_progress=lambda done, total: progress.append(done)
+    )
+
+    assert [r.policy_number for r in par_results] == [r.policy_number for r in seq_results]
+    assert [r.risk_level for r in par_results] == [r.risk_level for r in seq_results]
+    assert all(r.pair is p for r, p in zip(par_results, pairs, strict=True))
+    assert par_summary.model_dump(exclude=TIMING_FIELDS) == seq_summary.model_dump(
+        exclude=TIMING_FIELDS
+    )
+    assert progress[-1] == len(pairs)
+
+
+def test_process_batch_incremental_carries_unchanged(
+    auto_pair: RenewalPair, home_pair: RenewalPair
+):
+    first, _ = process_batch([auto_pair, home_pair])
+    previous = {r.policy_number: r for r in first}
+
+    changed_home = home_pair.model_copy(deep=True)
+    changed_home.renewal.premium += 500
+    results, summary = process_batch([auto_pair, changed_home], previous=previous)
+
+    assert results[0] is previous["AUTO-2024-001"]
+    assert results[1] is not previous["HOME-2024-001"]
+    assert results[1].pair is changed_home
+    assert summary.total == 2
+    assert summary.carried_forward == 1
+
+
+def test_process_batch_incremental_reprocesses_on_rules_change(
+    auto_pair: RenewalPair, monkeypatch
+):
+    from app.config import RuleThresholds, settings
+
+    first, _ = process_batch([auto_pair])
+    previous = {r.policy_number: r for r in first}
+
+    monkeypatch.setattr(settings, "rules", RuleThresholds(premium_high_pct=5.0))
+    results, summary = process_batch([auto_pair], previous=previous)
+
+    assert results[0] is not first[0]
+    assert summary.carried_forward == 0
+
+
+def test_stream_batch_updates_summary_as_it_goes(auto_pair: RenewalPair, home_pair: RenewalPair):
+    summary = BatchSummary(total=0)
+    stream = stream_batch([auto_pair, home_pair], chunk_size=1, summary=summary)
+
+    first = next(stream)
+    assert first.policy_number == "AUTO-2024-001"
+    assert summary.total == 1
+
+    rest = list(stream)
+    assert [r.policy_number for r in rest] == ["HOME-2024-001"]
+    assert summary.total == 2
+    _, expected = process_batch([auto_pair, home_pair])
+    assert summary.model_dump(exclude=TIMING_FIELDS) == expected.model_dump(exclude=TIMING_FIELDS)
+
+
+def test_stream_batch_stops_between_chunks_when_cancelled(
+    auto_pair: RenewalPair, home_pair: RenewalPair
+):
+    cancel = threading.Event()
+    summary = BatchSummary(total=0)
+    stream = stream_batch(
+        [auto_pair, home_pair, auto_pair], chunk_size=1, summary=summary, cancel=cancel
+    )
+
+    next(stream)
+    cancel.set()
+    assert list(stream) == []
+    assert summary.total == 1
+
+
+def test_process_batch_reports_stage_timings(auto_pair: RenewalPair, home_pair: RenewalPair):
+    _, summary = process_batch([auto_pair, home_pair, auto_pair], chunk_size=2)
+    timings = summary.stage_timings
+    assert {"prepass", "diff", "notes", "flag"} <= timings.keys()
+    assert "llm_analysis" not in timings
+    assert timings["diff"].count == 3
+    assert timings["prepass"].count == 2
+    assert 0 <= timings["flag"].p50_ms <= timings["flag"].p99_ms
+    assert timings["flag"].total_ms >= timings["flag"].p99_ms
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from app.adaptor.persistence.book_cache import BookCache
+from app.adaptor.persistence.db_loader import DbDataSource
+from app.config import settings
+from app.infra import deps
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "book_cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(BookCache, "save_in_background", BookCache.save)
+    return tmp_path / "cache"
+
+
+def test_cache_round_trip(tmp_path, auto_pair, home_pair):
+    cache = BookCache(str(tmp_path), "book")
+    cache.save("k1", [auto_pair, home_pair])
+
+    loaded = cache.load("k1")
+    assert loaded == [auto_pair, home_pair]
+    assert loaded[0].prior.auto_coverages == auto_pair.prior.auto_coverages
+    assert cache.load("k2") is None
+
+
+def test_cache_disabled_without_dir(auto_pair):
+    cache = BookCache("", "book")
+    cache.save("k1", [auto_pair])
+    assert cache.load("k1") is None
+    assert cache.save_in_background("k1", [auto_pair]) is None
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    cache = BookCache(str(tmp_path), "book")
+    cache.save("k1", [])
+    (path,) = tmp_path.glob("*.pkl")
+    path.write_bytes(path.read_bytes()[:-2])
+    assert cache.load("k1") is None
+
+
+class _QueuedJobs:
+    # stands in for the job scheduler so a test can see the stale book before the rebuild
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, job_id, fn, total, priority=0, key=None):
+        self.jobs.append(fn)
+        return job_id
+
+    def run(self):
+        while self.jobs:
+            self.jobs.pop(0)({}, threading.Event())
+
+
+def test_db_source_cache_keyed_on_high_water_mark(
+    db_source, cache_dir, monkeypatch, auto_pair_raw, home_pair_raw
+):
+    scheduler = _QueuedJobs()
+    monkeypatch.setattr(deps, "get_job_scheduler", lambda: scheduler)
+    db_source.add(auto_pair_raw)
+    assert len(DbDataSource().load_pairs()) == 1
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+    assert len(DbDataSource().load_pairs()) == 1
+    assert not scheduler.jobs
+
+    db_source.add(home_pair_raw)
+    # the stale book is served while the rows are reparsed in the background
+    source = DbDataSource()
+    assert len(source.load_pairs()) == 1
+    assert len(scheduler.jobs) == 1
+    scheduler.run()
+    assert len(source.load_pairs()) == 2
+    assert source._book.generation == 2
+    # the rebuilt book is cached under the new high-water mark
+    assert len(DbDataSource().load_pairs()) == 2
+    assert not scheduler.jobs
@@ -0,0 +1,74 @@
+from app.config import settings
+from app.domain.models.diff import DiffFlag
+from app.domain.models.policy import AutoCoverages, Driver, RenewalPair
+from app.domain.services.book_rules import SCALAR_FLAGS, scalar_flags
+from app.domain.services.differ import compute_diff
+from app.domain.services.rules import flag_diff, rule_engine
+
+
+def _scalar_reference(pair: RenewalPair) -> set[DiffFlag]:
+    return set(rule_engine().pair_flags(pair)) - {DiffFlag.CARRIER_CHANGE}
+
+
+def _variants(auto_pair: RenewalPair, home_pair: RenewalPair) -> list[RenewalPair]:
+    pairs = [auto_pair, home_pair]
+    prior = auto_pair.prior.premium
+    for pct in (
+        -5.0,
+        0.0,
+        settings.rules.premium_high_pct,
+        settings.rules.premium_critical_pct,
+        settings.rules.premium_critical_pct - 0.01,
+    ):
+        p = auto_pair.model_copy(deep=True)
+        p.renewal.premium = prior * (1 + pct / 100)
+        pairs.append(p)
+
+    zero = auto_pair.model_copy(deep=True)
+    zero.prior.premium = 0
+    pairs.append(zero)
+
+    no_drivers = auto_pair.model_copy(deep=True)
+    no_drivers.renewal.drivers = []
+    pairs.append(no_drivers)
+
+    risky = auto_pair.model_copy(deep=True)
+    risky.renewal.drivers.append(
+        Driver(
+            license_number="X1",
+            name="Teen Driver",
+            age=settings.rules.youthful_operator_age - 1,
+            violations=2,
+            sr22=True,
+        )
+    )
+    pairs.append(risky)
+
+    for um in ("25/50", settings.rules.um_uim_min_limit, "250/500"):
+        p = auto_pair.model_copy(deep=True)
+        p.renewal.auto_coverages = (p.renewal.auto_coverages or AutoCoverages()).model_copy(
+            update={"uninsured_motorist": um}
+        )
+        pairs.append(p)
+    return pairs
+
+
+def test_scalar_flags_match_per_pair_rules(auto_pair: RenewalPair, home_pair: RenewalPair):
+    pairs = _variants(auto_pair, home_pair)
+    for pair, flags in zip(pairs, scalar_flags(pairs), strict=True):
+        assert set(flags) == _scalar_reference(pair)
+        assert set(flags) <= set(SCALAR_FLAGS)
+
+
+def test_scalar_flags_empty_book():
+    assert scalar_flags([]) == []
+
+
+def test_flag_diff_with_precomputed_flags(auto_pair: RenewalPair, home_pair: RenewalPair):
+    pairs = _variants(auto_pair, home_pair)
+    for pair, flags in zip(pairs, scalar_flags(pairs), strict=True):
+        diff = compute_diff(pair)
+        expected = flag_diff(diff, pair)
+        actual = flag_diff(diff, pair, pair_flags=flags)
+        assert set(actual.flags) == set(expected.flags)
+        assert actual.changes == expected.changes
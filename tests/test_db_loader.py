@@ -0,0 +1,109 @@
+import copy
+
+from app.adaptor.persistence.db_loader import DbDataSource
+from app.config import settings
+from app.domain.models.policy import PairQuery
+from app.domain.services.pair_query import apply_query
+from app.domain.services.parser import parse_pair
+
+
+def test_db_source_parses_json_columns(db_source, auto_pair_raw, home_pair_raw):
+    db_source.add(auto_pair_raw, home_pair_raw)
+    pairs = DbDataSource().load_pairs()
+    assert pairs == [parse_pair(auto_pair_raw), parse_pair(home_pair_raw)]
+
+
+def test_db_source_streams_in_fetch_batches(db_source, monkeypatch, auto_pair_raw, home_pair_raw):
+    db_source.add(auto_pair_raw, home_pair_raw, auto_pair_raw)
+    monkeypatch.setattr(settings, "db_fetch_size", 2)
+    source = DbDataSource()
+    streamed = [p.prior.policy_number for p in source.query_pairs(PairQuery())]
+    assert streamed == ["AUTO-2024-001", "HOME-2024-001"]
+    assert source._book is None
+    assert source.total_count() == 2
+
+
+def test_db_query_pushes_filters_and_sample(db_source, auto_pair_raw, home_pair_raw):
+    raws = [copy.deepcopy(raw) for raw in [auto_pair_raw, home_pair_raw] * 4]
+    for i, raw in enumerate(raws):
+        raw["prior"]["policy_number"] = raw["renewal"]["policy_number"] = f"POL-{i}"
+    db_source.add(*raws)
+
+    source = DbDataSource()
+    homes = source.query_pairs(PairQuery(policy_type="home"))
+    assert [p.prior.policy_type for p in homes] == ["home"] * 4
+
+    query = PairQuery(sample=3, seed=11)
+    sampled = source.query_pairs(query)
+    assert len(sampled) == 3
+    assert source._book is None
+    # same seed draws the same pairs from the in-memory book
+    assert apply_query(source.load_pairs(), query) == sampled
+
+
+def test_db_point_lookups_query_by_key(db_source, auto_pair_raw, home_pair_raw):
+    db_source.add(auto_pair_raw, home_pair_raw)
+    source = DbDataSource()
+    home_pn = home_pair_raw["prior"]["policy_number"]
+    assert source.get_pairs([home_pn, "MISSING"]) == [parse_pair(home_pair_raw)]
+    account_id = auto_pair_raw["prior"]["account_id"]
+    assert parse_pair(auto_pair_raw) in source.get_account(account_id)
+    assert source._book is None
+
+
+def test_db_source_lazy_book(db_source, monkeypatch, auto_pair_raw, home_pair_raw):
+    db_source.add(auto_pair_raw, home_pair_raw)
+    monkeypatch.setattr(settings, "lazy_pairs", True)
+    source = DbDataSource()
+    assert [h.policy_number for h in source.headers()] == ["AUTO-2024-001", "HOME-2024-001"]
+    assert source.load_pairs() == [parse_pair(auto_pair_raw), parse_pair(home_pair_raw)]
+
+
+def test_db_source_applies_new_rows_and_reloads_on_delete(
+    db_source, monkeypatch, auto_pair_raw, home_pair_raw
+):
+    db_source.add(auto_pair_raw)
+    monkeypatch.setattr(settings, "reload_check_seconds", 0)
+    source = DbDataSource()
+    assert source.total_count() == 1
+
+    db_source.add(home_pair_raw)
+    assert [p.prior.policy_number for p in source.load_pairs()] == [
+        "AUTO-2024-001",
+        "HOME-2024-001",
+    ]
+    assert source._book.generation == 2
+
+    db_source.delete("AUTO-2024-001")
+    assert [p.prior.policy_number for p in source.load_pairs()] == ["HOME-2024-001"]
+    assert source._book.generation == 3
+
+
+def test_db_duplicate_policy_latest_row_wins(db_source, monkeypatch, auto_pair_raw, home_pair_raw):
+    newer = copy.deepcopy(auto_pair_raw)
+    newer["renewal"]["premium"] = 9999.0
+    newer["prior"]["carrier"] = newer["renewal"]["carrier"] = "Newer Mutual"
+    db_source.add(auto_pair_raw, home_pair_raw)
+
+    monkeypatch.setattr(settings, "reload_check_seconds", 0)
+    refreshed = DbDataSource()
+    assert refreshed.total_count() == 2
+
+    db_source.add(newer)
+    expected = [parse_pair(newer), parse_pair(home_pair_raw)]
+    assert refreshed.load_pairs() == expected
+    assert refreshed._book.generation == 2
+    assert DbDataSource().load_pairs() == expected
+    assert DbDataSource().query_pairs(PairQuery()) == expected
+    assert DbDataSource().get_account(auto_pair_raw["prior"]["account_id"]) == [parse_pair(newer)]
+
+    # sampling draws from live rows only, in the order the book keeps
+    sampled = DbDataSource().query_pairs(PairQuery(sample=2, seed=3))
+    assert sorted(sampled, key=expected.index) == expected
+    query = PairQuery(sample=1, seed=3)
+    assert DbDataSource().query_pairs(query) == apply_query(expected, query)
+    # filters match the live row, not a superseded one
+    old_carrier = PairQuery(carrier=auto_pair_raw["renewal"]["carrier"])
+    assert auto_pair_raw["prior"]["policy_number"] not in {
+        p.prior.policy_number for p in DbDataSource().query_pairs(old_carrier)
+    }
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.adaptor.persistence.db_writer import DbResultWriter
+from app.application.batch import process_batch
+from app.config import settings
+from app.domain.models.policy import RenewalPair
+from app.infra.db import Base
+from app.infra.db_models import LLMResultRow, RuleResultRow
+
+
+@pytest.fixture
+def writer(monkeypatch) -> DbResultWriter:
+    monkeypatch.setattr(settings, "db_url", "sqlite://")
+    monkeypatch.setattr(settings.batch, "write_chunk_size", 3)
+    w = DbResultWriter()
+    Base.metadata.create_all(w._engine)
+    yield w
+    w.dispose()
+
+
+def _count(writer: DbResultWriter, model) -> int:
+    with Session(writer._engine) as session:
+        return session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_save_rule_results_bulk(writer, auto_pair: RenewalPair, home_pair: RenewalPair):
+    pairs = []
+    for i in range(7):
+        p = (auto_pair if i % 2 else home_pair).model_copy(deep=True)
+        p.prior.policy_number = f"BULK-{i:03d}"
+        pairs.append(p)
+    results, _ = process_batch(pairs)
+
+    writer.save_rule_results("job1", results)
+
+    assert _count(writer, RuleResultRow) == 7
+    with Session(writer._engine) as session:
+        row = session.execute(
+            select(RuleResultRow).where(RuleResultRow.policy_number == "BULK-003")
+        ).scalar_one()
+    assert row.job_id == "job1"
+    assert row.risk_level == results[3].risk_level.value
+    assert row.flags_json == [f.value for f in results[3].diff.flags]
+
+
+def test_save_llm_results_bulk(writer, auto_pair: RenewalPair):
+    results, _ = process_batch([auto_pair])
+    writer.save_llm_results("job1", results * 4)
+    writer.save_llm_results("job1", [])
+    assert _count(writer, LLMResultRow) == 4
@@ -5,15 +5,18 @@ from hypothesis import strategies as st
 
 from app.domain.models.policy import (
     AutoCoverages,
+    Driver,
     Endorsement,
     HomeCoverages,
     PolicySnapshot,
     RenewalPair,
     Vehicle,
 )
+from app.domain.services import differ
 from app.domain.services.differ import (
     compute_diff,
     diff_auto_coverages,
+    diff_drivers,
     diff_endorsements,
     diff_home_coverages,
     diff_vehicles,
@@ -118,6 +121,82 @@ def test_diff_endorsements_premium_change():
     assert any("endorsement_premium" in c.field for c in changes)
 
 
+def _auto_snapshot(**kwargs) -> PolicySnapshot:
+    return PolicySnapshot(
+        policy_number="T",
+        policy_type="auto",
+        carrier="X",
+        effective_date="2024-01-01",
+        expiration_date="2025-01-01",
+        premium=100,
+        **kwargs,
+    )
+
+
+def test_diff_drivers_attribute_change():
+    prior = _auto_snapshot(drivers=[Driver(license_number="D1", name="Ann", age=40)])
+    renewal = prior.model_copy(deep=True)
+    renewal.drivers[0].violations = 2
+    changes = diff_drivers(prior, renewal)
+    assert [(c.field, c.prior_value, c.renewal_value) for c in changes] == [
+        ("driver_violations_D1", "0", "2")
+    ]
+
+
+def test_diff_fleet_vehicles_keyed():
+    fleet = [Vehicle(vin=f"VIN{i:05d}", year=2020, make="Ford", model="F-150") for i in range(500)]
+    prior = _auto_snapshot(vehicles=fleet)
+    renewal = prior.model_copy(deep=True)
+    renewal.vehicles[250].usage = "business"
+    renewal.vehicles.pop(0)
+    renewal.vehicles.append(Vehicle(vin="VIN99999", year=2025, make="Ram", model="1500"))
+
+    fields = [c.field for c in diff_vehicles(prior, renewal)]
+    assert fields == ["vehicle_added", "vehicle_removed", "vehicle_usage_VIN00250"]
+
+
+def test_compute_diff_sees_in_place_edits(auto_pair_raw: dict):
+    raw = copy.deepcopy(auto_pair_raw)
+    raw["renewal"] = copy.deepcopy(raw["prior"])
+    pair = parse_pair(raw)
+    assert compute_diff(pair).changes == []
+
+    pair.renewal.drivers[0].violations += 1
+    pair.renewal.auto_coverages.bodily_injury_limit = "25/50"
+    fields = {c.field for c in compute_diff(pair).changes}
+    assert "bodily_injury_limit" in fields
+    assert any(f.startswith("driver_violations") for f in fields)
+
+
+def test_diff_changes_skips_equal_sections(auto_pair_raw: dict, monkeypatch):
+    raw = copy.deepcopy(auto_pair_raw)
+    raw["renewal"] = {**copy.deepcopy(raw["prior"]), "premium": raw["prior"]["premium"] * 2}
+    pair = parse_pair(raw)
+
+    def _fail(*args):
+        raise AssertionError("equal section was diffed")
+
+    for name in (
+        "diff_auto_coverages",
+        "diff_home_coverages",
+        "diff_vehicles",
+        "diff_drivers",
+        "diff_endorsements",
+    ):
+        monkeypatch.setattr(differ, name, _fail)
+    assert [c.field for c in compute_diff(pair).changes] == ["premium"]
+
+
+def test_diff_changes_sees_in_place_edits(auto_pair_raw: dict):
+    raw = copy.deepcopy(auto_pair_raw)
+    raw["renewal"] = copy.deepcopy(raw["prior"])
+    pair = parse_pair(raw)
+    pair.renewal.vehicles[0].usage = "business"
+    assert [c.field for c in compute_diff(pair).changes] == [
+        f"vehicle_usage_{pair.renewal.vehicles[0].vin}"
+    ]
+
+
 # --- Hypothesis property-based tests ---
 
 
@@ -0,0 +1,44 @@
+import json
+
+from app.domain.services.parser import parse_pair
+from data.generate import PROFILES, generate_book, iter_book, plan_book, write_shards
+
+
+def test_plan_book_default_mix():
+    plan = plan_book()
+    assert (plan.bundle, plan.auto_only, plan.home_only) == (1600, 3200, 1600)
+    assert plan.pairs == 8000
+
+
+def test_generate_book_numbering_is_unique():
+    pairs = generate_book(plan_book(40), seed=7)
+    numbers = [p["prior"]["policy_number"] for p in pairs]
+    assert len(numbers) == len(set(numbers)) == 50
+    bundle_accounts = {
+        p["prior"]["account_id"] for p in pairs if "HOME" in p["prior"]["policy_number"]
+    }
+    assert "ACCT-00000" in bundle_accounts
+
+
+def test_shards_do_not_depend_on_worker_count(tmp_path):
+    plan = plan_book(60)
+    write_shards(plan, tmp_path / "one", seed=3, shard_size=20, workers=1)
+    write_shards(plan, tmp_path / "two", seed=3, shard_size=20, workers=2)
+
+    one = sorted((tmp_path / "one").glob("*.jsonl"))
+    two = sorted((tmp_path / "two").glob("*.jsonl"))
+    assert len(one) > 1
+    assert [f.read_text() for f in one] == [f.read_text() for f in two]
+
+    lines = [json.loads(line) for f in one for line in f.read_text().splitlines()]
+    expected = [p for shard in iter_book(plan, seed=3, shard_size=20) for p in shard]
+    assert lines == expected
+
+
+def test_stress_profile_parses():
+    pairs = generate_book(plan_book(8), seed=1, profile=PROFILES["stress"])
+    parsed = [parse_pair(p) for p in pairs]
+    autos = [p for p in parsed if p.renewal.policy_type == "auto"]
+    assert autos
+    assert all(len(p.prior.vehicles) >= 8 for p in autos)
+    assert all(len(p.prior.endorsements) >= 15 for p in parsed)
@@ -0,0 +1,92 @@
+import threading
+
+from app.adaptor.storage.memory import InMemoryJobStore
+from app.application.job_scheduler import JobScheduler
+from app.domain.models.enums import JobStatus
+
+
+def _blocking_job(gate: threading.Event, order: list[str], name: str):
+    def fn(job: dict, cancel: threading.Event) -> None:
+        order.append(name)
+        while not gate.wait(0.01):
+            if cancel.is_set():
+                return
+
+    return fn
+
+
+def _wait_done(jobs: InMemoryJobStore, *job_ids: str) -> None:
+    done = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+    for _ in range(500):
+        if all(jobs.get(j)["status"] in done for j in job_ids):
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+def test_queue_priority_and_position():
+    jobs = InMemoryJobStore()
+    scheduler = JobScheduler(jobs, max_concurrent=1)
+    gate, order = threading.Event(), []
+
+    scheduler.submit("a", _blocking_job(gate, order, "a"), total=1)
+    scheduler.submit("b", _blocking_job(gate, order, "b"), total=1)
+    scheduler.submit("c", _blocking_job(gate, order, "c"), total=1, priority=5)
+
+    assert jobs.get("a")["status"] == JobStatus.RUNNING
+    assert jobs.get("b")["status"] == JobStatus.PENDING
+    assert scheduler.queue_position("a") is None
+    assert scheduler.queue_position("c") == 1
+    assert scheduler.queue_position("b") == 2
+
+    gate.set()
+    _wait_done(jobs, "a", "b", "c")
+    assert order == ["a", "c", "b"]
+    assert jobs.get("b")["status"] == JobStatus.COMPLETED
+
+
+def test_duplicate_pending_job_is_merged():
+    jobs = InMemoryJobStore()
+    scheduler = JobScheduler(jobs, max_concurrent=1)
+    gate, order = threading.Event(), []
+
+    scheduler.submit("a", _blocking_job(gate, order, "a"), total=1, key="full")
+    first = scheduler.submit("b", _blocking_job(gate, order, "b"), total=1, key="full")
+    second = scheduler.submit("c", _blocking_job(gate, order, "c"), total=1, key="full")
+
+    # "a" already started, so only the queued "b" absorbs the duplicate
+    assert first == second == "b"
+    assert jobs.get("c") is None
+    gate.set()
+    _wait_done(jobs, "a", "b")
+    assert order == ["a", "b"]
+
+
+def test_cancel_pending_and_running():
+    jobs = InMemoryJobStore()
+    scheduler = JobScheduler(jobs, max_concurrent=1)
+    gate, order = threading.Event(), []
+
+    scheduler.submit("a", _blocking_job(gate, order, "a"), total=1)
+    scheduler.submit("b", _blocking_job(gate, order, "b"), total=1)
+
+    assert scheduler.cancel("b")
+    assert jobs.get("b")["status"] == JobStatus.CANCELLED
+    assert scheduler.cancel("a")
+    _wait_done(jobs, "a")
+    assert jobs.get("a")["status"] == JobStatus.CANCELLED
+    assert order == ["a"]
+    assert not scheduler.cancel("a")
+
+
+def test_failed_job_records_error():
+    jobs = InMemoryJobStore()
+    scheduler = JobScheduler(jobs, max_concurrent=2)
+
+    def boom(job: dict, cancel: threading.Event) -> None:
+        raise RuntimeError("boom")
+
+    scheduler.submit("x", boom, total=0)
+    _wait_done(jobs, "x")
+    assert jobs.get("x")["status"] == JobStatus.FAILED
+    assert jobs.get("x")["error"] == "boom"
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from app.adaptor.persistence import json_loader
+from app.adaptor.persistence.json_loader import JsonDataSource, iter_records
+from app.config import settings
+
+
+@pytest.fixture
+def raw_pairs(auto_pair_raw: dict, home_pair_raw: dict) -> list[dict]:
+    return [auto_pair_raw, home_pair_raw, auto_pair_raw]
+
+
+def test_iter_records_json_array_small_buffer(tmp_path, monkeypatch, raw_pairs):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps(raw_pairs, indent=2))
+    monkeypatch.setattr(json_loader, "READ_CHUNK_CHARS", 64)
+    assert list(iter_records(path)) == raw_pairs
+
+
+def test_iter_records_empty_array(tmp_path):
+    path = tmp_path / "renewals.json"
+    path.write_text("[ ]")
+    assert list(iter_records(path)) == []
+
+
+def test_iter_records_truncated_array(tmp_path, raw_pairs):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps(raw_pairs)[:-1])
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_records(path))
+
+
+def test_iter_records_jsonl_and_shards(tmp_path, raw_pairs):
+    shards = tmp_path / "renewals"
+    shards.mkdir()
+    (shards / "renewals-00001.jsonl").write_text(json.dumps(raw_pairs[2]) + "\n")
+    (shards / "renewals-00000.jsonl").write_text(
+        "\n".join(json.dumps(r) for r in raw_pairs[:2]) + "\n\n"
+    )
+    assert list(iter_records(shards)) == raw_pairs
+    assert list(iter_records(shards / "renewals-00000.jsonl")) == raw_pairs[:2]
+
+
+def test_data_source_streams_then_caches(tmp_path, monkeypatch, raw_pairs):
+    path = tmp_path / "renewals.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in raw_pairs))
+    monkeypatch.setattr(settings, "data_path", str(path))
+
+    source = JsonDataSource()
+    streamed = [p.prior.policy_number for p in source.iter_pairs()]
+    assert streamed == ["AUTO-2024-001", "HOME-2024-001", "AUTO-2024-001"]
+    assert source._book is None
+
+    assert source.total_count() == 3
+    assert [p.prior.policy_number for p in source.iter_pairs()] == streamed
+
+
+def _numbers(source: JsonDataSource) -> list[str]:
+    return [p.prior.policy_number for p in source.load_pairs()]
+
+
+def test_jsonl_append_parses_only_new_lines(tmp_path, monkeypatch, auto_pair_raw, home_pair_raw):
+    path = tmp_path / "renewals.jsonl"
+    path.write_text(json.dumps(auto_pair_raw) + "\n")
+    monkeypatch.setattr(settings, "data_path", str(path))
+    monkeypatch.setattr(settings, "reload_check_seconds", 0)
+    source = JsonDataSource()
+    assert _numbers(source) == ["AUTO-2024-001"]
+
+    parsed = []
+    parse = json_loader.parse_pair_json
+    monkeypatch.setattr(json_loader, "parse_pair_json", lambda raw: parsed.append(1) or parse(raw))
+    with path.open("a") as f:
+        f.write(json.dumps(home_pair_raw) + "\n")
+    assert _numbers(source) == ["AUTO-2024-001", "HOME-2024-001"]
+    assert len(parsed) == 1
+    assert source._book.generation == 2
+
+
+def test_json_rewrite_replaces_and_drops(tmp_path, monkeypatch, auto_pair_raw, home_pair_raw):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps([auto_pair_raw, home_pair_raw]))
+    monkeypatch.setattr(settings, "data_path", str(path))
+    monkeypatch.setattr(settings, "reload_check_seconds", 0)
+    source = JsonDataSource()
+    assert _numbers(source) == ["AUTO-2024-001", "HOME-2024-001"]
+
+    renewal = dict(home_pair_raw["renewal"], premium=9999.0)
+    path.write_text(json.dumps([dict(home_pair_raw, renewal=renewal)]))
+    (pair,) = source.load_pairs()
+    assert pair.renewal.premium == 9999.0
+
+
+def test_reload_disabled_keeps_generation(tmp_path, monkeypatch, auto_pair_raw, home_pair_raw):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps([auto_pair_raw]))
+    monkeypatch.setattr(settings, "data_path", str(path))
+    monkeypatch.setattr(settings, "reload_check_seconds", -1)
+    source = JsonDataSource()
+    assert source.total_count() == 1
+    path.write_text(json.dumps([auto_pair_raw, home_pair_raw]))
+    assert source.total_count() == 1
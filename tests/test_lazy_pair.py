@@ -0,0 +1,71 @@
+import json
+
+from app.adaptor.persistence.json_loader import JsonDataSource
+from app.adaptor.persistence.lazy_pair import LazyPair
+from app.adaptor.persistence.pair_book import PairBook
+from app.application.batch import process_batch
+from app.config import settings
+from app.domain.models.policy import PairHeader, PairQuery
+from app.domain.models.review import ReviewResult
+from app.domain.services.parser import parse_pair
+
+
+def test_header_matches_full_pair(auto_pair_raw):
+    lazy = LazyPair.from_json(json.dumps(auto_pair_raw))
+    pair = parse_pair(auto_pair_raw)
+    assert lazy.header == PairHeader.from_pair(pair)
+    assert lazy.materialize() == pair
+
+
+def test_book_caps_materialized_pairs(auto_pair_raw, home_pair_raw):
+    raws = [auto_pair_raw, home_pair_raw]
+    book = PairBook([LazyPair.from_json(json.dumps(r)) for r in raws], max_materialized=1)
+    auto_pn = auto_pair_raw["prior"]["policy_number"]
+
+    first = book.get_pairs([auto_pn])[0]
+    assert book.get_pairs([auto_pn])[0] is first
+    assert book.pairs() == [parse_pair(r) for r in raws]
+    assert len(book._materialized) == 1
+    assert book.get_pairs([auto_pn])[0] is not first
+
+
+def test_book_query_filters_on_headers(auto_pair_raw, home_pair_raw):
+    book = PairBook([LazyPair.from_json(json.dumps(r)) for r in [auto_pair_raw, home_pair_raw]])
+    homes = book.query(PairQuery(policy_type="home"))
+    assert homes == [parse_pair(home_pair_raw)]
+    assert [h.policy_type for h in book.headers()] == ["auto", "home"]
+
+
+def test_lazy_json_source_matches_eager(tmp_path, monkeypatch, auto_pair_raw, home_pair_raw):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps([auto_pair_raw, home_pair_raw]))
+    monkeypatch.setattr(settings, "data_path", str(path))
+    eager = JsonDataSource()
+    assert eager.total_count() == 2
+
+    monkeypatch.setattr(settings, "lazy_pairs", True)
+    lazy = JsonDataSource()
+    assert isinstance(lazy._get_book().entries[0], LazyPair)
+    assert lazy.headers() == eager.headers()
+    assert lazy.load_pairs() == eager.load_pairs()
+    assert list(lazy.iter_pairs()) == eager.load_pairs()
+
+
+def test_batch_results_keep_entries_not_pairs(auto_pair_raw, home_pair_raw):
+    entries = [LazyPair.from_json(json.dumps(r)) for r in [auto_pair_raw, home_pair_raw]]
+    eager, _ = process_batch([e.materialize() for e in entries], workers=1)
+    for workers in (1, 2):
+        results, _ = process_batch(entries, workers=workers, chunk_size=1)
+        for entry, r, expected in zip(entries, results, eager, strict=True):
+            assert "pair" not in r.__dict__
+            assert r.header == entry.header
+            assert r.pair == entry.materialize()
+            assert r.model_dump_json() == expected.model_dump_json()
+            assert "pair" not in r.__dict__
+            assert r == expected
+
+    # an assigned pair replaces the entry
+    r = results[0]
+    r.pair = None
+    assert r.pair is None and r.header is None
+    assert list(r.model_dump()) == list(ReviewResult.model_fields)
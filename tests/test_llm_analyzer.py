@@ -138,3 +138,52 @@ def test_generate_summary_malformed_response(home_pair: RenewalPair):
     result.pair = home_pair
     summary = generate_summary(MalformedClient(), result)
     assert summary is None
+
+
+def test_process_batch_llm_stage_matches_process_pair(
+    auto_pair: RenewalPair, home_pair: RenewalPair
+):
+    from app.application.batch import process_batch
+
+    pairs = [auto_pair, home_pair]
+    expected = [process_pair(p, llm_client=MockLLMClient()) for p in pairs]
+    results, summary = process_batch(pairs, llm_client=MockLLMClient())
+
+    assert [r.risk_level for r in results] == [r.risk_level for r in expected]
+    assert [r.summary for r in results] == [r.summary for r in expected]
+    assert [len(r.llm_insights) for r in results] == [len(r.llm_insights) for r in expected]
+    assert summary.llm_analyzed == sum(1 for r in expected if r.llm_insights)
+    assert summary.stage_timings["llm_summary"].count == sum(1 for r in results if r.diff.flags)
+    assert summary.stage_timings["llm_analysis"].count == summary.llm_analyzed
+
+
+def test_llm_stage_respects_max_in_flight(home_pair: RenewalPair):
+    import threading
+    import time
+
+    from app.application.llm_stage import run_llm_stage
+
+    class SlowClient(MockLLMClient):
+        def __init__(self):
+            super().__init__()
+            self._lock = threading.Lock()
+            self.in_flight = 0
+            self.peak = 0
+
+        def complete(self, prompt: str, trace_name: str) -> dict:
+            with self._lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(0.02)
+            with self._lock:
+                self.in_flight -= 1
+            return super().complete(prompt, trace_name)
+
+    client = SlowClient()
+    results = [process_pair(home_pair) for _ in range(6)]
+    progress: list[int] = []
+    run_llm_stage(results, client, max_in_flight=3, on_progress=lambda d, t: progress.append(d))
+
+    assert 1 < client.peak <= 3
+    assert all(r.llm_summary_generated for r in results)
+    assert progress[-1] == len(results)
@@ -1,6 +1,6 @@
-from app.domain.models.diff import DiffFlag, DiffResult, FieldChange
-from app.domain.models.policy import PolicyType, RenewalPair
-from app.domain.models.review import BatchSummary, RiskLevel
+from app.domain.models.diff import ChangeRecord, DiffFlag, DiffResult, FieldChange
+from app.domain.models.policy import AutoCoverages, PolicyType, RenewalPair, split_limit
+from app.domain.models.review import BatchSummary, ReviewResult, RiskLevel
 
 
 def test_auto_pair_structure(auto_pair: RenewalPair):
@@ -37,6 +37,59 @@ def test_diff_result_with_flags():
     assert result.changes[0].change_pct == 13.0
 
 
+def test_diff_result_from_records_matches_validated():
+    record = ChangeRecord("premium", "1200", "1356", 13.0, DiffFlag.PREMIUM_INCREASE_HIGH)
+    built = DiffResult.from_records("TEST-001", [record], [DiffFlag.PREMIUM_INCREASE_HIGH])
+    validated = DiffResult(
+        policy_number="TEST-001",
+        changes=[record.to_field_change().model_dump()],
+        flags=["premium_increase_high"],
+    )
+    assert built == validated
+    assert built.model_dump_json() == validated.model_dump_json()
+    assert ChangeRecord.from_field_change(built.changes[0]) == record
+
+    other = DiffResult.from_records("TEST-002", [record])
+    assert built.model_fields_set is not other.model_fields_set
+    assert built.changes[0].model_fields_set is not other.changes[0].model_fields_set
+
+
+def test_review_result_builds_diff_on_first_read():
+    record = ChangeRecord("premium", "1200", "1356", 13.0, DiffFlag.PREMIUM_INCREASE_HIGH)
+    flags = [DiffFlag.PREMIUM_INCREASE_HIGH]
+    lazy = ReviewResult.from_records("TEST-001", RiskLevel.ACTION_REQUIRED, [record], flags)
+    eager = ReviewResult(
+        policy_number="TEST-001",
+        risk_level=RiskLevel.ACTION_REQUIRED,
+        diff=DiffResult.from_records("TEST-001", [record], flags),
+    )
+    assert lazy.flags == flags
+    assert lazy.export_diff() == eager.diff
+    assert "diff" not in lazy.__dict__
+
+    assert lazy.model_dump_json() == eager.model_dump_json()
+    assert lazy.model_fields_set == {"policy_number", "risk_level", "diff"}
+    assert lazy.diff is lazy.diff
+    assert lazy == eager
+    assert ReviewResult.from_records("TEST-002", RiskLevel.NO_ACTION_NEEDED, [], []).quotes == []
+
+
+def test_review_result_assigned_diff_replaces_pending():
+    flags = [DiffFlag.PREMIUM_INCREASE_HIGH]
+    lazy = ReviewResult.from_records("P1", RiskLevel.ACTION_REQUIRED, [], flags)
+    lazy.diff = DiffResult(policy_number="P1", flags=[])
+    assert lazy.flags == []
+    assert lazy.export_diff().flags == []
+    dumped = lazy.model_dump()
+    assert dumped["diff"]["flags"] == []
+    assert list(dumped)[:3] == ["policy_number", "risk_level", "diff"]
+    assert lazy == ReviewResult(
+        policy_number="P1",
+        risk_level=RiskLevel.ACTION_REQUIRED,
+        diff=DiffResult(policy_number="P1", flags=[]),
+    )
+
+
 def test_risk_level_ordering():
     levels = [
         RiskLevel.NO_ACTION_NEEDED,
@@ -51,3 +104,15 @@ def test_batch_summary_defaults():
     summary = BatchSummary(total=100)
     assert summary.no_action_needed == 0
     assert summary.llm_analyzed == 0
+
+
+def test_auto_coverages_numeric_limits():
+    cov = AutoCoverages(bodily_injury_limit="250/500", property_damage_limit="1,000")
+    assert cov.bodily_injury_limits == (250.0, 500.0)
+    assert cov.property_damage_limits == (1000.0,)
+    assert cov.uninsured_motorist_limits == (100.0, 300.0)
+    assert "bodily_injury_limits" not in cov.model_dump()
+
+    edited = cov.model_copy(update={"bodily_injury_limit": "50/100"})
+    assert edited.bodily_injury_limits == (50.0, 100.0)
+    assert split_limit("50/100") is split_limit("50/100")
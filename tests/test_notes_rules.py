@@ -1,6 +1,10 @@
 from app.config import NotesKeywords
 from app.domain.models.diff import DiffFlag
-from app.domain.services.notes_rules import flag_notes_keywords
+from app.domain.services.notes_rules import (
+    flag_notes_batch,
+    flag_notes_keywords,
+    keyword_automaton,
+)
 
 
 def test_empty_notes():
@@ -54,3 +58,41 @@ def test_custom_keywords_config():
     flags = flag_notes_keywords("Found custom_keyword in text", keywords_config=cfg)
     assert DiffFlag.CLAIMS_HISTORY in flags
     assert len(flags) == 1
+
+
+def test_overlapping_keywords_across_categories():
+    cfg = NotesKeywords(
+        claims_history=["he"],
+        property_risk=["she"],
+        regulatory=["hers"],
+        driver_risk=["his"],
+    )
+    assert flag_notes_keywords("ushers", keywords_config=cfg) == [
+        DiffFlag.CLAIMS_HISTORY,
+        DiffFlag.PROPERTY_RISK,
+        DiffFlag.REGULATORY,
+    ]
+
+
+def test_whole_words():
+    cfg = NotesKeywords(claims_history=["claim"], whole_words=True)
+    assert flag_notes_keywords("see disclaimer", keywords_config=cfg) == []
+    assert DiffFlag.CLAIMS_HISTORY in flag_notes_keywords("claim, filed", keywords_config=cfg)
+    assert DiffFlag.DRIVER_RISK_NOTE in flag_notes_keywords("AT-FAULT loss", keywords_config=cfg)
+
+
+def test_blank_keywords_ignored():
+    cfg = NotesKeywords(claims_history=["", "  ", "claim"], property_risk=[""])
+    assert flag_notes_keywords("nothing here", keywords_config=cfg) == []
+    assert flag_notes_keywords("claim filed", keywords_config=cfg) == [DiffFlag.CLAIMS_HISTORY]
+
+
+def test_automaton_cached_per_config():
+    cfg = NotesKeywords()
+    assert keyword_automaton(cfg) is keyword_automaton(cfg)
+    assert keyword_automaton(NotesKeywords()) is not keyword_automaton(cfg)
+
+
+def test_flag_notes_batch_matches_single():
+    notes = ["", "Prior claim filed", "Roof and DUI", "Prior claim filed", "nothing here"]
+    assert flag_notes_batch(notes) == [flag_notes_keywords(n) for n in notes]
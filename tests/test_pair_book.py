@@ -0,0 +1,51 @@
+import json
+
+from app.adaptor.persistence.json_loader import JsonDataSource
+from app.adaptor.persistence.pair_book import PairBook
+from app.config import settings
+
+
+def test_get_pairs_keeps_request_order(auto_pair, home_pair):
+    book = PairBook([auto_pair, home_pair])
+    numbers = [home_pair.prior.policy_number, "MISSING", auto_pair.prior.policy_number]
+    assert book.get_pairs(numbers) == [home_pair, auto_pair]
+    assert book.get_pairs([auto_pair.prior.policy_number] * 2) == [auto_pair]
+
+
+def test_get_account(auto_pair, home_pair):
+    home = home_pair.model_copy(
+        update={"prior": home_pair.prior.model_copy(update={"account_id": "ACC-1"})}
+    )
+    auto = auto_pair.model_copy(
+        update={"prior": auto_pair.prior.model_copy(update={"account_id": "ACC-1"})}
+    )
+    book = PairBook([auto, home])
+    assert book.get_account("ACC-1") == [auto, home]
+    assert book.get_account("ACC-2") == []
+
+
+def test_index_rebuilt_after_invalidate(tmp_path, monkeypatch, auto_pair_raw, home_pair_raw):
+    path = tmp_path / "renewals.json"
+    path.write_text(json.dumps([auto_pair_raw]))
+    monkeypatch.setattr(settings, "data_path", str(path))
+    source = JsonDataSource()
+    home_pn = home_pair_raw["prior"]["policy_number"]
+    assert source.get_pairs([home_pn]) == []
+
+    path.write_text(json.dumps([auto_pair_raw, home_pair_raw]))
+    source.invalidate_cache()
+    assert [p.prior.policy_number for p in source.get_pairs([home_pn])] == [home_pn]
+
+
+def test_apply_delta_publishes_new_generation(auto_pair, home_pair):
+    book = PairBook([auto_pair])
+    changed = auto_pair.model_copy(
+        update={"renewal": auto_pair.renewal.model_copy(update={"premium": 1.0})}
+    )
+    newer = book.apply_delta([changed, home_pair])
+    assert newer.generation == 2
+    assert newer.pairs() == [changed, home_pair]
+    assert book.pairs() == [auto_pair]
+
+    dropped = newer.apply_delta([], deletes=[auto_pair.prior.policy_number])
+    assert dropped.pairs() == [home_pair]
@@ -0,0 +1,47 @@
+from datetime import date
+
+from app.domain.models.policy import PairQuery, PolicyType
+from app.domain.services.pair_query import apply_query, draw_sample, has_filters, matches
+
+
+def test_query_normalizes_inputs():
+    query = PairQuery(policy_type="AUTO", state=" ca ", carrier=" Acme ")
+    assert query.policy_type == PolicyType.AUTO
+    assert query.state == "CA"
+    assert query.carrier == "Acme"
+
+
+def test_has_filters():
+    assert not has_filters(PairQuery(sample=10, seed=1))
+    assert has_filters(PairQuery(state="CA"))
+
+
+def test_matches_each_field(auto_pair):
+    prior = auto_pair.prior
+    assert matches(auto_pair, PairQuery())
+    assert matches(auto_pair, PairQuery(policy_type="auto", state=prior.state))
+    assert not matches(auto_pair, PairQuery(policy_type="home"))
+    assert not matches(auto_pair, PairQuery(account_id="OTHER"))
+    assert matches(auto_pair, PairQuery(carrier=auto_pair.renewal.carrier))
+    assert not matches(auto_pair, PairQuery(carrier="Nobody Mutual"))
+
+
+def test_matches_effective_window(auto_pair):
+    effective = auto_pair.renewal.effective_date
+    assert matches(auto_pair, PairQuery(effective_from=effective, effective_to=effective))
+    assert not matches(auto_pair, PairQuery(effective_from=date(effective.year + 1, 1, 1)))
+    assert not matches(auto_pair, PairQuery(effective_to=date(effective.year - 1, 1, 1)))
+
+
+def test_draw_sample_is_seeded():
+    items = list(range(100))
+    first = draw_sample(items, PairQuery(sample=5, seed=3))
+    assert len(first) == 5
+    assert draw_sample(items, PairQuery(sample=5, seed=3)) == first
+    assert draw_sample(items, PairQuery(sample=500)) == items
+
+
+def test_apply_query_filters_before_sampling(auto_pair, home_pair):
+    pairs = [auto_pair, home_pair] * 3
+    picked = apply_query(pairs, PairQuery(policy_type="home", sample=2, seed=0))
+    assert picked == [home_pair, home_pair]
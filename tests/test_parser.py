@@ -1,5 +1,13 @@
+import copy
+import json
+
 from app.domain.models.policy import PolicyType, RenewalPair
-from app.domain.services.parser import parse_pair, parse_snapshot
+from app.domain.services.parser import (
+    parse_pair,
+    parse_pair_json,
+    parse_pairs_json,
+    parse_snapshot,
+)
 
 
 def test_parse_auto_snapshot(auto_pair_raw: dict):
@@ -76,3 +84,38 @@ def test_parse_missing_insured_name():
     snap = parse_snapshot(raw)
     assert snap.insured_name == ""
     assert snap.account_id == ""
+
+
+def _messy(raw: dict) -> dict:
+    raw = copy.deepcopy(raw)
+    for side in ("prior", "renewal"):
+        snap = raw[side]
+        snap["policy_type"] = snap["policy_type"].upper()
+        snap["carrier"] = f"  {snap['carrier']} "
+        snap["effective_date"] = snap["effective_date"].replace("-", "/")
+        snap["state"] = " ca"
+        for v in snap.get("vehicles", []):
+            v["vin"] = f" {v['vin'].lower()} "
+            v["year"] = str(v["year"])
+        for e in snap.get("endorsements", []):
+            e["code"] = e["code"].lower()
+        if "auto_coverages" in snap:
+            snap["auto_coverages"]["property_damage_limit"] = 100
+        if "home_coverages" in snap:
+            snap["home_coverages"]["wind_hail_deductible"] = 0
+        # coverages for the other line of business are ignored
+        snap["home_coverages" if "auto_coverages" in snap else "auto_coverages"] = {}
+    return raw
+
+
+def test_json_fast_path_matches_parse_pair(auto_pair_raw: dict, home_pair_raw: dict):
+    for raw in (auto_pair_raw, home_pair_raw, _messy(auto_pair_raw), _messy(home_pair_raw)):
+        assert parse_pair_json(json.dumps(raw)) == parse_pair(raw)
+
+
+def test_json_fast_path_list(auto_pair_raw: dict, home_pair_raw: dict):
+    raws = [_messy(auto_pair_raw), home_pair_raw]
+    pairs = parse_pairs_json(json.dumps(raws).encode())
+    assert pairs == [parse_pair(r) for r in raws]
+    assert pairs[0].prior.state == "CA"
+    assert pairs[0].prior.vehicles[0].vin == pairs[0].prior.vehicles[0].vin.strip().upper()
@@ -1,5 +1,14 @@
+import threading
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.adaptor.persistence.noop_writer import NoopResultWriter
+from app.adaptor.storage.memory import InMemoryReviewStore
+from app.api.batch import _replace_store
+from app.application.batch import process_batch
+from app.config import settings
+from app.domain.models.policy import RenewalPair
 from app.main import app
 
 client = TestClient(app)
@@ -26,3 +35,82 @@ def test_batch_run_returns_job_id():
 def test_batch_job_status_not_found():
     resp = client.get("/batch/status/nonexistent")
     assert resp.status_code == 404
+
+
+def test_batch_cancel_not_found():
+    resp = client.post("/batch/cancel/nonexistent")
+    assert resp.status_code == 404
+
+
+def test_batch_run_filters_by_policy_type():
+    resp = client.post("/batch/run?policy_type=home&sample=3&seed=7")
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 3
+
+
+def test_batch_run_filter_without_matches():
+    resp = client.post("/batch/run?account_id=NO-SUCH-ACCOUNT")
+    assert resp.status_code == 404
+
+
+def test_review_selected_unknown_policies():
+    resp = client.post("/batch/review-selected", json={"policy_numbers": ["NONEXISTENT-999"]})
+    assert resp.status_code == 404
+
+
+def test_rule_stats():
+    resp = client.get("/rules/stats")
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert {s["rule"] for s in stats} >= {"liability_limit_decrease", "carrier_change"}
+    assert [s["total_ms"] for s in stats] == sorted((s["total_ms"] for s in stats), reverse=True)
+    assert client.delete("/rules/stats").status_code == 204
+
+
+def test_rule_simulate_validates_limit():
+    resp = client.post("/rules/simulate", json={"um_uim_min_limit": "fifty"})
+    assert resp.status_code == 422
+
+
+def _stored_results(auto_pair: RenewalPair, home_pair: RenewalPair):
+    store = InMemoryReviewStore()
+    results, _ = process_batch([auto_pair, home_pair])
+    for r in results:
+        store[r.policy_number] = r
+    return store, results
+
+
+def test_failed_run_keeps_last_complete_results(auto_pair: RenewalPair, home_pair: RenewalPair):
+    class FailingWriter(NoopResultWriter):
+        def save_rule_results(self, job_id, results):
+            raise RuntimeError("db down")
+
+    store, results = _stored_results(auto_pair, home_pair)
+    with pytest.raises(RuntimeError):
+        _replace_store("job", {}, [auto_pair], store, FailingWriter())
+    assert store.values() == results
+
+    _replace_store("job", {}, [auto_pair], store, NoopResultWriter())
+    assert [r.policy_number for r in store.values()] == [auto_pair.prior.policy_number]
+
+
+def test_cancelled_run_keeps_last_complete_results(
+    auto_pair: RenewalPair, home_pair: RenewalPair, monkeypatch
+):
+    monkeypatch.setattr(settings.batch, "publish_size", 1)
+    cancel = threading.Event()
+
+    class CancellingWriter(NoopResultWriter):
+        # the user cancels as soon as the first results are published
+        def save_rule_results(self, job_id, results):
+            cancel.set()
+
+    store, results = _stored_results(auto_pair, home_pair)
+    previous = {r.policy_number: r for r in results}
+    pairs = [home_pair, auto_pair, home_pair, auto_pair]
+    job: dict = {}
+    _replace_store("job", job, pairs, store, CancellingWriter(), previous, cancel)
+
+    assert cancel.is_set()
+    assert job["summary"]["total"] < len(pairs)
+    assert store.values() == results
@@ -0,0 +1,87 @@
+import pytest
+
+from app.adaptor.storage.memory import InMemoryReviewStore
+from app.application.batch import process_batch, risk_distribution
+from app.application.rule_simulation import build_baseline, risk_baseline, simulate
+from app.config import RuleThresholds, settings
+from app.domain.models.policy import Driver, RenewalPair
+
+
+def _book(auto_pair: RenewalPair, home_pair: RenewalPair) -> list[RenewalPair]:
+    pairs = []
+    for pct in (-5.0, 0.0, 8.0, 12.0, 18.0, 25.0):
+        p = auto_pair.model_copy(deep=True)
+        p.renewal.premium = p.prior.premium * (1 + pct / 100)
+        pairs.append(p)
+    for age in (19, 23, 30):
+        p = auto_pair.model_copy(deep=True)
+        p.renewal.drivers.append(Driver(license_number="Y1", name="Young Driver", age=age))
+        pairs.append(p)
+    for um in ("25/50", "50/100", "100/300"):
+        p = auto_pair.model_copy(deep=True)
+        p.renewal.auto_coverages = p.renewal.auto_coverages.model_copy(
+            update={"uninsured_motorist": um}
+        )
+        pairs.append(p)
+    pairs.append(home_pair.model_copy(deep=True))
+    for i, p in enumerate(pairs):
+        p.prior.policy_number = p.renewal.policy_number = f"SIM-{i:03d}"
+    return pairs
+
+
+def _levels(pairs: list[RenewalPair]) -> dict[str, str]:
+    results, _ = process_batch(pairs, workers=1)
+    return {r.policy_number: r.risk_level for r in results}
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"premium_high_pct": 5.0},
+        {"premium_critical_pct": 15.0},
+        {"premium_high_pct": 30.0, "premium_critical_pct": 40.0},
+        {"youthful_operator_age": 21},
+        {"um_uim_min_limit": "100/300"},
+    ],
+)
+def test_simulation_matches_rerun(
+    auto_pair: RenewalPair, home_pair: RenewalPair, monkeypatch, update: dict
+):
+    pairs = _book(auto_pair, home_pair)
+    results, _ = process_batch(pairs, workers=1)
+    current = settings.rules
+    candidate = current.model_copy(update=update)
+
+    sim = simulate(build_baseline(results), current, candidate)
+    assert sim.total == len(pairs)
+    assert sim.current == risk_distribution(results)
+
+    before = {r.policy_number: r.risk_level for r in results}
+    monkeypatch.setattr(settings, "rules", candidate)
+    after = _levels(pairs)
+    expected = {pn for pn in before if before[pn] != after[pn]}
+    assert {c.policy_number for c in sim.changed} == expected
+    assert all(c.simulated == after[c.policy_number] for c in sim.changed)
+    assert sim.changed_total == len(expected)
+
+
+def test_simulation_unchanged_and_limited(auto_pair: RenewalPair, home_pair: RenewalPair):
+    results, _ = process_batch(_book(auto_pair, home_pair), workers=1)
+    baseline = build_baseline(results)
+    assert simulate(baseline, settings.rules, settings.rules).changed_total == 0
+
+    candidate = RuleThresholds(premium_high_pct=1.0, premium_critical_pct=2.0)
+    sim = simulate(baseline, settings.rules, candidate, limit=1)
+    assert sim.changed_total > 1
+    assert len(sim.changed) == 1
+
+
+def test_baseline_rebuilt_on_store_write(auto_pair: RenewalPair, home_pair: RenewalPair):
+    store = InMemoryReviewStore()
+    results, _ = process_batch(_book(auto_pair, home_pair), workers=1)
+    for r in results[:3]:
+        store[r.policy_number] = r
+    first = risk_baseline(store)
+    assert risk_baseline(store) is first
+    store[results[3].policy_number] = results[3]
+    assert len(risk_baseline(store)) == 4
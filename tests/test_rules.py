@@ -1,4 +1,4 @@
-from app.config import settings
+from app.config import RuleThresholds, settings
 from app.domain.models.diff import DiffFlag
 from app.domain.models.policy import (
     AutoCoverages,
@@ -7,8 +7,14 @@ from app.domain.models.policy import (
     PolicySnapshot,
     RenewalPair,
 )
-from app.domain.services.differ import compute_diff
-from app.domain.services.rules import flag_diff
+from app.domain.services.differ import compute_diff, diff_changes
+from app.domain.services.rules import (
+    RULE_COUNTERS,
+    flag_changes,
+    flag_diff,
+    reset_rule_counters,
+    rule_stats,
+)
 
 PREMIUM_THRESHOLD_HIGH = settings.rules.premium_high_pct
 PREMIUM_THRESHOLD_CRITICAL = settings.rules.premium_critical_pct
@@ -231,3 +237,48 @@ def test_no_coverage_gap_when_adequate():
     diff = compute_diff(pair)
     result = flag_diff(diff, pair)
     assert DiffFlag.COVERAGE_GAP not in result.flags
+
+
+def test_flag_changes_annotates_records_in_place(auto_pair: RenewalPair):
+    changes = diff_changes(auto_pair)
+    flags = flag_changes(changes, auto_pair)
+    premium = next(c for c in changes if c.field == "premium")
+    assert premium.flag == DiffFlag.PREMIUM_INCREASE_HIGH
+    assert {c.flag for c in changes if c.flag} <= set(flags)
+    assert flag_diff(compute_diff(auto_pair), auto_pair).changes == [
+        c.to_field_change() for c in changes
+    ]
+
+
+def test_disabled_rules_do_not_flag(auto_pair: RenewalPair):
+    thresholds = RuleThresholds(disabled_rules=["premium_increase_high", "vehicle_added"])
+    result = flag_diff(compute_diff(auto_pair), auto_pair, thresholds=thresholds)
+    assert DiffFlag.PREMIUM_INCREASE_HIGH not in result.flags
+    assert DiffFlag.VEHICLE_ADDED not in result.flags
+    assert all(c.flag is None for c in result.changes if c.field in {"premium", "vehicle_added"})
+
+    precomputed = flag_diff(
+        compute_diff(auto_pair),
+        auto_pair,
+        thresholds=thresholds,
+        pair_flags=[DiffFlag.PREMIUM_INCREASE_HIGH],
+    )
+    assert DiffFlag.PREMIUM_INCREASE_HIGH not in precomputed.flags
+
+
+def test_rules_dispatch_on_field_and_count(auto_pair: RenewalPair):
+    reset_rule_counters()
+    flag_changes(diff_changes(auto_pair), auto_pair)
+
+    assert RULE_COUNTERS[DiffFlag.VEHICLE_ADDED].calls == 1
+    assert RULE_COUNTERS[DiffFlag.VEHICLE_ADDED].hits == 1
+    # no change in the auto sample touches a deductible field
+    assert RULE_COUNTERS[DiffFlag.DEDUCTIBLE_INCREASE].calls == 0
+    assert RULE_COUNTERS[DiffFlag.CARRIER_CHANGE].calls == 1
+
+    stats = {s.rule: s for s in rule_stats()}
+    assert len(stats) == len(DiffFlag)
+    assert stats[DiffFlag.VEHICLE_ADDED].hits == 1
+    assert stats[DiffFlag.VEHICLE_ADDED].total_ms >= 0
+    reset_rule_counters()
+    assert all(s.calls == 0 and s.hits == 0 for s in rule_stats())